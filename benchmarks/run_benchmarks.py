@@ -0,0 +1,268 @@
+"""
+Benchmarks the throughput, latency and memory use of the Pokédex against a local stub of PokéAPI.
+
+Each scenario runs in its own subprocess (so peak RSS is measured per scenario) against a stub server started by this
+script, and the results are reported as JSON so that runs can be compared. Scenarios with faults injected into the
+stub server also check that every item either succeeds or is reported as an APIRequestError, and fail otherwise:
+
+python3 benchmarks/run_benchmarks.py {--scenario name} {--mode cli | library} {--iterations count} {--output file}
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import urllib.request
+
+REPOSITORY_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPOSITORY_DIRECTORY)
+
+from benchmarks import stub_server  # noqa: E402
+
+SCENARIOS = {
+    "single": {"query_type": "pokemon", "items": 1, "expanded": False, "cached": False, "server": {}},
+    "batch-1k": {"query_type": "pokemon", "items": 1000, "expanded": False, "cached": False, "server": {}},
+    "batch-1k-cached": {"query_type": "pokemon", "items": 1000, "expanded": False, "cached": True, "server": {}},
+    "batch-1k-revalidated": {"query_type": "pokemon", "items": 1000, "expanded": False, "cached": True,
+                             "refresh": True, "server": {}},
+    "move-batch-1k": {"query_type": "move", "items": 1000, "expanded": False, "cached": False,
+                      "server": {"move_count": 1000}},
+    "expanded-300-moves": {"query_type": "pokemon", "items": 20, "expanded": True, "cached": False,
+                           "server": {"moves_per_pokemon": 320, "move_count": 900}},
+    "batch-1k-faults": {"query_type": "pokemon", "items": 1000, "expanded": False, "cached": False, "faults": True,
+                        "modes": ("library",),
+                        "server": {"error_rate": 0.2, "rate_limit_rate": 0.1, "retry_after": 1}},
+}
+
+
+def percentile(values: list, fraction: float) -> float:
+    """
+    Returns the specified percentile of the values, interpolating between the closest ranks.
+    :param values: a list, of numbers
+    :param fraction: a float, the percentile as a fraction (e.g. 0.95)
+    :return: a float
+    """
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def get_server_requests(base_url: str) -> int:
+    """
+    Returns the number of API requests the stub server has received so far.
+    :param base_url: a string, the root API URL of the stub server
+    :return: an int
+    """
+    stats_url = base_url.rsplit("/api/", 1)[0] + "/_stats"
+    with urllib.request.urlopen(stats_url) as response:
+        return json.load(response)["requests"]
+
+
+def create_runner(scenario: dict, mode: str, base_url: str, input_file: str, cache_dir: str, names_index: str):
+    """
+    Creates a function that runs one iteration of the scenario, through either the command line QueryHandler or the
+    PokedexInterface library API. The library runner returns the Pokédex objects created and the errors reported.
+    Neither runner reads the user's own cache or name index: the command line is given the scenario's, and the library
+    interface is created without a name index.
+    :param scenario: a dictionary, the scenario settings
+    :param mode: a string, "cli" or "library"
+    :param base_url: a string, the root API URL of the stub server
+    :param input_file: a string, the path of the scenario's input file
+    :param cache_dir: a string, the response cache directory (None to disable the cache)
+    :param names_index: a string, the path of the scenario's name index (which is never built, so input is not
+    checked against any names)
+    :return: a function
+    """
+    import driver
+    import pokedex_interface
+    import requests
+    from pokeretriever import response_cache
+
+    arguments = [scenario["query_type"], "--inputfile", input_file, "--base-url", base_url, "--output", os.devnull,
+                 "--names-index", names_index]
+    arguments += ["--cache-dir", cache_dir] if cache_dir else ["--no-cache"]
+    if scenario["expanded"]:
+        arguments.append("--expanded")
+    if scenario.get("refresh"):
+        arguments.append("--refresh")
+
+    def run_cli():
+        with open(os.devnull, mode="w") as devnull, contextlib.redirect_stdout(devnull):
+            driver.QueryHandler().handle_query(driver.parse_args(arguments))
+
+    def run_library():
+        cache = response_cache.ResponseCache(cache_dir, refresh=scenario.get("refresh", False)) if cache_dir else None
+        interface = pokedex_interface.PokedexInterface(cache, base_url=base_url)
+        request = requests.Requests(scenario["query_type"], input_file, None, scenario["expanded"], None)
+        pokedex_objects = interface.execute_request(request)
+        interface.close()
+        if cache is not None:
+            cache.close()
+
+        return pokedex_objects, request.errors
+
+    return run_cli if mode == "cli" else run_library
+
+
+def check_outcome(scenario: dict, outcome: tuple) -> tuple:
+    """
+    Checks that every item of an iteration either succeeded or was reported as an APIRequestError.
+    :param scenario: a dictionary, the scenario settings
+    :param outcome: a tuple, of the Pokédex objects created and the errors reported by the library runner
+    :return: a tuple, of the number of items that succeeded and the number that failed
+    :raises RuntimeError: if an error is not an APIRequestError, or if items are missing from the outcome
+    """
+    from pokeretriever import api_handler
+
+    pokedex_objects, errors = outcome
+    unexpected_errors = [error for error in errors if not isinstance(error, api_handler.APIRequestError)]
+    if unexpected_errors:
+        raise RuntimeError(f"Unexpected errors: {unexpected_errors[:5]}")
+    if len(pokedex_objects) + len(errors) != scenario["items"]:
+        raise RuntimeError(f"{len(pokedex_objects)} item(s) succeeded and {len(errors)} failed, out of "
+                           f"{scenario['items']}")
+
+    return len(pokedex_objects), len(errors)
+
+
+def run_scenario(name: str, mode: str, base_url: str, iterations: int) -> dict:
+    """
+    Runs a scenario in the current process, and returns its measurements.
+    :param name: a string, the name of the scenario
+    :param mode: a string, "cli" or "library"
+    :param base_url: a string, the root API URL of the stub server
+    :param iterations: an int, the number of measured iterations
+    :return: a dictionary
+    """
+    scenario = SCENARIOS[name]
+    with tempfile.TemporaryDirectory() as directory:
+        input_file = os.path.join(directory, "input.txt")
+        with open(input_file, mode="w", encoding="utf-8") as data:
+            for index in range(scenario["items"]):
+                data.write(f"{index % 1000 + 1}\n")
+
+        cache_dir = os.path.join(directory, "cache") if scenario["cached"] else None
+        names_index = os.path.join(directory, "names.sqlite3")
+        runner = create_runner(scenario, mode, base_url, input_file, cache_dir, names_index)
+
+        runner()
+        requests_before = get_server_requests(base_url)
+        latencies = []
+        outcomes = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            outcome = runner()
+            latencies.append(time.perf_counter() - start)
+            if scenario.get("faults"):
+                outcomes.append(check_outcome(scenario, outcome))
+        http_requests = get_server_requests(base_url) - requests_before
+
+        tracemalloc.start()
+        blocks_before = sys.getallocatedblocks()
+        runner()
+        allocated_blocks = sys.getallocatedblocks() - blocks_before
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    total_time = sum(latencies)
+    results = {
+        "scenario": name,
+        "mode": mode,
+        "iterations": iterations,
+        "items": scenario["items"],
+        "http_requests": http_requests,
+        "requests_per_second": http_requests / total_time if total_time else 0.0,
+        "items_per_second": scenario["items"] * iterations / total_time if total_time else 0.0,
+        "latency_ms": {"p50": percentile(latencies, 0.50) * 1000,
+                       "p95": percentile(latencies, 0.95) * 1000,
+                       "p99": percentile(latencies, 0.99) * 1000,
+                       "mean": total_time / iterations * 1000},
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "traced_peak_bytes": traced_peak,
+        "allocated_blocks": allocated_blocks,
+    }
+    if outcomes:
+        results["succeeded"] = sum(succeeded for succeeded, _ in outcomes)
+        results["failed"] = sum(failed for _, failed in outcomes)
+
+    return results
+
+
+def run_benchmarks(names: list, modes: list, iterations: int, latency: float, padding: int) -> dict:
+    """
+    Runs every selected scenario in a subprocess against a freshly started stub server.
+    :param names: a list, of the scenario names
+    :param modes: a list, of the modes to run each scenario in
+    :param iterations: an int, the number of measured iterations of each scenario
+    :param latency: a float, the stub server's response latency in seconds
+    :param padding: an int, the number of extra bytes added to each Pokémon payload
+    :return: a dictionary, of the results
+    """
+    results = []
+    for name in names:
+        server = stub_server.StubPokeAPI(latency=latency, padding=padding, **SCENARIOS[name]["server"])
+        server.start()
+        try:
+            for mode in [mode for mode in modes if mode in SCENARIOS[name].get("modes", modes)]:
+                output = subprocess.run([sys.executable, os.path.abspath(__file__), "--worker", name, "--mode", mode,
+                                         "--iterations", str(iterations), "--base-url", server.base_url],
+                                        check=True, capture_output=True, text=True).stdout
+                results.append(json.loads(output))
+        finally:
+            server.stop()
+
+    return {"python": platform.python_version(), "platform": platform.platform(), "timestamp": time.time(),
+            "latency": latency, "padding": padding, "results": results}
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Handles parsing the arguments of the benchmark runner.
+    :return: argparse.Namespace object
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks the Pokédex against a local stub of PokéAPI.")
+    parser.add_argument("--scenario", help="Scenario to run (may be repeated, defaults to all).", action="append",
+                        choices=tuple(SCENARIOS))
+    parser.add_argument("--mode", help="Entry point to benchmark (may be repeated, defaults to both).",
+                        action="append", choices=("cli", "library"))
+    parser.add_argument("--iterations", help="Number of measured iterations per scenario.", type=int, default=5)
+    parser.add_argument("--latency", help="Stub server response latency in seconds.", type=float, default=0.0)
+    parser.add_argument("--padding", help="Extra bytes added to each Pokémon payload.", type=int, default=0)
+    parser.add_argument("--output", help="Writes the JSON results to the specified file instead of stdout.")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+
+    return parser.parse_args()
+
+
+def main():
+    """
+    Main method responsible for running the benchmarks and reporting the results.
+    """
+    args = parse_args()
+
+    if args.worker:
+        print(json.dumps(run_scenario(args.worker, args.mode[0], args.base_url, args.iterations)))
+        return
+
+    results = run_benchmarks(args.scenario or list(SCENARIOS), args.mode or ["cli", "library"], args.iterations,
+                             args.latency, args.padding)
+
+    if args.output:
+        with open(args.output, mode="w", encoding="utf-8") as data:
+            json.dump(results, data, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
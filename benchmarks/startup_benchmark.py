@@ -0,0 +1,200 @@
+"""
+Benchmarks the cold-start latency of driver.py, and guards it against regressions.
+
+Each scenario runs driver.py in a fresh interpreter with "-X importtime" against a stub server started by this script
+(queries are answered from a response cache warmed beforehand), and reports the median wall time, the time spent
+importing modules, and the slowest imports. The run fails if a scenario imports a module it must not (e.g. aiohttp
+when every response is cached), or if its import time exceeds the given budget:
+
+python3 benchmarks/startup_benchmark.py {--scenario name} {--iterations count} {--max-import-ms milliseconds}
+{--output file}
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPOSITORY_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPOSITORY_DIRECTORY)
+
+from benchmarks import stub_server  # noqa: E402
+
+DRIVER = os.path.join(REPOSITORY_DIRECTORY, "driver.py")
+
+SCENARIOS = {
+    "help": {"arguments": ["--help"], "forbidden": ("aiohttp", "numpy", "multiprocessing", "asyncio", "msgspec",
+                                                   "pokeretriever.connection_pool")},
+    "cached-query": {"arguments": ["pokemon", "--inputdata", "1"], "cached": True,
+                     "forbidden": ("aiohttp", "numpy", "multiprocessing")},
+    "cached-expanded": {"arguments": ["pokemon", "--inputdata", "1", "--expanded"], "cached": True,
+                        "forbidden": ("aiohttp", "numpy", "multiprocessing")},
+    "cached-batch-100": {"arguments": ["pokemon", "--inputfile", "{input_file}"], "cached": True,
+                         "forbidden": ("aiohttp", "numpy", "multiprocessing")},
+}
+
+
+def parse_import_times(stderr: str) -> dict:
+    """
+    Parses the output of "-X importtime" into the cumulative import time of each top-level import.
+    :param stderr: a string, the standard error of the process
+    :return: a dictionary, mapping each module imported to its cumulative import time in microseconds (top-level
+    imports only, so that the values add up to the total import time)
+    """
+    import_times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        name = name[1:]
+        if not name.startswith(" "):
+            import_times[name] = int(cumulative)
+
+    return import_times
+
+
+def get_imported_modules(stderr: str) -> set:
+    """
+    Returns the names of every module imported, according to the output of "-X importtime".
+    :param stderr: a string, the standard error of the process
+    :return: a set, of strings
+    """
+    return {line.rpartition("|")[2].strip() for line in stderr.splitlines()
+            if line.startswith("import time:") and "[us]" not in line}
+
+
+def run_driver(arguments: list) -> tuple:
+    """
+    Runs driver.py in a fresh interpreter, with its imports timed.
+    :param arguments: a list, of the arguments of driver.py
+    :return: a tuple, of the wall time in seconds and the standard error of the process
+    """
+    start = time.perf_counter()
+    process = subprocess.run([sys.executable, "-X", "importtime", DRIVER] + arguments, stdout=subprocess.DEVNULL,
+                             stderr=subprocess.PIPE, text=True, cwd=REPOSITORY_DIRECTORY)
+    wall_time = time.perf_counter() - start
+    if process.returncode != 0:
+        raise RuntimeError(f"driver.py {' '.join(arguments)} failed:\n{process.stderr[-2000:]}")
+
+    return wall_time, process.stderr
+
+
+def run_scenario(name: str, iterations: int, base_url: str, directory: str) -> dict:
+    """
+    Runs a scenario, and returns its measurements.
+    :param name: a string, the name of the scenario
+    :param iterations: an int, the number of measured iterations
+    :param base_url: a string, the root API URL of the stub server
+    :param directory: a string, the directory holding the scenario's cache, name index and input file
+    :return: a dictionary
+    """
+    scenario = SCENARIOS[name]
+    input_file = os.path.join(directory, "input.txt")
+    arguments = [argument.format(input_file=input_file) for argument in scenario["arguments"]]
+    if scenario.get("cached"):
+        arguments += ["--cache-dir", os.path.join(directory, "cache"), "--names-index",
+                      os.path.join(directory, "names.sqlite3"), "--base-url", base_url, "--output", os.devnull]
+        run_driver(arguments)
+
+    wall_times = []
+    import_totals = []
+    import_times = {}
+    imported_modules = set()
+    for _ in range(iterations):
+        wall_time, stderr = run_driver(arguments)
+        wall_times.append(wall_time)
+        import_times = parse_import_times(stderr)
+        import_totals.append(sum(import_times.values()))
+        imported_modules = get_imported_modules(stderr)
+
+    slowest_imports = sorted(import_times.items(), key=lambda item: -item[1])[:10]
+    return {
+        "scenario": name,
+        "iterations": iterations,
+        "wall_ms": {"median": statistics.median(wall_times) * 1000, "min": min(wall_times) * 1000},
+        "import_ms": {"median": statistics.median(import_totals) / 1000, "min": min(import_totals) / 1000},
+        "modules_imported": len(imported_modules),
+        "slowest_imports_ms": {name: cumulative / 1000 for name, cumulative in slowest_imports},
+        "forbidden_imports": sorted(module for module in scenario["forbidden"] if module in imported_modules),
+    }
+
+
+def run_benchmarks(names: list, iterations: int) -> dict:
+    """
+    Runs every selected scenario against a freshly started stub server.
+    :param names: a list, of the scenario names
+    :param iterations: an int, the number of measured iterations of each scenario
+    :return: a dictionary, of the results
+    """
+    server = stub_server.StubPokeAPI()
+    server.start()
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "input.txt"), mode="w", encoding="utf-8") as data:
+                data.writelines(f"{index}\n" for index in range(1, 101))
+
+            interpreter_times = []
+            for _ in range(iterations):
+                start = time.perf_counter()
+                subprocess.run([sys.executable, "-c", "pass"], check=True)
+                interpreter_times.append(time.perf_counter() - start)
+
+            results = [run_scenario(name, iterations, server.base_url, directory) for name in names]
+    finally:
+        server.stop()
+
+    return {"python": platform.python_version(), "platform": platform.platform(), "timestamp": time.time(),
+            "interpreter_ms": statistics.median(interpreter_times) * 1000, "results": results}
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Handles parsing the arguments of the startup benchmark.
+    :return: argparse.Namespace object
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks the cold-start latency of driver.py.")
+    parser.add_argument("--scenario", help="Scenario to run (may be repeated, defaults to all).", action="append",
+                        choices=tuple(SCENARIOS))
+    parser.add_argument("--iterations", help="Number of measured runs per scenario.", type=int, default=5)
+    parser.add_argument("--max-import-ms", help="Fails if the median import time of a scenario exceeds this.",
+                        type=float)
+    parser.add_argument("--output", help="Writes the JSON results to the specified file instead of stdout.")
+
+    return parser.parse_args()
+
+
+def main():
+    """
+    Runs the startup benchmark, reports the results, and exits with an error status if any scenario regressed.
+    """
+    args = parse_args()
+    results = run_benchmarks(args.scenario or list(SCENARIOS), args.iterations)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, mode="w", encoding="utf-8") as data:
+            data.write(output)
+    else:
+        print(output)
+
+    failures = []
+    for result in results["results"]:
+        if result["forbidden_imports"]:
+            failures.append(f"{result['scenario']} imported {', '.join(result['forbidden_imports'])}")
+        if args.max_import_ms is not None and result["import_ms"]["median"] > args.max_import_ms:
+            failures.append(f"{result['scenario']} spent {result['import_ms']['median']:.1f} ms importing modules "
+                            f"(budget {args.max_import_ms:.1f} ms)")
+
+    for failure in failures:
+        print(f"REGRESSION: {failure}", file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
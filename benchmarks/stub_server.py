@@ -0,0 +1,307 @@
+import asyncio
+import email.utils
+import hashlib
+import json
+import random
+import threading
+
+from aiohttp import web
+
+
+class StubPokeAPI:
+    """
+    A local stand-in for PokéAPI that serves synthetic Pokémon, Ability, Move and Stat JSON in the same shape as the
+    real API. Runs on its own event loop in a background thread, with a configurable response latency and payload size,
+    and counts the requests it receives. Like the real API, every resource is served with validators (an ETag and a
+    Last-Modified header), and conditional requests for resources that have not changed are answered with a 304.
+    Resources can be changed while the server runs (see update_resource), to test incremental refreshes. Faults can be
+    injected into the resource endpoints, which then fail a random fraction of requests with a 503 or a rate limiting
+    429 (with a Retry-After header), to test how failures are retried and reported.
+    """
+
+    STAT_NAMES = ("hp", "attack", "defense", "special-attack", "special-defense", "speed")
+    TYPE_NAMES = ("normal", "fire", "water", "grass", "electric", "ice", "fighting", "poison", "ground", "flying")
+
+    def __init__(self, pokemon_count: int = 1000, move_count: int = 900, ability_count: int = 300,
+                 moves_per_pokemon: int = 60, latency: float = 0.0, padding: int = 0, port: int = 0,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0, retry_after: int = 0):
+        """
+        Initializer method.
+        :param pokemon_count: an int, the number of synthetic Pokémon served
+        :param move_count: an int, the number of synthetic Moves served
+        :param ability_count: an int, the number of synthetic Abilities served
+        :param moves_per_pokemon: an int, the number of moves each Pokémon can learn
+        :param latency: a float, the number of seconds each response is delayed by
+        :param padding: an int, the number of extra bytes added to each Pokémon payload (in the unused sections)
+        :param port: an int, the port to listen on (0 picks a free port)
+        :param error_rate: a float, the fraction of resource requests that fail with a 503
+        :param rate_limit_rate: a float, the fraction of resource requests that are rate limited with a 429
+        :param retry_after: an int, the number of seconds sent in the Retry-After header of a 429
+        """
+        self.pokemon_count = pokemon_count
+        self.move_count = move_count
+        self.ability_count = ability_count
+        self.moves_per_pokemon = moves_per_pokemon
+        self.latency = latency
+        self.padding = padding
+        self.port = port
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.fault_generator = random.Random(0)
+        self.request_count = 0
+        self.not_modified_count = 0
+        self.error_count = 0
+        self.rate_limited_count = 0
+        self.started_at = email.utils.formatdate(usegmt=True)
+        self.revisions = {}
+        self.event_loop = None
+        self.runner = None
+        self.thread = None
+        self.started = threading.Event()
+
+    @property
+    def base_url(self) -> str:
+        """
+        The root API URL of the stub server.
+        :return: a string
+        """
+        return f"http://127.0.0.1:{self.port}/api/v2"
+
+    def create_pokemon(self, pokemon_id: int) -> dict:
+        """
+        Creates the synthetic JSON of a Pokémon.
+        :param pokemon_id: an int, the ID of the Pokémon
+        :return: a dictionary
+        """
+        generator = random.Random(pokemon_id)
+        move_ids = sorted(generator.sample(range(1, self.move_count + 1), min(self.moves_per_pokemon,
+                                                                              self.move_count)))
+        ability_ids = sorted(generator.sample(range(1, self.ability_count + 1), min(2, self.ability_count)))
+
+        return {
+            "id": pokemon_id,
+            "name": f"pokemon-{pokemon_id}",
+            "height": generator.randint(1, 200),
+            "weight": generator.randint(1, 9999),
+            "stats": [{"base_stat": generator.randint(5, 255), "effort": 0,
+                       "stat": {"name": name, "url": f"{self.base_url}/stat/{index}/"}}
+                      for index, name in enumerate(self.STAT_NAMES, start=1)],
+            "types": [{"slot": 1, "type": {"name": generator.choice(self.TYPE_NAMES),
+                                           "url": f"{self.base_url}/type/1/"}}],
+            "abilities": [{"ability": {"name": f"ability-{ability_id}",
+                                       "url": f"{self.base_url}/ability/{ability_id}/"},
+                           "is_hidden": False, "slot": slot}
+                          for slot, ability_id in enumerate(ability_ids, start=1)],
+            "moves": [{"move": {"name": f"move-{move_id}", "url": f"{self.base_url}/move/{move_id}/"},
+                       "version_group_details": [
+                           {"level_learned_at": generator.randint(0, 100),
+                            "move_learn_method": {"name": generator.choice(("level-up", "machine", "egg")),
+                                                  "url": f"{self.base_url}/move-learn-method/1/"},
+                            "version_group": {"name": version_group,
+                                              "url": f"{self.base_url}/version-group/1/"}}
+                           for version_group in ("red-blue", "gold-silver", "scarlet-violet")]}
+                      for move_id in move_ids],
+            "game_indices": [{"game_index": pokemon_id, "version": {"name": "red", "url": ""}}] * 20,
+            "sprites": {"front_default": "x" * self.padding},
+        }
+
+    def create_move(self, move_id: int) -> dict:
+        """
+        Creates the synthetic JSON of a Move.
+        :param move_id: an int, the ID of the Move
+        :return: a dictionary
+        """
+        generator = random.Random(move_id)
+
+        return {
+            "id": move_id,
+            "name": f"move-{move_id}",
+            "accuracy": generator.choice((None, 70, 85, 90, 100)),
+            "pp": generator.choice((5, 10, 15, 20, 35)),
+            "power": generator.choice((None, 40, 60, 90, 120)),
+            "generation": {"name": "generation-i", "url": ""},
+            "type": {"name": generator.choice(self.TYPE_NAMES), "url": ""},
+            "damage_class": {"name": generator.choice(("physical", "special", "status")), "url": ""},
+            "flavor_text_entries": [{"flavor_text": f"Flavour text\nof move {move_id}.",
+                                     "language": {"name": "en", "url": ""},
+                                     "version_group": {"name": "red-blue", "url": ""}}],
+        }
+
+    def create_ability(self, ability_id: int) -> dict:
+        """
+        Creates the synthetic JSON of an Ability.
+        :param ability_id: an int, the ID of the Ability
+        :return: a dictionary
+        """
+        return {
+            "id": ability_id,
+            "name": f"ability-{ability_id}",
+            "generation": {"name": "generation-iii", "url": ""},
+            "effect_entries": [{"effect": f"Effect of ability {ability_id}.", "language": {"name": "en", "url": ""}}],
+            "flavor_text_entries": [{"flavor_text": f"Short effect\nof ability {ability_id}.",
+                                     "language": {"name": "en", "url": ""}}],
+            "pokemon": [{"is_hidden": False, "slot": 1,
+                         "pokemon": {"name": f"pokemon-{pokemon_id}", "url": f"{self.base_url}/pokemon/{pokemon_id}/"}}
+                        for pokemon_id in range(1, min(4, self.pokemon_count) + 1)],
+        }
+
+    def create_stat(self, stat_id: int) -> dict:
+        """
+        Creates the synthetic JSON of a Stat.
+        :param stat_id: an int, the ID of the Stat
+        :return: a dictionary
+        """
+        return {"id": stat_id, "name": self.STAT_NAMES[stat_id - 1], "is_battle_only": False}
+
+    def get_resource(self, resource_type: str, key: str) -> dict:
+        """
+        Returns the synthetic JSON of the specified resource.
+        :param resource_type: a string, the type of resource
+        :param key: a string, the name or ID of the resource
+        :return: a dictionary, or None if there is no such resource
+        """
+        builders = {"pokemon": (self.create_pokemon, self.pokemon_count),
+                    "move": (self.create_move, self.move_count),
+                    "ability": (self.create_ability, self.ability_count),
+                    "stat": (self.create_stat, len(self.STAT_NAMES))}
+        if resource_type not in builders:
+            return None
+
+        builder, count = builders[resource_type]
+        if key.isdigit():
+            resource_id = int(key)
+        elif key.startswith(f"{resource_type}-") and key[len(resource_type) + 1:].isdigit():
+            resource_id = int(key[len(resource_type) + 1:])
+        elif resource_type == "stat" and key in self.STAT_NAMES:
+            resource_id = self.STAT_NAMES.index(key) + 1
+        else:
+            return None
+
+        if not 1 <= resource_id <= count:
+            return None
+
+        resource = builder(resource_id)
+        revision, _ = self.revisions.get((resource_type, resource_id), (0, None))
+        if revision:
+            resource["revision"] = revision
+
+        return resource
+
+    def update_resource(self, resource_type: str, resource_id: int):
+        """
+        Changes a resource, so that its body and validators differ from those served before.
+        :param resource_type: a string, the type of resource
+        :param resource_id: an int, the ID of the resource
+        """
+        revision, _ = self.revisions.get((resource_type, resource_id), (0, None))
+        self.revisions[(resource_type, resource_id)] = (revision + 1, email.utils.formatdate(usegmt=True))
+
+    def get_count(self, resource_type: str) -> int:
+        """
+        Returns the number of resources of the specified type.
+        :param resource_type: a string, the type of resource
+        :return: an int
+        """
+        return {"pokemon": self.pokemon_count, "move": self.move_count, "ability": self.ability_count,
+                "stat": len(self.STAT_NAMES)}.get(resource_type, 0)
+
+    async def handle_stats(self, request: web.Request) -> web.Response:
+        """
+        Serves the number of API requests received so far, so that benchmarks can measure request throughput.
+        :param request: the aiohttp request
+        :return: the aiohttp response
+        """
+        return web.json_response({"requests": self.request_count, "not_modified": self.not_modified_count,
+                                  "errors": self.error_count, "rate_limited": self.rate_limited_count})
+
+    async def handle_list(self, request: web.Request) -> web.Response:
+        """
+        Serves a paginated list endpoint (e.g. /api/v2/pokemon?offset=0&limit=20).
+        :param request: the aiohttp request
+        :return: the aiohttp response
+        """
+        self.request_count += 1
+        resource_type = request.match_info["resource_type"]
+        count = self.get_count(resource_type)
+        offset = int(request.query.get("offset", 0))
+        limit = int(request.query.get("limit", 20))
+
+        results = [{"name": self.get_resource(resource_type, str(resource_id))["name"],
+                    "url": f"{self.base_url}/{resource_type}/{resource_id}/"}
+                   for resource_id in range(offset + 1, min(count, offset + limit) + 1)]
+        next_url = f"{self.base_url}/{resource_type}/?offset={offset + limit}&limit={limit}" \
+            if offset + limit < count else None
+
+        return web.json_response({"count": count, "next": next_url, "previous": None, "results": results})
+
+    async def handle_resource(self, request: web.Request) -> web.Response:
+        """
+        Serves a single resource (e.g. /api/v2/pokemon/25/).
+        :param request: the aiohttp request
+        :return: the aiohttp response
+        """
+        self.request_count += 1
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+
+        fault = self.fault_generator.random()
+        if fault < self.error_rate:
+            self.error_count += 1
+            return web.Response(status=503, text="Service Unavailable")
+        if fault < self.error_rate + self.rate_limit_rate:
+            self.rate_limited_count += 1
+            return web.Response(status=429, text="Too Many Requests", headers={"Retry-After": str(self.retry_after)})
+
+        resource_type = request.match_info["resource_type"]
+        resource = self.get_resource(resource_type, request.match_info["key"].lower())
+        if resource is None:
+            return web.Response(status=404, text="Not Found")
+
+        body = json.dumps(resource)
+        _, last_modified = self.revisions.get((resource_type, resource["id"]), (0, None))
+        headers = {"ETag": f'"{hashlib.md5(body.encode("utf-8")).hexdigest()}"',
+                   "Last-Modified": last_modified or self.started_at}
+        if request.headers.get("If-None-Match") == headers["ETag"]:
+            self.not_modified_count += 1
+            return web.Response(status=304, headers=headers)
+
+        return web.Response(text=body, content_type="application/json", headers=headers)
+
+    def start(self):
+        """
+        Starts the stub server in a background thread, and waits until it is accepting connections.
+        """
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+        self.started.wait()
+
+    def run(self):
+        """
+        Runs the stub server's event loop until it is stopped.
+        """
+        self.event_loop = asyncio.new_event_loop()
+        application = web.Application()
+        application.router.add_get("/_stats", self.handle_stats)
+        application.router.add_get("/api/v2/{resource_type}/", self.handle_list)
+        application.router.add_get("/api/v2/{resource_type}", self.handle_list)
+        application.router.add_get("/api/v2/{resource_type}/{key}/", self.handle_resource)
+        application.router.add_get("/api/v2/{resource_type}/{key}", self.handle_resource)
+
+        self.runner = web.AppRunner(application, access_log=None)
+        self.event_loop.run_until_complete(self.runner.setup())
+        site = web.TCPSite(self.runner, "127.0.0.1", self.port)
+        self.event_loop.run_until_complete(site.start())
+        self.port = site._server.sockets[0].getsockname()[1]
+        self.started.set()
+
+        self.event_loop.run_forever()
+        self.event_loop.run_until_complete(self.runner.cleanup())
+        self.event_loop.close()
+
+    def stop(self):
+        """
+        Stops the stub server and waits for its thread to finish.
+        """
+        self.event_loop.call_soon_threadsafe(self.event_loop.stop)
+        self.thread.join()
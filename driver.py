@@ -1,7 +1,17 @@
 import argparse
 import file_handler
-import pokedex_interface
+import os
 import requests
+import sys
+import time
+import typing
+
+if typing.TYPE_CHECKING:
+    import pokedex_interface
+    from pokeretriever import renderer, response_cache
+
+# Every other module is imported by the handler (or argument builder) that uses it, and aiohttp is only imported once
+# a request is made, so that --help loads none of them, and queries answered from the cache start quickly.
 
 
 class QueryHandler:
@@ -14,13 +24,15 @@ class QueryHandler:
         """
         Initializer method.
         """
-        self.pokedex_interface = pokedex_interface.PokedexInterface()
+        self.pokedex_interface = None
 
     def handle_query(self, args: argparse.Namespace):
         """
         Handles query by routing the query to the appropriate class (Pokémon, Ability, or Move), whether or not expanded
         information should be provided, and the mode that the information should be reported in.
         """
+        from pokeretriever import api_handler, instrumentation, movepool_filter, renderer
+
         query_type = args.query.lower()
         input_file = args.inputfile
         input_data = args.inputdata
@@ -31,35 +43,832 @@ class QueryHandler:
             print("ERROR: Missing argument after --inputdata or --inputfile")
             return
 
-        request = requests.Requests(query_type, input_file, input_data, expanded, output)
-        pokedex_objects = self.pokedex_interface.execute_request(request)
+        if args.server:
+            self.forward_query(args)
+            return
+
+        self.pokedex_interface = self.create_pokedex_interface(args)
+        self.pokedex_interface.movepool_filter = movepool_filter.MovepoolFilter(args.moves_limit, args.moves_filter,
+                                                                                args.version_group)
+        instrumentation.PROFILER.enabled = args.profile or args.trace_json is not None
+
+        request = requests.Requests(query_type, input_file, input_data, expanded, output, args.window,
+                                    not args.unordered)
+        try:
+            if output:
+                with file_handler.FileHandler.open_output(output) as data:
+                    self.execute_request(args, request, renderer.Renderer(data, args.format))
+            else:
+                self.execute_request(args, request, renderer.Renderer(sys.stdout, args.format, "\n", args.stream))
+
+        except api_handler.APIRequestError as error:
+            print(f"ERROR: {error}")
+            sys.exit(1)
+        finally:
+            self.close_pokedex_interface()
+            self.report_profile(args)
 
-        if output:
-            file_handler.FileHandler.write_file(output, pokedex_objects)
+        if request.errors:
+            self.report_errors(request.errors)
+            sys.exit(1)
+
+    def execute_request(self, args: argparse.Namespace, request: requests.Requests,
+                        output_renderer: "renderer.Renderer"):
+        """
+        Executes the request in the mode specified by the arguments (in worker processes, streamed, or as a single
+        batch), and writes every result with the output renderer.
+        :param args: argparse.Namespace object
+        :param request: a Requests object
+        :param output_renderer: a Renderer, that the results are written with
+        """
+        if args.workers > 1:
+            import parallel_executor
+
+            parallel_executor.ParallelExecutor(self.pokedex_interface, args.workers).execute(request, output_renderer)
+            return
+
+        if not args.stream:
+            output_renderer.write_all(self.pokedex_interface.execute_request(request))
+            return
+
+        pokedex_objects = self.pokedex_interface.stream_request(request)
+        try:
+            output_renderer.write_all(pokedex_objects)
+        finally:
+            pokedex_objects.close()
+
+    @staticmethod
+    def forward_query(args: argparse.Namespace):
+        """
+        Forwards the query to a running Pokédex server instead of answering it in this process, and reports the
+        results in the same way.
+        :param args: argparse.Namespace object
+        """
+        import pokedex_client
+
+        if args.inputfile:
+            items = list(file_handler.FileHandler.read_lines(args.inputfile))
         else:
-            for entry in pokedex_objects:
-                print(entry)
+            items = [args.inputdata]
+
+        try:
+            response = pokedex_client.PokedexClient(args.server).query(args.query.lower(), items, args.expanded,
+                                                                       args.format, "" if args.output else "\n",
+                                                                       args.moves_limit, args.moves_filter,
+                                                                       args.version_group)
+        except pokedex_client.PokedexClientError as error:
+            print(f"ERROR: {error}")
+            sys.exit(1)
+
+        if args.output:
+            with open(args.output, mode="w", encoding="utf-8", newline="") as data:
+                data.write(response["output"])
+        else:
+            sys.stdout.write(response["output"])
+
+        if response["errors"]:
+            QueryHandler.report_errors(response["errors"])
+            sys.exit(1)
+
+    @staticmethod
+    def report_profile(args: argparse.Namespace):
+        """
+        Prints the profiling summary, and writes the Chrome trace, if they were requested.
+        :param args: argparse.Namespace object
+        """
+        from pokeretriever import instrumentation
+
+        if args.profile:
+            print(instrumentation.PROFILER.summary(), file=sys.stderr)
+        if args.trace_json:
+            instrumentation.PROFILER.write_chrome_trace(args.trace_json)
+
+    @staticmethod
+    def report_errors(errors: list):
+        """
+        Reports the items of a request that could not be fetched, after all of the successful results.
+        :param errors: a list, of APIRequestErrors
+        """
+        print(f"ERROR: {len(errors)} item(s) could not be retrieved:", file=sys.stderr)
+        for error in errors:
+            print(f"  {error}", file=sys.stderr)
+
+    def create_pokedex_interface(self, args: argparse.Namespace) -> "pokedex_interface.PokedexInterface":
+        """
+        Creates the Pokédex interface, along with the response cache, connection pool and name index specified by the
+        arguments. The name index is only used if it has been built.
+        :param args: argparse.Namespace object
+        :return: a PokedexInterface
+        """
+        import pokedex_interface
+        from pokeretriever import connection_pool, name_index, rate_limiter, snapshot_store
+
+        token_bucket = rate_limiter.TokenBucket(args.rate_limit, args.burst) if args.rate_limit > 0 else None
+        retry_policy = rate_limiter.RetryPolicy(args.retries, args.backoff_base, args.backoff_max)
+        pool = connection_pool.ConnectionPool(args.concurrency, args.limit_per_host, args.dns_cache_ttl,
+                                              args.keepalive_timeout, token_bucket, retry_policy)
+
+        data_source = snapshot_store.SnapshotStore(args.snapshot) if args.snapshot else None
+        names = None
+        if not args.no_name_check and os.path.exists(args.names_index):
+            names = name_index.NameIndex(args.names_index)
+
+        return pokedex_interface.PokedexInterface(self.create_cache(args), pool, args.base_url, data_source,
+                                                  name_index=names)
+
+    def close_pokedex_interface(self):
+        """
+        Closes the Pokédex interface's connection pool, response cache, data source, and name index.
+        """
+        self.pokedex_interface.close()
+
+        if self.pokedex_interface.cache is not None:
+            self.pokedex_interface.cache.close()
+
+        if self.pokedex_interface.data_source is not None:
+            self.pokedex_interface.data_source.close()
+
+        if self.pokedex_interface.name_index is not None:
+            self.pokedex_interface.name_index.close()
+
+    def handle_index(self, args: argparse.Namespace):
+        """
+        Handles building the inverted indexes of Pokémon, either from the specified Pokémon (fetched, or read from the
+        cache or snapshot) or from every Pokémon held locally.
+        :param args: argparse.Namespace object
+        """
+        from pokeretriever import api_handler, pokemon_index
+
+        if not args.from_cache and args.inputfile is None and args.inputdata is None:
+            print("ERROR: Specify the Pokémon to index with --inputdata or --inputfile, or use --from-cache")
+            sys.exit(1)
+
+        self.pokedex_interface = self.create_pokedex_interface(args)
+        index = pokemon_index.PokemonIndex(args.index)
+        request = requests.Requests("pokemon", args.inputfile, args.inputdata, False, None)
+        indexed = 0
+        try:
+            if args.from_cache:
+                pokedex_objects = self.pokedex_interface.load_local_pokemon()
+            else:
+                pokedex_objects = self.pokedex_interface.stream_request(request)
+
+            for pokemon in pokedex_objects:
+                index.add_pokemon(pokemon)
+                indexed += 1
+
+        except api_handler.APIRequestError as error:
+            print(f"ERROR: {error}")
+            sys.exit(1)
+        finally:
+            index.close()
+            self.close_pokedex_interface()
+
+        print(f"Indexed {indexed} Pokémon into {args.index}")
+        if request.errors:
+            self.report_errors(request.errors)
+            sys.exit(1)
+
+    def handle_names(self, args: argparse.Namespace):
+        """
+        Handles building, or refreshing, the index of the names and IDs of every Pokémon, ability and move.
+        :param args: argparse.Namespace object
+        """
+        from pokeretriever import api_handler, name_index
+
+        self.pokedex_interface = self.create_pokedex_interface(args)
+        if self.pokedex_interface.name_index is None:
+            self.pokedex_interface.name_index = name_index.NameIndex(args.names_index)
+        try:
+            counts = self.pokedex_interface.refresh_name_index(args.type or name_index.NameIndex.RESOURCE_TYPES)
+        except api_handler.APIRequestError as error:
+            print(f"ERROR: {error}")
+            sys.exit(1)
+        finally:
+            self.close_pokedex_interface()
+
+        for query_type, (count, updated) in counts.items():
+            print(f"{query_type}: {count} names ({'updated' if updated else 'unchanged'})")
+
+    def handle_warm(self, args: argparse.Namespace):
+        """
+        Handles prefetching every resource of the specified type (and everything its expanded information references)
+        into the response cache, resuming from the checkpoint of an earlier run.
+        :param args: argparse.Namespace object
+        """
+        from pokeretriever import api_handler, cache_warmer, name_index
+
+        if args.no_cache:
+            print("ERROR: The cache cannot be warmed with --no-cache")
+            sys.exit(1)
+
+        self.pokedex_interface = self.create_pokedex_interface(args)
+        if self.pokedex_interface.name_index is None and not args.no_name_check:
+            self.pokedex_interface.name_index = name_index.NameIndex(args.names_index)
+
+        warmer = cache_warmer.CacheWarmer(self.pokedex_interface, args.checkpoint, args.batch_size)
+        if args.restart:
+            warmer.reset()
+
+        try:
+            errors = warmer.warm(args.target, self.report_warm_progress)
+        except api_handler.APIRequestError as error:
+            print(f"ERROR: {error}")
+            sys.exit(1)
+        finally:
+            self.close_pokedex_interface()
+
+        if errors:
+            self.report_errors(errors)
+            sys.exit(1)
+
+    def handle_sync(self, args: argparse.Namespace):
+        """
+        Handles bringing every cached response up to date with conditional requests, so that only the responses that
+        have changed are downloaded again.
+        :param args: argparse.Namespace object
+        """
+        from pokeretriever import cache_syncer
+
+        if args.no_cache:
+            print("ERROR: The cache cannot be synced with --no-cache")
+            sys.exit(1)
+
+        self.pokedex_interface = self.create_pokedex_interface(args)
+        syncer = cache_syncer.CacheSyncer(self.pokedex_interface, args.batch_size)
+        started_at = time.perf_counter()
+        try:
+            counts, errors = syncer.sync(args.type, self.report_sync_progress)
+        finally:
+            self.close_pokedex_interface()
+
+        print(f"Checked {counts['checked']} cached responses in {time.perf_counter() - started_at:.1f}s: "
+              f"{counts['unchanged']} unchanged, {counts['updated']} updated ({counts['bytes'] / 1024:.1f} KiB), "
+              f"{counts['failed']} failed")
+        if errors:
+            self.report_errors(errors)
+            sys.exit(1)
+
+    @staticmethod
+    def report_sync_progress(done: int, total: int, rate: float):
+        """
+        Prints the progress of syncing the cache.
+        :param done: an int, the number of responses checked so far
+        :param total: an int, the number of cached responses
+        :param rate: a float, the number of responses checked per second
+        """
+        print(f"sync: {done}/{total} ({done / max(total, 1):.0%}, {rate:.1f}/s)", file=sys.stderr)
+
+    @staticmethod
+    def report_warm_progress(resource_type: str, done: int, total: int, rate: float):
+        """
+        Prints the progress of warming the cache with a resource type.
+        :param resource_type: a string, the resource type
+        :param done: an int, the number of resources fetched so far
+        :param total: an int, the number of resources of the type
+        :param rate: a float, the number of resources fetched per second
+        """
+        print(f"{resource_type}: {done}/{total} ({done / max(total, 1):.0%}, {rate:.1f}/s)", file=sys.stderr)
+
+    @staticmethod
+    def handle_learners(args: argparse.Namespace):
+        """
+        Handles listing the indexed Pokémon that can learn a move.
+        :param args: argparse.Namespace object
+        """
+        import pokedex_interface
+
+        QueryHandler.print_index_results(args, moves=[pokedex_interface.PokedexInterface.clean_input(args.move)])
+
+    @staticmethod
+    def handle_search(args: argparse.Namespace):
+        """
+        Handles listing the indexed Pokémon that match every specified type, ability, move and stat range.
+        :param args: argparse.Namespace object
+        """
+        import pokedex_interface
+
+        clean_input = pokedex_interface.PokedexInterface.clean_input
+        QueryHandler.print_index_results(args, types=[clean_input(pkm_type) for pkm_type in args.type],
+                                         abilities=[clean_input(ability) for ability in args.ability],
+                                         moves=[clean_input(move) for move in args.move],
+                                         min_stats=dict(args.min_stat), max_stats=dict(args.max_stat))
+
+    @staticmethod
+    def print_index_results(args: argparse.Namespace, **criteria):
+        """
+        Prints the names of the indexed Pokémon that match the criteria, one per line.
+        :param args: argparse.Namespace object
+        :param criteria: the keyword arguments of PokemonIndex.search
+        """
+        from pokeretriever import pokemon_index
+
+        index = pokemon_index.PokemonIndex(args.index)
+        try:
+            if index.count() == 0:
+                print(f"ERROR: The index {args.index} is empty, build it with: driver.py index", file=sys.stderr)
+                sys.exit(1)
+
+            names = index.search(**criteria)
+        finally:
+            index.close()
+
+        if names:
+            print("\n".join(names))
+
+    @staticmethod
+    def handle_stats(args: argparse.Namespace):
+        """
+        Handles the stat analytics queries (rank, percentile, similar and compare) over every indexed Pokémon.
+        :param args: argparse.Namespace object
+        """
+        import pokedex_interface
+        from pokeretriever import pokemon_index, stat_analytics
+
+        index = pokemon_index.PokemonIndex(args.index)
+        try:
+            analytics = stat_analytics.StatAnalytics.load(index)
+        except RuntimeError as error:
+            print(f"ERROR: {error}")
+            sys.exit(1)
+        finally:
+            index.close()
+
+        if len(analytics.names) == 0:
+            print(f"ERROR: The index {args.index} is empty, build it with: driver.py index", file=sys.stderr)
+            sys.exit(1)
+
+        clean_input = pokedex_interface.PokedexInterface.clean_input
+        try:
+            if args.stats_query == "rank":
+                ranking = analytics.rank(args.by, args.top, args.ascending, dict(args.min_stat), dict(args.max_stat))
+                lines = [f"{place:>4}. {name:<24}{float(score):>10g}"
+                         for place, (name, score) in enumerate(ranking, start=1)]
+            elif args.stats_query == "percentile":
+                lines = [f"{stat:<18}{value:>6}{percentile:>10.1f}%"
+                         for stat, (value, percentile) in analytics.percentiles(clean_input(args.pokemon)).items()]
+            elif args.stats_query == "similar":
+                lines = [f"{name:<24}{distance:>10.2f}"
+                         for name, distance in analytics.similar(clean_input(args.pokemon), args.top)]
+            else:
+                rows = [analytics.get_row(clean_input(pkm)) for pkm in args.pokemon]
+                lines = ["".join([f"{'stat':<18}"] + [f"{analytics.names[row]:>16}" for row in rows])]
+                lines += ["".join([f"{stat:<18}"] + [f"{value:>16}" for value in values])
+                          for stat, values in analytics.compare([clean_input(pkm) for pkm in args.pokemon])]
+
+        except KeyError as error:
+            print(f"ERROR: {error.args[0]}")
+            sys.exit(1)
+
+        print("\n".join(lines))
+
+    @staticmethod
+    def handle_import_snapshot(args: argparse.Namespace):
+        """
+        Handles importing a directory of PokéAPI JSON files into the local snapshot database.
+        :param args: argparse.Namespace object
+        """
+        from pokeretriever import snapshot_store
+
+        if not os.path.isdir(args.directory):
+            print(f"ERROR: {args.directory} is not a directory")
+            sys.exit(1)
+
+        store = snapshot_store.SnapshotStore(args.snapshot)
+        imported = store.import_directory(args.directory)
+        store.close()
+
+        print(f"Imported {imported} resources into {args.snapshot}")
+
+    def handle_serve(self, args: argparse.Namespace):
+        """
+        Handles running the Pokédex as a long-running server, keeping a single Pokédex interface, pooled HTTP session
+        and in-memory cache alive between queries.
+        :param args: argparse.Namespace object
+        """
+        import pokedex_server
+        from pokeretriever import memory_cache
+
+        self.pokedex_interface = self.create_pokedex_interface(args)
+        self.pokedex_interface.cache = memory_cache.MemoryCache(args.memory_size, args.cache_ttl,
+                                                                self.pokedex_interface.cache)
 
+        server = pokedex_server.PokedexServer(self.pokedex_interface, args.host, args.port, args.unix_socket,
+                                              args.memory_size, args.cache_ttl)
+        try:
+            server.serve_forever()
+        finally:
+            self.close_pokedex_interface()
 
-def parse_args() -> argparse.Namespace:
+    def handle_shell(self, args: argparse.Namespace):
+        """
+        Handles running the interactive Pokédex shell, keeping a single Pokédex interface, pooled HTTP session and
+        in-memory cache alive between lookups.
+        :param args: argparse.Namespace object
+        """
+        import pokedex_shell
+        from pokeretriever import memory_cache
+
+        self.pokedex_interface = self.create_pokedex_interface(args)
+        self.pokedex_interface.cache = memory_cache.MemoryCache(args.memory_size, args.cache_ttl,
+                                                                self.pokedex_interface.cache)
+
+        shell = pokedex_shell.PokedexShell(self.pokedex_interface, args.memory_size, args.cache_ttl, args.history)
+        try:
+            shell.run()
+        finally:
+            self.close_pokedex_interface()
+
+    @staticmethod
+    def create_cache(args: argparse.Namespace) -> "response_cache.ResponseCache":
+        """
+        Creates the response cache specified by the arguments, or returns None if caching has been disabled.
+        :param args: argparse.Namespace object
+        :return: a ResponseCache, or None
+        """
+        from pokeretriever import response_cache
+
+        if args.no_cache:
+            return None
+
+        return response_cache.ResponseCache(args.cache_dir, args.cache_ttl, args.cache_size, args.refresh)
+
+
+def add_query_arguments(parser: argparse.ArgumentParser):
     """
-    Handles parsing the arguments that are specified when running this program. Returns the Namespace object
-    of the argparse move_type that contains the argument specified when running this program.
-    :return: argparse.Namespace object
+    Adds the arguments shared by the Pokémon, Ability, and Move queries.
+    :param parser: argparse.ArgumentParser object
     """
-    parser = argparse.ArgumentParser()
-
-    parser.add_argument("query", help="Provides info about specified topic", choices=("pokemon", "ability", "move"))
+    import pokedex_interface
+    from pokeretriever import movepool_filter, renderer, snapshot_store
 
     input_type_group = parser.add_mutually_exclusive_group()
     input_type_group.add_argument("--inputfile", help="Specify text file to read", nargs="?")
-    input_type_group.add_argument("--inputdata", help="Name/ID of Pokemon/Ability/Move", nargs="?")
+    input_type_group.add_argument("--inputdata", help="Name/ID of Pokemon/Ability/Move, or a selector of them "
+                                                     "(e.g. 1-151, all, type:fire or ability:levitate)", nargs="?")
 
     parser.add_argument("--expanded", help="Provides additional information about the queried attribute.",
                         action="store_true")
     parser.add_argument("--output", help="Outputs the results to a text file of the specified file name.")
+    parser.add_argument("--format", help="Output format of the results (defaults to text).",
+                        choices=renderer.Renderer.FORMATS, default="text")
+    parser.add_argument("--snapshot", help="Answers the query entirely from an imported snapshot database.",
+                        nargs="?", const=snapshot_store.SnapshotStore.DEFAULT_PATH)
+    parser.add_argument("--server", help="Forwards the query to a running Pokédex server "
+                                         "(http://host:port or unix:/path/to/socket).")
+
+    moves_group = parser.add_argument_group("moves")
+    moves_group.add_argument("--moves-limit", help="Maximum number of moves listed (and expanded) per Pokémon.",
+                             type=movepool_filter.MovepoolFilter.parse_limit)
+    moves_group.add_argument("--moves-filter", help="Only lists the moves learned by a learn method (e.g. level-up, "
+                                                    "machine, egg or tutor).",
+                             type=pokedex_interface.PokedexInterface.clean_input)
+    moves_group.add_argument("--version-group", help="Only lists the moves learned in a version group (e.g. red-blue), "
+                                                     "with the level they are learned at in it.",
+                             type=pokedex_interface.PokedexInterface.clean_input)
+
+    profile_group = parser.add_argument_group("profiling")
+    profile_group.add_argument("--profile", help="Prints a summary of where the time of the query was spent.",
+                               action="store_true")
+    profile_group.add_argument("--trace-json", help="Writes a Chrome trace of the query to the specified file.")
+
+    stream_group = parser.add_argument_group("streaming")
+    stream_group.add_argument("--stream", help="Reads, fetches and outputs results one at a time as they are ready.",
+                              action="store_true")
+    stream_group.add_argument("--window", help="Maximum number of items fetched at once when streaming.", type=int,
+                              default=requests.Requests.DEFAULT_WINDOW)
+    stream_group.add_argument("--unordered", help="Outputs streamed results as they complete, not in input order.",
+                              action="store_true")
+    stream_group.add_argument("--workers", help="Number of worker processes that create and render the results "
+                                                "(1 for none).", type=int, default=1)
+
+
+def add_cache_arguments(parser: argparse.ArgumentParser):
+    """
+    Adds the arguments that configure the response cache.
+    :param parser: argparse.ArgumentParser object
+    """
+    from pokeretriever import name_index, response_cache
+
+    cache_group = parser.add_argument_group("cache")
+    cache_group.add_argument("--cache-dir", help="Directory the response cache is stored in.",
+                             default=response_cache.ResponseCache.DEFAULT_DIRECTORY)
+    cache_group.add_argument("--cache-ttl", help="Seconds a cached response stays fresh for (0 never expires).",
+                             type=int, default=response_cache.ResponseCache.DEFAULT_TTL)
+    cache_group.add_argument("--cache-size", help="Maximum number of cached responses before LRU eviction.",
+                             type=int, default=response_cache.ResponseCache.DEFAULT_MAX_ENTRIES)
+    cache_group.add_argument("--no-cache", help="Disables the response cache.", action="store_true")
+    cache_group.add_argument("--refresh", help="Revalidates cached responses, re-downloading only the changed ones.",
+                             action="store_true")
+    cache_group.add_argument("--names-index", help="Path of the name index that input is checked against.",
+                             default=name_index.NameIndex.DEFAULT_PATH)
+    cache_group.add_argument("--no-name-check", help="Sends every input item to the API without checking it against "
+                                                     "the name index.", action="store_true")
+
+
+def add_network_arguments(parser: argparse.ArgumentParser):
+    """
+    Adds the arguments that configure the connection pool.
+    :param parser: argparse.ArgumentParser object
+    """
+    from pokeretriever import api_handler, connection_pool, rate_limiter
+
+    network_group = parser.add_argument_group("network")
+    network_group.add_argument("--concurrency", help="Maximum number of HTTP requests in flight at once.", type=int,
+                               default=connection_pool.ConnectionPool.DEFAULT_CONCURRENCY)
+    network_group.add_argument("--limit-per-host", help="Maximum number of simultaneous connections to one host.",
+                               type=int, default=connection_pool.ConnectionPool.DEFAULT_LIMIT_PER_HOST)
+    network_group.add_argument("--dns-cache-ttl", help="Seconds resolved host names are cached for.", type=int,
+                               default=connection_pool.ConnectionPool.DEFAULT_DNS_CACHE_TTL)
+    network_group.add_argument("--keepalive-timeout", help="Seconds an idle connection is kept open for reuse.",
+                               type=int, default=connection_pool.ConnectionPool.DEFAULT_KEEPALIVE_TIMEOUT)
+    network_group.add_argument("--base-url", help="Root URL of the API (e.g. a local mirror).",
+                               default=api_handler.APIHandler.BASE_URL)
+    network_group.add_argument("--rate-limit", help="Maximum sustained HTTP requests per second (0 for no limit).",
+                               type=float, default=0)
+    network_group.add_argument("--burst", help="Maximum number of HTTP requests allowed in a burst.", type=int)
+    network_group.add_argument("--retries", help="Number of times a rate limited or failed request is retried.",
+                               type=int, default=rate_limiter.RetryPolicy.DEFAULT_MAX_RETRIES)
+    network_group.add_argument("--backoff-base", help="Maximum seconds waited before the first retry.", type=float,
+                               default=rate_limiter.RetryPolicy.DEFAULT_BACKOFF_BASE)
+    network_group.add_argument("--backoff-max", help="Maximum seconds waited before any retry.", type=float,
+                               default=rate_limiter.RetryPolicy.DEFAULT_BACKOFF_MAX)
+
+
+def parse_stat_criterion(criterion: str) -> tuple:
+    """
+    Parses a stat criterion of the form "stat=value" (e.g. "speed=100").
+    :param criterion: a string, the criterion
+    :return: a tuple, of the stat name and value
+    """
+    stat, separator, value = criterion.partition("=")
+    if not separator or not stat or not value.strip().lstrip("-").isdigit():
+        raise argparse.ArgumentTypeError(f"expected stat=value (e.g. speed=100), got {criterion}")
+
+    return stat.strip().replace(" ", "-").replace("_", "-").lower(), int(value)
+
+
+def parse_stat_weights(weights: str) -> dict:
+    """
+    Parses a stat formula of the form "stat" or "stat=weight,stat=weight" (e.g. "attack=1.5,speed=1").
+    :param weights: a string, the formula
+    :return: a dictionary, mapping stat names to their weights
+    """
+    from pokeretriever import stat_analytics
+
+    stat_weights = {}
+    for term in weights.split(","):
+        stat, separator, weight = term.partition("=")
+        stat = stat.strip().replace(" ", "-").replace("_", "-").lower()
+        if stat not in stat_analytics.StatAnalytics.STATS + (stat_analytics.StatAnalytics.TOTAL,):
+            raise argparse.ArgumentTypeError(f"unknown stat {stat}")
+        try:
+            stat_weights[stat] = float(weight) if separator else 1.0
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"expected stat=weight (e.g. speed=1.5), got {term}")
+
+    return stat_weights
+
+
+def add_query_command(parser: argparse.ArgumentParser):
+    """
+    Adds the arguments of a Pokémon, Ability, or Move query.
+    :param parser: argparse.ArgumentParser object
+    """
+    add_query_arguments(parser)
+    add_cache_arguments(parser)
+    add_network_arguments(parser)
+    parser.set_defaults(handler="handle_query")
+
+
+def add_serve_command(parser: argparse.ArgumentParser):
+    """
+    Adds the arguments of the serve command.
+    :param parser: argparse.ArgumentParser object
+    """
+    import pokedex_server
+    from pokeretriever import memory_cache, snapshot_store
+
+    add_cache_arguments(parser)
+    add_network_arguments(parser)
+    parser.add_argument("--host", help="Host name to listen on.", default=pokedex_server.PokedexServer.DEFAULT_HOST)
+    parser.add_argument("--port", help="Port to listen on.", type=int,
+                        default=pokedex_server.PokedexServer.DEFAULT_PORT)
+    parser.add_argument("--unix-socket", help="Listens on the specified Unix domain socket instead of a port.")
+    parser.add_argument("--memory-size", help="Maximum number of responses and results kept in memory.",
+                        type=int, default=memory_cache.MemoryCache.DEFAULT_MAX_ENTRIES)
+    parser.add_argument("--snapshot", help="Answers every query entirely from an imported snapshot database.",
+                        nargs="?", const=snapshot_store.SnapshotStore.DEFAULT_PATH)
+    parser.set_defaults(handler="handle_serve")
+
+
+def add_shell_command(parser: argparse.ArgumentParser):
+    """
+    Adds the arguments of the shell command.
+    :param parser: argparse.ArgumentParser object
+    """
+    import pokedex_shell
+    from pokeretriever import memory_cache, snapshot_store
+
+    add_cache_arguments(parser)
+    add_network_arguments(parser)
+    parser.add_argument("--memory-size", help="Maximum number of responses and results kept in memory.",
+                        type=int, default=memory_cache.MemoryCache.DEFAULT_MAX_ENTRIES)
+    parser.add_argument("--history", help="Path of the command history file.",
+                        default=pokedex_shell.PokedexShell.DEFAULT_HISTORY_PATH)
+    parser.add_argument("--snapshot", help="Answers every lookup entirely from an imported snapshot database.",
+                        nargs="?", const=snapshot_store.SnapshotStore.DEFAULT_PATH)
+    parser.set_defaults(handler="handle_shell")
+
+
+def add_index_command(parser: argparse.ArgumentParser):
+    """
+    Adds the arguments of the index command.
+    :param parser: argparse.ArgumentParser object
+    """
+    from pokeretriever import pokemon_index, snapshot_store
+
+    add_cache_arguments(parser)
+    add_network_arguments(parser)
+    index_input_group = parser.add_mutually_exclusive_group()
+    index_input_group.add_argument("--inputfile", help="Text file of the Pokémon to index")
+    index_input_group.add_argument("--inputdata", help="Name/ID of a Pokémon to index")
+    index_input_group.add_argument("--from-cache", help="Indexes every Pokémon in the response cache (or the "
+                                                        "snapshot, with --snapshot) without any network access.",
+                                   action="store_true")
+    parser.add_argument("--snapshot", help="Reads the Pokémon from an imported snapshot database.",
+                        nargs="?", const=snapshot_store.SnapshotStore.DEFAULT_PATH)
+    parser.add_argument("--index", help="Path of the index database.", default=pokemon_index.PokemonIndex.DEFAULT_PATH)
+    parser.set_defaults(handler="handle_index")
+
+
+def add_names_command(parser: argparse.ArgumentParser):
+    """
+    Adds the arguments of the names command.
+    :param parser: argparse.ArgumentParser object
+    """
+    from pokeretriever import name_index
+
+    add_cache_arguments(parser)
+    add_network_arguments(parser)
+    parser.add_argument("--type", help="Type of names to refresh (may be repeated, defaults to all).",
+                        action="append", choices=name_index.NameIndex.RESOURCE_TYPES)
+    parser.set_defaults(handler="handle_names", snapshot=None)
+
+
+def add_warm_command(parser: argparse.ArgumentParser):
+    """
+    Adds the arguments of the warm command.
+    :param parser: argparse.ArgumentParser object
+    """
+    from pokeretriever import cache_warmer
+
+    add_cache_arguments(parser)
+    add_network_arguments(parser)
+    parser.add_argument("target", help="Type of resources to prefetch.",
+                        choices=tuple(cache_warmer.CacheWarmer.RESOURCE_TYPES))
+    parser.add_argument("--checkpoint", help="Path of the file progress is recorded in.",
+                        default=cache_warmer.CacheWarmer.DEFAULT_CHECKPOINT)
+    parser.add_argument("--batch-size", help="Number of resources fetched between checkpoints.", type=int,
+                        default=cache_warmer.CacheWarmer.DEFAULT_BATCH_SIZE)
+    parser.add_argument("--restart", help="Ignores the checkpoint of an earlier run.", action="store_true")
+    parser.set_defaults(handler="handle_warm", snapshot=None)
+
+
+def add_sync_command(parser: argparse.ArgumentParser):
+    """
+    Adds the arguments of the sync command.
+    :param parser: argparse.ArgumentParser object
+    """
+    import pokedex_interface
+    from pokeretriever import cache_syncer
+
+    add_cache_arguments(parser)
+    add_network_arguments(parser)
+    parser.add_argument("--type", help="Resource types to refresh (defaults to every cached type).", nargs="+",
+                        type=pokedex_interface.PokedexInterface.clean_input)
+    parser.add_argument("--batch-size", help="Number of responses revalidated between commits.", type=int,
+                        default=cache_syncer.CacheSyncer.DEFAULT_BATCH_SIZE)
+    parser.set_defaults(handler="handle_sync", snapshot=None)
+
+
+def add_learners_command(parser: argparse.ArgumentParser):
+    """
+    Adds the arguments of the learners command.
+    :param parser: argparse.ArgumentParser object
+    """
+    from pokeretriever import pokemon_index
+
+    parser.add_argument("move", help="Name of the move")
+    parser.add_argument("--index", help="Path of the index database.", default=pokemon_index.PokemonIndex.DEFAULT_PATH)
+    parser.set_defaults(handler="handle_learners")
+
+
+def add_search_command(parser: argparse.ArgumentParser):
+    """
+    Adds the arguments of the search command.
+    :param parser: argparse.ArgumentParser object
+    """
+    from pokeretriever import pokemon_index
+
+    parser.add_argument("--type", help="Type the Pokémon must have (may be repeated).", action="append", default=[])
+    parser.add_argument("--ability", help="Ability the Pokémon must have (may be repeated).", action="append",
+                        default=[])
+    parser.add_argument("--move", help="Move the Pokémon must learn (may be repeated).", action="append", default=[])
+    parser.add_argument("--min-stat", help="Minimum base stat, as stat=value (may be repeated).",
+                        action="append", type=parse_stat_criterion, default=[])
+    parser.add_argument("--max-stat", help="Maximum base stat, as stat=value (may be repeated).",
+                        action="append", type=parse_stat_criterion, default=[])
+    parser.add_argument("--index", help="Path of the index database.", default=pokemon_index.PokemonIndex.DEFAULT_PATH)
+    parser.set_defaults(handler="handle_search")
+
+
+def add_stats_command(parser: argparse.ArgumentParser):
+    """
+    Adds the arguments of the stats command, and of its queries.
+    :param parser: argparse.ArgumentParser object
+    """
+    from pokeretriever import pokemon_index
+
+    parser.add_argument("--index", help="Path of the index database.", default=pokemon_index.PokemonIndex.DEFAULT_PATH)
+    parser.set_defaults(handler="handle_stats")
+    stats_subparsers = parser.add_subparsers(dest="stats_query", required=True)
+
+    rank_parser = stats_subparsers.add_parser("rank", help="Ranks the Pokémon by their stat total or a stat formula")
+    rank_parser.add_argument("--by", help="Stat, or weighted formula (e.g. attack=1.5,speed=1), to rank by "
+                                          "(defaults to the stat total).", type=parse_stat_weights)
+    rank_parser.add_argument("--top", help="Number of Pokémon listed.", type=int, default=10)
+    rank_parser.add_argument("--ascending", help="Ranks the lowest scores first.", action="store_true")
+    rank_parser.add_argument("--min-stat", help="Minimum base stat (or total), as stat=value (may be repeated).",
+                             action="append", type=parse_stat_criterion, default=[])
+    rank_parser.add_argument("--max-stat", help="Maximum base stat (or total), as stat=value (may be repeated).",
+                             action="append", type=parse_stat_criterion, default=[])
+
+    percentile_parser = stats_subparsers.add_parser("percentile",
+                                                    help="Shows the percentile of each stat of a Pokémon")
+    percentile_parser.add_argument("pokemon", help="Name/ID of the Pokémon")
+
+    similar_parser = stats_subparsers.add_parser("similar", help="Lists the Pokémon with the closest base stats")
+    similar_parser.add_argument("pokemon", help="Name/ID of the Pokémon")
+    similar_parser.add_argument("--top", help="Number of Pokémon listed.", type=int, default=5)
+
+    compare_parser = stats_subparsers.add_parser("compare", help="Shows the base stats of Pokémon side by side")
+    compare_parser.add_argument("pokemon", help="Names/IDs of the Pokémon", nargs="+")
+
+
+def add_import_snapshot_command(parser: argparse.ArgumentParser):
+    """
+    Adds the arguments of the import-snapshot command.
+    :param parser: argparse.ArgumentParser object
+    """
+    from pokeretriever import snapshot_store
+
+    parser.add_argument("directory", help="Directory containing the PokéAPI JSON files")
+    parser.add_argument("--snapshot", help="Path of the snapshot database to import into.",
+                        default=snapshot_store.SnapshotStore.DEFAULT_PATH)
+    parser.set_defaults(handler="handle_import_snapshot")
+
+
+# The name, help and argument builder of every subcommand
+COMMANDS = (
+    ("pokemon", "Provides info about the specified pokemon", add_query_command),
+    ("ability", "Provides info about the specified ability", add_query_command),
+    ("move", "Provides info about the specified move", add_query_command),
+    ("serve", "Runs a long-running server that answers queries from warm caches", add_serve_command),
+    ("shell", "Runs an interactive shell that answers lookups from warm caches", add_shell_command),
+    ("index", "Builds the inverted indexes used by the learners and search commands", add_index_command),
+    ("names", "Builds, or refreshes, the index of the names and IDs used to check input before it is sent",
+     add_names_command),
+    ("warm", "Prefetches every resource of a type (and everything its expanded information references) into the "
+             "response cache", add_warm_command),
+    ("sync", "Refreshes the cached responses that have changed, with conditional requests", add_sync_command),
+    ("learners", "Lists the indexed Pokémon that can learn a move", add_learners_command),
+    ("search", "Lists the indexed Pokémon that match every criterion", add_search_command),
+    ("stats", "Ranks and compares the indexed Pokémon by their base stats", add_stats_command),
+    ("import-snapshot", "Imports a directory of PokéAPI JSON files into a local snapshot", add_import_snapshot_command),
+)
+
+
+def parse_args(argv: list = None) -> argparse.Namespace:
+    """
+    Handles parsing the arguments that are specified when running this program. Returns the Namespace object
+    of the argparse move_type that contains the argument specified when running this program. Only the arguments of
+    the subcommand being run are added to the parser, since their defaults come from the modules that run it, so that
+    --help imports none of them.
+    :param argv: a list, of the arguments to parse (defaults to the command line arguments)
+    :return: argparse.Namespace object
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    command = next((argument for argument in argv if not argument.startswith("-")), None)
+
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(dest="query", required=True)
+    for name, help_text, add_command in COMMANDS:
+        command_parser = subparsers.add_parser(name, help=help_text)
+        if name == command:
+            add_command(command_parser)
 
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
 def main():
@@ -68,7 +877,7 @@ def main():
     """
     args = parse_args()
     query_handler = QueryHandler()
-    query_handler.handle_query(args)
+    getattr(query_handler, args.handler)(args)
 
 
 if __name__ == '__main__':
@@ -1,13 +1,14 @@
-
 class FileHandler:
     """
     Encompasses the methods for reading and writing files.
     """
 
+    WRITE_BUFFER_SIZE = 1 << 16
+
     @staticmethod
     def open_file(file_name: str) -> list:
         """
-        Handles the input file, and returns the data within the file as a list
+        Handles the input file, and returns the data within the file as a list, skipping blank lines like read_lines
         :param file_name: a string, of the file name
         :return: a list
         """
@@ -15,7 +16,9 @@ class FileHandler:
         try:
             with open(file_name, mode="r", encoding="utf-8") as data:
                 for line in data:
-                    input_data.append(line.rstrip("\n").lower())
+                    line = line.strip()
+                    if line:
+                        input_data.append(line.lower())
 
             return input_data
 
@@ -24,12 +27,28 @@ class FileHandler:
             return
 
     @staticmethod
-    def write_file(file_name: str, pokedex_data: list):
+    def read_lines(file_name: str):
+        """
+        Lazily reads the input file one line at a time, skipping blank lines, so that the whole file is never held in
+        memory.
+        :param file_name: a string, of the file name
+        :return: a generator, of strings
+        """
+        try:
+            with open(file_name, mode="r", encoding="utf-8") as data:
+                for line in data:
+                    line = line.strip()
+                    if line:
+                        yield line.lower()
+
+        except FileNotFoundError:
+            print("File not found!")
+
+    @staticmethod
+    def open_output(file_name: str):
         """
-        Writes the results from the user's query to the user's text file of the specified file name.
+        Opens the user's output file for buffered writing.
         :param file_name: a string, the file name
-        :param pokedex_data: a list, containing the information of the user's query
+        :return: a text file object
         """
-        with open(file_name, mode="w", encoding="utf-8") as data:
-            for entry in pokedex_data:
-                data.write(str(entry))
+        return open(file_name, mode="w", encoding="utf-8", newline="", buffering=FileHandler.WRITE_BUFFER_SIZE)
@@ -0,0 +1,250 @@
+import asyncio
+import collections
+import concurrent.futures
+
+import file_handler
+import pokedex_interface
+import requests
+from pokeretriever import ability, api_handler, move, movepool_filter, pokemon, renderer, response_decoder
+
+
+class ParallelExecutor:
+    """
+    Executes large requests with the CPU-bound work spread across a pool of worker processes. Responses are fetched
+    in chunks on the interface's event loop; the undecoded bodies of each chunk (along with the undecoded bodies of the
+    expanded information they reference) are then sent to a worker process, which decodes them, creates the Pokédex
+    objects and renders them. The rendered chunks are written in input order, or in the order they complete, while the
+    next chunks are being fetched. Expanded information is only held while a chunk that references it is pending.
+    """
+
+    DEFAULT_CHUNK_SIZE = 25
+    CSV_FIELDS = {"pokemon": pokemon.Pokemon.CSV_FIELDS, "ability": ability.Ability.CSV_FIELDS,
+                  "move": move.Move.CSV_FIELDS}
+
+    worker_interface = None
+
+    def __init__(self, interface: pokedex_interface.PokedexInterface, workers: int,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Initializer method.
+        :param interface: a PokedexInterface, used to fetch every response
+        :param workers: an int, the number of worker processes
+        :param chunk_size: an int, the number of items sent to a worker process at once
+        """
+        self.interface = interface
+        self.workers = workers
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def get_worker_interface() -> pokedex_interface.PokedexInterface:
+        """
+        Returns the interface a worker process builds Pokédex objects with, creating it on first use.
+        :return: a PokedexInterface
+        """
+        if ParallelExecutor.worker_interface is None:
+            ParallelExecutor.worker_interface = pokedex_interface.PokedexInterface()
+
+        return ParallelExecutor.worker_interface
+
+    @staticmethod
+    def render_chunk(query_type: str, bodies: list, expanded_data: dict, expanded: bool, output_format: str,
+                     text_separator: str, moves: movepool_filter.MovepoolFilter) -> tuple:
+        """
+        Decodes, creates and renders the Pokédex objects of a chunk of responses. Runs in a worker process.
+        :param query_type: a string, of the type of data queried
+        :param bodies: a list, of the undecoded bodies (or dictionaries) of the chunk's responses
+        :param expanded_data: a dictionary, mapping the URL of each stat, ability and move referenced by the chunk to
+        its undecoded body
+        :param expanded: a boolean, indicating whether or not to include additional information
+        :param output_format: a string, the output format (one of Renderer.FORMATS)
+        :param text_separator: a string, written after each object in the text format
+        :param moves: a MovepoolFilter, that prunes the moves of every Pokémon
+        :return: a tuple, of a list of the rendered Pokédex objects and a list of the indexes of undecodable bodies
+        """
+        interface = ParallelExecutor.get_worker_interface()
+        interface.movepool_filter = moves
+
+        raw_json_data = []
+        failed_indexes = []
+        for index, body in enumerate(bodies):
+            try:
+                raw_json_data.append(body if type(body) is dict else
+                                     response_decoder.ResponseDecoder.decode(body, query_type))
+            except ValueError:
+                failed_indexes.append(index)
+
+        expanded_objects = None
+        if query_type == "pokemon" and expanded:
+            planned_urls = {}
+            expanded_json = []
+            for url, data_type in interface.plan_expanded_urls(raw_json_data).items():
+                try:
+                    if url in expanded_data:
+                        expanded_json.append(response_decoder.ResponseDecoder.decode(expanded_data[url], data_type))
+                        planned_urls[url] = data_type
+                except ValueError:
+                    continue
+            expanded_objects = interface.create_expanded_objects(planned_urls, expanded_json)
+
+        output_renderer = renderer.Renderer(None, output_format, text_separator)
+        return [output_renderer.render(pokedex_object) for pokedex_object in
+                interface.create_pokedex_objects(query_type, raw_json_data, expanded, expanded_objects)], failed_indexes
+
+    def execute(self, request: requests.Requests, output_renderer: renderer.Renderer):
+        """
+        Executes the request, and writes every rendered Pokédex object with the output renderer. Items that could not
+        be fetched are left out, and their errors are added to request.errors.
+        :param request: a Requests object
+        :param output_renderer: a Renderer, that the rendered objects are written with
+        """
+        if request.input_file:
+            input_data = file_handler.FileHandler.read_lines(request.input_file)
+        else:
+            input_data = [request.input_data]
+
+        self.interface.event_loop.run_until_complete(self.execute_async(request, input_data, output_renderer))
+        output_renderer.close()
+
+    async def execute_async(self, request: requests.Requests, input_data, output_renderer: renderer.Renderer):
+        """
+        Fetches the items in chunks, and renders each chunk in the process pool, keeping at most two chunks per worker
+        in flight.
+        :param request: a Requests object
+        :param input_data: an iterable, of the input data
+        :param output_renderer: a Renderer, that the rendered objects are written with
+        """
+        csv_fields = self.CSV_FIELDS[request.query_type]
+        expanded_data = {}
+        expanded_users = collections.Counter()
+        pending = collections.deque()
+
+        with concurrent.futures.ProcessPoolExecutor(self.workers) as process_pool:
+            try:
+                async for chunk in self.iter_chunks(
+                        self.interface.plan_input_async(request.query_type, input_data, request.errors)):
+                    target_urls = api_handler.APIHandler.generate_api_urls(
+                        request.query_type, self.interface.resolve_input_data(request.query_type, chunk,
+                                                                              request.errors),
+                        self.interface.base_url)
+                    responses = await self.interface.fetch_urls_async(request.query_type, target_urls, True)
+
+                    bodies = []
+                    body_urls = []
+                    for url, response in zip(target_urls, responses):
+                        if isinstance(response, api_handler.APIRequestError):
+                            request.errors.append(response)
+                        else:
+                            bodies.append(response)
+                            body_urls.append(url)
+                    if not bodies:
+                        continue
+
+                    chunk_expanded_data = {}
+                    if request.query_type == "pokemon" and request.expanded:
+                        chunk_expanded_data = await self.fetch_expanded_data(bodies, expanded_data, request.errors)
+                        expanded_users.update(list(chunk_expanded_data))
+
+                    future = asyncio.wrap_future(process_pool.submit(
+                        self.render_chunk, request.query_type, bodies, chunk_expanded_data, request.expanded,
+                        output_renderer.output_format, output_renderer.text_separator, self.interface.movepool_filter))
+                    future.body_urls = body_urls
+                    future.expanded_urls = list(chunk_expanded_data)
+                    pending.append(future)
+
+                    while len(pending) >= self.workers * 2:
+                        self.release_expanded_data(
+                            await self.write_next_chunk(pending, request, output_renderer, csv_fields),
+                            expanded_data, expanded_users)
+
+                while pending:
+                    self.release_expanded_data(
+                        await self.write_next_chunk(pending, request, output_renderer, csv_fields),
+                        expanded_data, expanded_users)
+
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    async def write_next_chunk(self, pending: collections.deque, request: requests.Requests,
+                               output_renderer: renderer.Renderer, csv_fields: tuple) -> list:
+        """
+        Waits for the next rendered chunk, and writes it.
+        :param pending: a deque, of the futures of the chunks being rendered, in input order
+        :param request: a Requests object, whose errors the chunk's undecodable responses are added to
+        :param output_renderer: a Renderer, that the rendered objects are written with
+        :param csv_fields: a tuple, of the CSV header of the query type
+        :return: a list, of the URLs of the expanded information the chunk referenced
+        """
+        if request.ordered:
+            future = pending.popleft()
+            await future
+        else:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            future = done.pop()
+            pending.remove(future)
+
+        rendered_objects, failed_indexes = future.result()
+        for index in failed_indexes:
+            request.errors.append(api_handler.APIRequestError(api_handler.APIRequestError.NO_RESULTS_MESSAGE,
+                                                              future.body_urls[index], 200))
+
+        for text in rendered_objects:
+            output_renderer.write_rendered(text, csv_fields)
+
+        return future.expanded_urls
+
+    @staticmethod
+    def release_expanded_data(expanded_urls: list, expanded_data: dict, expanded_users: collections.Counter):
+        """
+        Releases the expanded information referenced by a written chunk, dropping every body that no pending chunk
+        references any more.
+        :param expanded_urls: a list, of the URLs of the expanded information the chunk referenced
+        :param expanded_data: a dictionary, mapping the URL of the expanded information held to its undecoded body
+        :param expanded_users: a Counter, of the number of pending chunks that reference each URL
+        """
+        for url in expanded_urls:
+            expanded_users[url] -= 1
+            if expanded_users[url] <= 0:
+                del expanded_users[url]
+                expanded_data.pop(url, None)
+
+    async def fetch_expanded_data(self, bodies: list, expanded_data: dict, errors: list) -> dict:
+        """
+        Fetches the undecoded body of every stat, ability and move referenced by a chunk that is not already held for
+        a pending chunk. The bodies are decoded by the worker process.
+        :param bodies: a list, of the undecoded bodies (or dictionaries) of the chunk's Pokémon
+        :param expanded_data: a dictionary, mapping every URL held for a pending chunk to its undecoded body
+        :param errors: a list, that the errors of failed requests are added to
+        :return: a dictionary, mapping the URL of everything the chunk references to its undecoded body
+        """
+        projection = "pokemon" if self.interface.movepool_filter.has_details_criteria() else "pokemon-references"
+        references = [body if type(body) is dict else response_decoder.ResponseDecoder.decode(body, projection)
+                      for body in bodies]
+        planned_urls = self.interface.plan_expanded_urls(references)
+        missing_urls = [url for url in planned_urls if url not in expanded_data]
+
+        if missing_urls:
+            for url, response in zip(missing_urls,
+                                     await self.interface.fetch_urls_async("expanded", missing_urls, True)):
+                if isinstance(response, api_handler.APIRequestError):
+                    errors.append(response)
+                else:
+                    expanded_data[url] = response
+
+        return {url: expanded_data[url] for url in planned_urls if url in expanded_data}
+
+    async def iter_chunks(self, input_data):
+        """
+        An Async generator that splits the input data into chunks.
+        :param input_data: an async iterable, of the input data
+        :return: an async generator, of lists
+        """
+        chunk = []
+        async for data in input_data:
+            chunk.append(data)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
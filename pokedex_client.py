@@ -0,0 +1,96 @@
+import http.client
+import json
+import socket
+import urllib.parse
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """
+    An HTTP connection over a Unix domain socket.
+    """
+
+    def __init__(self, socket_path: str, timeout: float = None):
+        """
+        Initializer method.
+        :param socket_path: a string, the path of the Unix domain socket
+        :param timeout: a float, the number of seconds to wait for the server
+        """
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        """
+        Connects to the Unix domain socket.
+        """
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class PokedexClientError(Exception):
+    """
+    Raised when a query cannot be forwarded to, or is rejected by, a Pokédex server.
+    """
+
+
+class PokedexClient:
+    """
+    A thin client that forwards queries to a running Pokédex server (see PokedexServer), using only the standard
+    library.
+    """
+
+    DEFAULT_TIMEOUT = 300
+
+    def __init__(self, address: str, timeout: float = DEFAULT_TIMEOUT):
+        """
+        Initializer method.
+        :param address: a string, the address of the server, either "http://host:port" or "unix:/path/to/socket"
+        :param timeout: a float, the number of seconds to wait for the server
+        """
+        self.address = address
+        self.timeout = timeout
+
+    def create_connection(self) -> http.client.HTTPConnection:
+        """
+        Creates a connection to the server's address.
+        :return: an HTTPConnection
+        """
+        if self.address.startswith("unix:"):
+            return UnixHTTPConnection(self.address[len("unix:"):], self.timeout)
+
+        parsed = urllib.parse.urlsplit(self.address if "://" in self.address else f"http://{self.address}")
+        return http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=self.timeout)
+
+    def query(self, query_type: str, items: list, expanded: bool = False, output_format: str = None,
+              text_separator: str = "\n", moves_limit: int = None, moves_filter: str = None,
+              version_group: str = None) -> dict:
+        """
+        Forwards a query to the server.
+        :param query_type: a string, of the type of data to be queried
+        :param items: a list, of the names or IDs of the items
+        :param expanded: a boolean, indicating whether or not to include additional information
+        :param output_format: a string, the format the server should also render the results in (optional)
+        :param text_separator: a string, written after each result in the text format
+        :param moves_limit: an int, the maximum number of moves listed per Pokémon (optional)
+        :param moves_filter: a string, the learn method the listed moves must be learned by (optional)
+        :param version_group: a string, the version group the listed moves must be learned in (optional)
+        :return: a dictionary, with the "results", "errors" and (if a format was given) "output" of the query
+        """
+        payload = {"query": query_type, "items": items, "expanded": expanded, "format": output_format,
+                   "text_separator": text_separator, "moves_limit": moves_limit, "moves_filter": moves_filter,
+                   "version_group": version_group}
+        connection = self.create_connection()
+        try:
+            connection.request("POST", "/query", body=json.dumps(payload).encode("utf-8"),
+                               headers={"Content-Type": "application/json"})
+            response = connection.getresponse()
+            body = response.read()
+        except OSError as error:
+            raise PokedexClientError(f"Could not reach the Pokédex server at {self.address}: {error}")
+        finally:
+            connection.close()
+
+        if response.status != 200:
+            raise PokedexClientError(f"The Pokédex server rejected the query: {body.decode('utf-8', 'replace')}")
+
+        return json.loads(body)
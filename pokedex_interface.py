@@ -1,7 +1,10 @@
 import file_handler
-from pokeretriever import pokemon, ability, move, api_handler
+from pokeretriever import (pokemon, ability, move, api_handler, connection_pool, instrumentation, movepool_filter,
+                           name_index, records, response_decoder, selector_planner)
 
 import asyncio
+import collections
+import copy
 import requests
 
 
@@ -10,27 +13,132 @@ class PokedexInterface:
     The facade class that abstracts the complexity of classes and methods within the pokeretriever package that the user
     does not need to see. Contains the methods required for handling user requests, and create & returning the
     specified Pokédex objects.
+
+    The coroutine methods (fetch_pokemon, fetch_ability, fetch_move, fetch_many and execute_request_async) run on the
+    caller's event loop, so they can be awaited from inside an existing asyncio application, e.g.:
+
+    async with PokedexInterface(session=session) as interface:
+        pikachu, eevee = await asyncio.gather(interface.fetch_pokemon("pikachu"), interface.fetch_pokemon("eevee"))
+
+    The synchronous methods (e.g. execute_request) are thin wrappers that run the coroutines on the interface's own
+    event loop. An interface should be used from a single event loop.
     """
 
-    @staticmethod
-    def get_raw_pokedex_info(query_type: str, input_data: list) -> list:
+    def __init__(self, cache=None, pool: connection_pool.ConnectionPool = None,
+                 base_url: str = api_handler.APIHandler.BASE_URL, data_source=None, session=None, name_index=None,
+                 moves: movepool_filter.MovepoolFilter = None):
+        """
+        Initializer method.
+        :param cache: a ResponseCache, used to serve responses without making HTTP requests (optional)
+        :param pool: a ConnectionPool, whose session is shared by every request this interface makes (optional)
+        :param base_url: a string, the root URL of the API
+        :param data_source: an object with get_responses(target_urls) and list_ids(resource_type) methods (e.g. a
+        SnapshotStore), that serves every request locally instead of the API (optional)
+        :param session: an aiohttp.ClientSession owned by the caller, used (and left open) by the interface's
+        connection pool when no pool is given (optional)
+        :param name_index: a NameIndex, that input is validated and canonicalized against before any request is made
+        (optional)
+        :param moves: a MovepoolFilter, that prunes the moves of every Pokémon before they are created or expanded
+        (optional, every move is kept by default)
+        """
+        self.cache = cache
+        self.pool = pool or connection_pool.ConnectionPool(session=session)
+        self.base_url = base_url
+        self.data_source = data_source
+        self.name_index = name_index
+        self.movepool_filter = moves or movepool_filter.MovepoolFilter()
+        self.event_loop = asyncio.new_event_loop()
+
+    def with_movepool_filter(self, moves: movepool_filter.MovepoolFilter) -> "PokedexInterface":
+        """
+        Returns a copy of the interface that shares its cache, connection pool, event loop and name index, but prunes
+        movepools with another filter, so that concurrent queries with different filters do not interfere.
+        :param moves: a MovepoolFilter
+        :return: a PokedexInterface
+        """
+        interface = copy.copy(self)
+        interface.movepool_filter = moves
+
+        return interface
+
+    def close(self):
+        """
+        Closes the pooled HTTP session and the event loop it runs on.
+        """
+        if self.event_loop.is_closed():
+            return
+
+        self.event_loop.run_until_complete(self.pool.close())
+        self.event_loop.close()
+
+    async def aclose(self):
+        """
+        Closes the pooled HTTP session (unless it is owned by the caller) from the caller's event loop.
+        """
+        await self.pool.close()
+        if not self.event_loop.is_closed():
+            self.event_loop.close()
+
+    async def __aenter__(self):
+        """
+        Enters an async with block.
+        :return: the PokedexInterface
+        """
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        """
+        Closes the interface at the end of an async with block.
+        """
+        await self.aclose()
+
+    async def fetch_urls_async(self, query_type: str, target_urls: list, raw: bool = False) -> list:
+        """
+        Fetches the JSON data of the given URLs from the local data source if there is one, otherwise through the
+        shared connection pool.
+        :param query_type: a string, of the type of data to be queried
+        :param target_urls: a list, of the API URLs to request
+        :param raw: a boolean, if True responses fetched through the pool are returned undecoded (the data source
+        always returns dictionaries)
+        :return: a list of dictionaries, containing the raw JSON data (or APIRequestErrors for failed URLs)
+        """
+        if self.data_source is not None:
+            responses = self.data_source.get_responses(target_urls)
+            return [response if response is not None else
+                    api_handler.APIRequestError(api_handler.APIRequestError.NO_RESULTS_MESSAGE, url)
+                    for url, response in zip(target_urls, responses)]
+
+        api_handler_obj = api_handler.APIHandler(query_type, target_urls, self.cache, self.pool, raw, self.name_index)
+
+        return await api_handler_obj.process_multiple_requests()
+
+    async def get_raw_pokedex_info_async(self, query_type: str, input_data: list, raw: bool = False) -> list:
         """
         Returns the raw JSON data from the API URL(s).
         :param query_type: a string, of the type of data to be queried
         :param input_data: a list, of the input data
-        :return: a list of dictionaries, containing the raw JSON data
+        :param raw: a boolean, if True responses fetched through the pool are returned undecoded
+        :return: a list of dictionaries, containing the raw JSON data (or APIRequestErrors for failed URLs)
         """
-        target_urls = api_handler.APIHandler.generate_api_urls(query_type, input_data)
-
-        api_handler_obj = api_handler.APIHandler(query_type, target_urls)
-        data_json = api_handler_obj.handle_api_requests()
+        with instrumentation.PROFILER.phase("generate_api_urls"):
+            target_urls = api_handler.APIHandler.generate_api_urls(query_type, input_data, self.base_url)
 
-        return data_json
+        return await self.fetch_urls_async(query_type, target_urls, raw)
 
     def execute_request(self, request: requests.Requests) -> list:
         """
-        Executes the user specified request, and creates, and returns, the appropriate Pokédex object. Handles calling
-        helper methods to get API responses and to transform the raw JSON data into the appropriate Pokédex objects.
+        Executes the user specified request, and creates, and returns, the appropriate Pokédex object, on the
+        interface's event loop. Items that could not be fetched are left out, and their errors are added to
+        request.errors.
+        :param request: a Requests object
+        :return: a list, containing PokédexObject(s)
+        """
+        return self.event_loop.run_until_complete(self.execute_request_async(request))
+
+    async def execute_request_async(self, request: requests.Requests) -> list:
+        """
+        Executes the user specified request on the caller's event loop. Items that could not be fetched are left out,
+        and their errors are added to request.errors.
         :param request: a Requests object
         :return: a list, containing PokédexObject(s)
         """
@@ -39,12 +147,205 @@ class PokedexInterface:
         else:
             request.input_data = [request.input_data]
 
-        cleaned_input_data = self.clean_input_data(request.input_data)
-        raw_json_data = self.get_raw_pokedex_info(request.query_type, cleaned_input_data)
+        return await self.fetch_many(request.query_type, request.input_data, request.expanded, request.errors)
 
-        if request.query_type == "pokemon":
-            pokedex_objects = self.create_pokemon(raw_json_data, request.expanded)
-        elif request.query_type == "ability":
+    async def fetch_many(self, query_type: str, input_data: list, expanded: bool = False, errors: list = None) -> list:
+        """
+        Fetches and creates the Pokédex objects of every item of input data in one concurrent batch. Handles calling
+        helper methods to get API responses and to transform the raw JSON data into the appropriate Pokédex objects.
+        Items that could not be fetched are left out.
+        :param query_type: a string, of the type of data to be queried ("pokemon", "ability" or "move")
+        :param input_data: a list, of the names or IDs of the items, or selectors of them (e.g. "1-151")
+        :param expanded: a boolean, indicating whether or not to include additional information
+        :param errors: a list, that the errors of items that could not be fetched are added to (optional)
+        :return: a list, containing PokédexObject(s)
+        """
+        errors = errors if errors is not None else []
+        input_data = [data async for data in self.plan_input_async(query_type, input_data, errors)]
+        cleaned_input_data = self.resolve_input_data(query_type, input_data, errors)
+        raw_json_data = self.split_errors(await self.get_raw_pokedex_info_async(query_type, cleaned_input_data),
+                                          errors)
+
+        expanded_objects = None
+        if query_type == "pokemon" and expanded:
+            expanded_objects = await self.resolve_expanded_objects_async(raw_json_data, errors)
+
+        return self.create_pokedex_objects(query_type, raw_json_data, expanded, expanded_objects)
+
+    async def fetch_one(self, query_type: str, data: str, expanded: bool = False):
+        """
+        Fetches and creates the Pokédex object of a single item.
+        :param query_type: a string, of the type of data to be queried ("pokemon", "ability" or "move")
+        :param data: a string, the name or ID of the item
+        :param expanded: a boolean, indicating whether or not to include additional information
+        :return: a PokédexObject
+        :raises APIRequestError: if the item could not be fetched
+        """
+        errors = []
+        pokedex_objects = await self.fetch_many(query_type, [str(data)], expanded, errors)
+        if not pokedex_objects:
+            raise errors[0]
+
+        return pokedex_objects[0]
+
+    async def fetch_pokemon(self, data: str, expanded: bool = False) -> pokemon.Pokemon:
+        """
+        Fetches a single Pokémon on the caller's event loop.
+        :param data: a string, the name or ID of the Pokémon
+        :param expanded: a boolean, indicating whether or not to include the expanded stats, abilities and moves
+        :return: a Pokemon
+        :raises APIRequestError: if the Pokémon could not be fetched
+        """
+        return await self.fetch_one("pokemon", data, expanded)
+
+    async def fetch_ability(self, data: str) -> ability.Ability:
+        """
+        Fetches a single ability on the caller's event loop.
+        :param data: a string, the name or ID of the ability
+        :return: an Ability
+        :raises APIRequestError: if the ability could not be fetched
+        """
+        return await self.fetch_one("ability", data)
+
+    async def fetch_move(self, data: str) -> move.Move:
+        """
+        Fetches a single move on the caller's event loop.
+        :param data: a string, the name or ID of the move
+        :return: a Move
+        :raises APIRequestError: if the move could not be fetched
+        """
+        return await self.fetch_one("move", data)
+
+    @staticmethod
+    def split_errors(responses: list, errors: list) -> list:
+        """
+        Separates the failed requests from the successful responses.
+        :param responses: a list, of dictionaries (or APIRequestErrors)
+        :param errors: a list, that the APIRequestErrors are added to
+        :return: a list, of the successful responses
+        """
+        successes = []
+        for response in responses:
+            if isinstance(response, api_handler.APIRequestError):
+                errors.append(response)
+            else:
+                successes.append(response)
+
+        return successes
+
+    def stream_request(self, request: requests.Requests):
+        """
+        Executes the user specified request as a stream. Input lines are read lazily, at most request.window of them
+        are fetched at once, and each Pokédex object is yielded as soon as it has been created, either in input order
+        or in the order they complete. Items that could not be fetched are skipped, and their errors are added to
+        request.errors.
+        :param request: a Requests object
+        :return: a generator, of PokédexObject(s)
+        """
+        if request.input_file:
+            input_data = file_handler.FileHandler.read_lines(request.input_file)
+        else:
+            input_data = [request.input_data]
+
+        object_stream = self.stream_pokedex_objects(request.query_type, input_data, request.expanded, request.window,
+                                                    request.ordered, request.errors)
+        try:
+            while True:
+                try:
+                    yield self.event_loop.run_until_complete(object_stream.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            self.event_loop.run_until_complete(object_stream.aclose())
+
+    async def stream_pokedex_objects(self, query_type: str, input_data, expanded: bool, window: int, ordered: bool,
+                                     errors: list):
+        """
+        An Async generator that fetches and creates the Pokédex objects of the input data through a bounded window of
+        concurrent tasks.
+        :param query_type: a string, of the type of data to be queried
+        :param input_data: an iterable, of the input data
+        :param expanded: a boolean, indicating whether or not to include additional information
+        :param window: an int, the maximum number of items fetched at once
+        :param ordered: a boolean, if True objects are yielded in input order, otherwise as they complete
+        :param errors: a list, that the errors of items that could not be fetched are added to
+        :return: an async generator, of PokédexObject(s)
+        """
+        pending = collections.deque()
+        try:
+            async for data in self.plan_input_async(query_type, input_data, errors):
+                pending.append(asyncio.ensure_future(self.fetch_pokedex_object(query_type, data, expanded, errors)))
+
+                while len(pending) >= window:
+                    pokedex_object = await self.next_completed(pending, ordered)
+                    if pokedex_object is not None:
+                        yield pokedex_object
+
+            while pending:
+                pokedex_object = await self.next_completed(pending, ordered)
+                if pokedex_object is not None:
+                    yield pokedex_object
+
+        finally:
+            for task in pending:
+                task.cancel()
+
+    @staticmethod
+    async def next_completed(pending: collections.deque, ordered: bool):
+        """
+        Waits for, and removes, the next task to yield from the pending tasks.
+        :param pending: a deque, of the pending tasks in input order
+        :param ordered: a boolean, if True the oldest task is waited for, otherwise the first to complete
+        :return: the result of the task
+        """
+        if ordered:
+            return await pending.popleft()
+
+        done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        task = done.pop()
+        pending.remove(task)
+
+        return task.result()
+
+    async def fetch_pokedex_object(self, query_type: str, data: str, expanded: bool, errors: list):
+        """
+        Fetches and creates the Pokédex object of a single item of input data.
+        :param query_type: a string, of the type of data to be queried
+        :param data: a string, the name or ID of the item
+        :param expanded: a boolean, indicating whether or not to include additional information
+        :param errors: a list, that the errors of failed requests are added to
+        :return: a PokédexObject, or None if the item could not be fetched
+        """
+        pokedex_objects = await self.fetch_many(query_type, [data], expanded, errors)
+
+        return pokedex_objects[0] if pokedex_objects else None
+
+    def load_local_pokemon(self):
+        """
+        Lazily creates every Pokémon held locally, from the data source (e.g. a snapshot) if there is one, otherwise
+        from the response cache, without making any HTTP requests.
+        :return: a generator, of Pokémon objects
+        """
+        source = self.data_source if self.data_source is not None else self.cache
+        if source is None:
+            return
+
+        for body in source.iter_bodies("pokemon"):
+            yield self.create_pokemon([response_decoder.ResponseDecoder.decode(body, "pokemon")], False)[0]
+
+    def create_pokedex_objects(self, query_type: str, raw_json_data: list, expanded: bool,
+                               expanded_objects: dict = None) -> list:
+        """
+        Creates the appropriate Pokédex objects from the raw JSON data of the specified query type.
+        :param query_type: a string, of the type of data to be queried
+        :param raw_json_data: a list, of dictionaries containing the raw JSON data
+        :param expanded: a boolean, indicating whether or not to include additional information
+        :param expanded_objects: a dictionary, of already resolved expanded information (optional)
+        :return: a list, containing PokédexObject(s)
+        """
+        if query_type == "pokemon":
+            pokedex_objects = self.create_pokemon(raw_json_data, expanded, expanded_objects)
+        elif query_type == "ability":
             pokedex_objects = self.create_ability(raw_json_data)
         else:
             pokedex_objects = self.create_move(raw_json_data)
@@ -59,20 +360,128 @@ class PokedexInterface:
         """
         cleaned_input_data = []
         for data in input_data:
-            cleaned_input_data.append(data.replace(" ", "-").replace("_", "-").lower())
+            cleaned_input_data.append(self.clean_input(data))
 
         return cleaned_input_data
 
-    def create_pokemon(self, data: list, expanded: bool) -> pokemon:
+    def plan_input_async(self, query_type: str, input_data, errors: list):
+        """
+        Expands the selectors of the input data (e.g. "1-151", "all" or "type:fire") into the items they select.
+        :param query_type: a string, of the type of data queried
+        :param input_data: an iterable, of the input data
+        :param errors: a list, that the errors of selectors that could not be resolved are added to
+        :return: an async generator, of strings
+        """
+        return selector_planner.SelectorPlanner(self).plan(query_type, input_data, errors)
+
+    def resolve_input_data(self, query_type: str, input_data: list, errors: list) -> list:
+        """
+        Cleans the user's input data and, if the name index has the names of the query type, replaces each item with
+        its canonical ID. Items that are not in the index are left out without making any request, and an error
+        suggesting the closest names is added to errors in their place.
+        :param query_type: a string, of the type of data queried
+        :param input_data: a list, of the input data
+        :param errors: a list, that the errors of unknown items are added to
+        :return: a list, of the user's cleaned (and canonicalized) input
+        """
+        cleaned_input_data = self.clean_input_data(input_data)
+        if self.name_index is None or not self.name_index.has(query_type):
+            return cleaned_input_data
+
+        resolved_input_data = []
+        for data in cleaned_input_data:
+            item_id = self.name_index.resolve(query_type, data)
+            if item_id is not None:
+                resolved_input_data.append(item_id)
+                continue
+
+            suggestions = self.name_index.suggest(query_type, data)
+            message = f"No {query_type} named {data}."
+            if suggestions:
+                message = f"No {query_type} named {data}, did you mean: {', '.join(suggestions)}?"
+            errors.append(api_handler.APIRequestError(message))
+
+        return resolved_input_data
+
+    def refresh_name_index(self, query_types: list = name_index.NameIndex.RESOURCE_TYPES) -> dict:
+        """
+        Refreshes the names of the given query types in the name index, on the interface's event loop.
+        :param query_types: a list, of the types of data whose names are refreshed
+        :return: a dictionary, mapping each query type to a tuple of its number of names and whether it was updated
+        """
+        return self.event_loop.run_until_complete(self.refresh_name_index_async(query_types))
+
+    async def refresh_name_index_async(self, query_types: list = name_index.NameIndex.RESOURCE_TYPES) -> dict:
+        """
+        Refreshes the names of the given query types in the name index from the API's list endpoints. The size of
+        each list is checked with a single one item page first, and the full list is only downloaded if it has
+        changed since it was last indexed.
+        :param query_types: a list, of the types of data whose names are refreshed
+        :return: a dictionary, mapping each query type to a tuple of its number of names and whether it was updated
+        :raises APIRequestError: if a list could not be fetched
+        """
+        counts = await asyncio.gather(*[self.fetch_list_count_async(query_type) for query_type in query_types])
+        changed_types = [(query_type, count) for query_type, count in zip(query_types, counts)
+                         if count != self.name_index.get_count(query_type)]
+        pages = await asyncio.gather(*[self.fetch_list_page_async(query_type, count)
+                                       for query_type, count in changed_types])
+
+        for (query_type, count), page in zip(changed_types, pages):
+            self.name_index.replace(query_type, name_index.NameIndex.parse_list_response(page), count)
+
+        updated_types = {query_type for query_type, _ in changed_types}
+        return {query_type: (count, query_type in updated_types) for query_type, count in zip(query_types, counts)}
+
+    async def fetch_list_count_async(self, query_type: str) -> int:
+        """
+        Returns the number of items of a type of data, as reported by its list endpoint.
+        :param query_type: a string, of the type of data (e.g. "pokemon" or "stat")
+        :return: an int
+        :raises APIRequestError: if the list could not be fetched
+        """
+        return (await self.fetch_list_page_async(query_type, 1))["count"]
+
+    async def fetch_list_page_async(self, query_type: str, limit: int) -> dict:
+        """
+        Fetches the first page of the list endpoint of a type of data. List pages are never read from, or stored in,
+        the response cache.
+        :param query_type: a string, of the type of data (e.g. "pokemon" or "stat")
+        :param limit: an int, the number of items on the page
+        :return: a dictionary, of the JSON data of the page
+        :raises APIRequestError: if the list could not be fetched
+        """
+        list_url = f"{self.base_url.rstrip('/')}/{query_type}/?offset=0&limit={max(limit, 1)}"
+        api_handler_obj = api_handler.APIHandler(query_type, [list_url], None, self.pool)
+        response = (await api_handler_obj.process_multiple_requests())[0]
+        if isinstance(response, api_handler.APIRequestError):
+            raise response
+
+        return response
+
+    @staticmethod
+    def clean_input(data: str) -> str:
+        """
+        Cleans a single item of the user's input data.
+        :param data: a string, the name or ID of the item
+        :return: a string
+        """
+        return data.replace(" ", "-").replace("_", "-").lower()
+
+    @instrumentation.profiled("create_pokemon")
+    def create_pokemon(self, data: list, expanded: bool, expanded_objects: dict = None) -> pokemon:
         """
         Creates a Pokémon, or list of Pokémon, objects given the attributes of a Pokémon.
         :param data: a list, containing the dictionary of Pokémon attributes
         :param expanded: a boolean, indicating whether or not to include additional information
+        :param expanded_objects: a dictionary, of already resolved expanded information (optional)
         :return: a list, of Pokémon objects
         """
         if type(data) is not list:
             data: list = [data]
 
+        if expanded and expanded_objects is None:
+            expanded_objects = self.resolve_expanded_objects(data)
+
         pokemon_list = []
         for pokemon_data in data:
             name = pokemon_data["name"]
@@ -80,15 +489,16 @@ class PokedexInterface:
             height = pokemon_data["height"]
             weight = pokemon_data["weight"]
 
-            stats = self.get_pokemon_stats(pokemon_data["stats"], expanded)
+            stats = self.get_pokemon_stats(pokemon_data["stats"], expanded_objects)
             types = self.get_pokemon_types(pokemon_data["types"])
-            abilities = self.get_pokemon_abilities(pokemon_data["abilities"], expanded)
-            moves = self.get_pokemon_moves(pokemon_data["moves"], expanded)
+            abilities = self.get_pokemon_abilities(pokemon_data["abilities"], expanded_objects)
+            moves = self.get_pokemon_moves(pokemon_data["moves"], expanded_objects)
 
             pokemon_list.append(pokemon.Pokemon(name, pkm_id, height, weight, stats, types, abilities, moves))
 
         return pokemon_list
 
+    @instrumentation.profiled("create_ability")
     def create_ability(self, data: list) -> ability:
         """
         Creates a Ability object, that contains the information of the specified Ability.
@@ -122,6 +532,7 @@ class PokedexInterface:
 
         return abilities
 
+    @instrumentation.profiled("create_move")
     def create_move(self, data: list) -> move:
         """
         Creates a Move object, that contains the information of the specified Move.
@@ -152,6 +563,7 @@ class PokedexInterface:
 
         return moves
 
+    @instrumentation.profiled("get_pokemon_types")
     def get_pokemon_types(self, pokemon_type_data: list) -> list:
         """
         Extracts the specified type attributes for the Pokémon and returns a list of the information.
@@ -163,72 +575,123 @@ class PokedexInterface:
             types.append(pkm_type["type"]["name"])
         return types
 
-    def get_pokemon_stats(self, pokemon_stats_data: list, expanded: bool) -> list:
+    @instrumentation.profiled("plan_expanded_urls")
+    def plan_expanded_urls(self, data: list) -> dict:
+        """
+        Collects the URLs of every stat, ability, and move referenced by the given Pokémon, without duplicates, so
+        that the expanded information for a whole batch can be fetched at once. Only the moves kept by the movepool
+        filter are included, so that pruned moves are never fetched.
+        :param data: a list, containing the dictionaries of Pokémon attributes
+        :return: a dictionary, mapping each unique URL to the type of data it refers to ("stat", "ability" or "move")
+        """
+        planned_urls = {}
+        for pokemon_data in data:
+            for stat in pokemon_data["stats"]:
+                planned_urls.setdefault(stat["stat"]["url"], "stat")
+            for ability in pokemon_data["abilities"]:
+                planned_urls.setdefault(ability["ability"]["url"], "ability")
+            for move, _ in self.movepool_filter.select(pokemon_data["moves"]):
+                planned_urls.setdefault(move["move"]["url"], "move")
+
+        return planned_urls
+
+    def resolve_expanded_objects(self, data: list, errors: list = None) -> dict:
+        """
+        Fetches the expanded information of every stat, ability, and move referenced by the given Pokémon in a single
+        concurrent batch on the interface's event loop, and builds each of them once.
+        :param data: a list, containing the dictionaries of Pokémon attributes
+        :param errors: a list, that the errors of failed requests are added to (optional)
+        :return: a dictionary, mapping each URL to its expanded StatDetail, Ability, or Move
+        """
+        return self.event_loop.run_until_complete(self.resolve_expanded_objects_async(data, errors))
+
+    async def resolve_expanded_objects_async(self, data: list, errors: list = None) -> dict:
+        """
+        Fetches the expanded information of every stat, ability, and move referenced by the given Pokémon in a single
+        concurrent batch, and builds each of them once. URLs that could not be fetched are left out, so the affected
+        entries are reported without their expanded information.
+        :param data: a list, containing the dictionaries of Pokémon attributes
+        :param errors: a list, that the errors of failed requests are added to (optional)
+        :return: a dictionary, mapping each URL to its expanded StatDetail, Ability, or Move
+        """
+        planned_urls = self.plan_expanded_urls(data)
+        if not planned_urls:
+            return {}
+
+        data_json = await self.fetch_urls_async("expanded", list(planned_urls))
+
+        return self.create_expanded_objects(planned_urls, data_json, errors)
+
+    def create_expanded_objects(self, planned_urls: dict, data_json: list, errors: list = None) -> dict:
+        """
+        Builds the expanded StatDetail, Ability, or Move of every planned URL from its fetched JSON data.
+        :param planned_urls: a dictionary, mapping each URL to the type of data it refers to (see plan_expanded_urls)
+        :param data_json: a list, of the JSON data of each planned URL, in the same order (or APIRequestErrors)
+        :param errors: a list, that the errors of failed requests are added to (optional)
+        :return: a dictionary, mapping each URL to its expanded StatDetail, Ability, or Move
+        """
+        expanded_objects = {}
+        for (url, data_type), expanded_data in zip(planned_urls.items(), data_json):
+            if isinstance(expanded_data, api_handler.APIRequestError):
+                if errors is not None:
+                    errors.append(expanded_data)
+            elif data_type == "stat":
+                expanded_objects[url] = records.StatDetail(records.intern(expanded_data["name"]), expanded_data["id"],
+                                                           expanded_data["is_battle_only"])
+            elif data_type == "ability":
+                expanded_objects[url] = self.create_ability(expanded_data)[0]
+            else:
+                expanded_objects[url] = self.create_move(expanded_data)[0]
+
+        return expanded_objects
+
+    @instrumentation.profiled("get_pokemon_stats")
+    def get_pokemon_stats(self, pokemon_stats_data: list, expanded_objects: dict = None) -> list:
         """
         Extracts the specified stat attributes for the Pokémon and returns a list of the information.
         :param pokemon_stats_data: a list, of the unprocessed information of the Pokémon's stats
-        :param expanded: a boolean, if expanded information has been requested
-        :return: a list, containing the Pokémon's stat information
+        :param expanded_objects: a dictionary, of the resolved expanded information if it has been requested
+        :return: a list, of StatRecords containing the Pokémon's stat information
         """
         stats = []
         for stat in pokemon_stats_data:
-            temp_dict = {"name": stat["stat"]["name"], "base_stat": stat["base_stat"], "url": stat["stat"]["url"]}
-
-            if expanded:
-                expanded_url = temp_dict["url"]
-                expanded_data = asyncio.run(api_handler.APIHandler.process_single_request_task(expanded_url))
-                expanded_temp_dict = {"name": expanded_data["name"], "id": expanded_data["id"],
-                                      "is_battle_only": expanded_data["is_battle_only"]}
-                temp_dict.update({"expanded": expanded_temp_dict})
+            url = records.intern(stat["stat"]["url"])
+            expanded = expanded_objects.get(url) if expanded_objects is not None else None
 
-            stats.append(temp_dict)
+            stats.append(records.StatRecord(records.intern(stat["stat"]["name"]), stat["base_stat"], url, expanded))
         return stats
 
-    def get_pokemon_abilities(self, pokemon_abilities_data: list, expanded: bool) -> list:
+    @instrumentation.profiled("get_pokemon_abilities")
+    def get_pokemon_abilities(self, pokemon_abilities_data: list, expanded_objects: dict = None) -> list:
         """
         Extracts the specified ability attributes for the Pokémon and returns a list of the information.
         :param pokemon_abilities_data: a list, containing the unprocessed information of the Pokémon's abilities
-        :param expanded: a boolean, if expanded information has been requested
-        :return: a list, containing the Pokémon abilities
+        :param expanded_objects: a dictionary, of the resolved expanded information if it has been requested
+        :return: a list, of AbilityRecords containing the Pokémon abilities
         """
         abilities = []
         for ability in pokemon_abilities_data:
-            temp_dict = {"name": ability["ability"]["name"], "url": ability["ability"]["url"]}
+            url = records.intern(ability["ability"]["url"])
+            expanded = expanded_objects.get(url) if expanded_objects is not None else None
 
-            if expanded:
-                expanded_url = temp_dict["url"]
-                expanded_data = asyncio.run(api_handler.APIHandler.process_single_request_task(expanded_url))
-                expanded_ability = self.create_ability(expanded_data)[0]
-                temp_dict.update({"expanded": expanded_ability})
-
-            abilities.append(temp_dict)
+            abilities.append(records.AbilityRecord(records.intern(ability["ability"]["name"]), url, expanded))
         return abilities
 
-    def get_pokemon_moves(self, pokemon_move_data: list, expanded: bool) -> list:
+    @instrumentation.profiled("get_pokemon_moves")
+    def get_pokemon_moves(self, pokemon_move_data: list, expanded_objects: dict = None) -> list:
         """
-        Gets the moves that the specified Pokémon can learn through asynchronous HTTP Get get_pokedex_entry, extracts
-        key move attributes and returns a list of these attributes for each move that the Pokémon can learn.
+        Extracts key move attributes and returns a list of these attributes for each move that the Pokémon can learn,
+        and that is kept by the movepool filter.
         :param pokemon_move_data: a list, containing the unprocessed information about the moves of a Pokémon
-        :param expanded: a boolean, if expanded information has been requested
-        :return: a list, containing the Pokémon moves
+        :param expanded_objects: a dictionary, of the resolved expanded information if it has been requested
+        :return: a list, of MoveRecords containing the Pokémon moves
         """
-        expanded_move_urls = []
         moves = []
-        for move in pokemon_move_data:
-            temp_dict = {"name": move["move"]["name"],
-                         "level_learned_at": move["version_group_details"][0]["level_learned_at"],
-                         "url": move["move"]["url"]}
-
-            if expanded:
-                expanded_move_urls.append(temp_dict["url"])
-
-            moves.append(temp_dict)
-
-        api_handler_obj = api_handler.APIHandler("move", expanded_move_urls)
-        data_json = api_handler_obj.handle_api_requests()
+        for move, details in self.movepool_filter.select(pokemon_move_data):
+            url = records.intern(move["move"]["url"])
+            expanded = expanded_objects.get(url) if expanded_objects is not None else None
+            level_learned_at = details["level_learned_at"] if details is not None else None
 
-        if expanded:
-            for index in range(0, len(moves)):
-                moves[index].update({"expanded": self.create_move(data_json[index])[0]})
+            moves.append(records.MoveRecord(records.intern(move["move"]["name"]), level_learned_at, url, expanded))
 
         return moves
@@ -0,0 +1,163 @@
+import io
+import os
+import signal
+import time
+import typing
+
+import pokedex_interface
+from pokeretriever import memory_cache, movepool_filter, object_memo, renderer
+
+if typing.TYPE_CHECKING:
+    from aiohttp import web
+
+
+class PokedexServer:
+    """
+    A long-running daemon that answers Pokémon, Ability and Move queries over a local HTTP or Unix domain socket. A
+    single PokedexInterface (and so a single pooled HTTP session and in-memory response cache) is kept alive between
+    queries, and every Pokédex object it creates is memoized, so that repeated queries are answered from memory.
+
+    API:
+    POST /query {"query": "pokemon", "items": ["pikachu", "25"], "expanded": false, "format": "text",
+                 "moves_limit": 4, "moves_filter": "level-up", "version_group": "red-blue"}
+        -> {"results": [...], "errors": [...], "output": "..."} ("output" only if a format was given)
+    GET /health -> {"status": "ok", ...}
+
+    aiohttp's web server is only imported once the server is started.
+    """
+
+    DEFAULT_HOST = "127.0.0.1"
+    DEFAULT_PORT = 8642
+    QUERY_TYPES = ("pokemon", "ability", "move")
+
+    def __init__(self, interface: pokedex_interface.PokedexInterface, host: str = DEFAULT_HOST,
+                 port: int = DEFAULT_PORT, unix_socket: str = None,
+                 max_objects: int = memory_cache.MemoryCache.DEFAULT_MAX_ENTRIES, ttl: int = 0):
+        """
+        Initializer method.
+        :param interface: a PokedexInterface, used to answer every query
+        :param host: a string, the host name the HTTP server listens on
+        :param port: an int, the port the HTTP server listens on
+        :param unix_socket: a string, the path of a Unix domain socket to listen on instead of host and port (optional)
+        :param max_objects: an int, the maximum number of Pokédex objects kept in memory
+        :param ttl: an int, the number of seconds a Pokédex object is kept for (0 or less never expires)
+        """
+        self.interface = interface
+        self.host = host
+        self.port = port
+        self.unix_socket = unix_socket
+        self.objects = object_memo.ObjectMemo(max_objects, ttl)
+        self.started_at = time.time()
+        self.query_count = 0
+
+    async def handle_query(self, request: "web.Request") -> "web.Response":
+        """
+        Answers a query, as JSON.
+        :param request: a web.Request, whose JSON body describes the query
+        :return: a web.Response
+        """
+        from aiohttp import web
+
+        try:
+            payload = await request.json()
+        except ValueError:
+            raise web.HTTPBadRequest(text="The body of a query must be a JSON object")
+        if type(payload) is not dict:
+            raise web.HTTPBadRequest(text="The body of a query must be a JSON object")
+
+        query_type = str(payload.get("query", "")).lower()
+        items = payload.get("items")
+        output_format = payload.get("format")
+        if query_type not in self.QUERY_TYPES:
+            raise web.HTTPBadRequest(text=f"query must be one of {', '.join(self.QUERY_TYPES)}")
+        if type(items) is not list or not items:
+            raise web.HTTPBadRequest(text="items must be a non-empty list of names or IDs")
+        if output_format is not None and output_format not in renderer.Renderer.FORMATS:
+            raise web.HTTPBadRequest(text=f"format must be one of {', '.join(renderer.Renderer.FORMATS)}")
+        moves_limit = payload.get("moves_limit")
+        if moves_limit is not None and (type(moves_limit) is not int or moves_limit < 0):
+            raise web.HTTPBadRequest(text="moves_limit must be a non-negative integer")
+        for option in ("moves_filter", "version_group"):
+            if payload.get(option) is not None and type(payload[option]) is not str:
+                raise web.HTTPBadRequest(text=f"{option} must be a string")
+        moves = movepool_filter.MovepoolFilter(moves_limit, *[
+            pokedex_interface.PokedexInterface.clean_input(payload[option]) if payload.get(option) else None
+            for option in ("moves_filter", "version_group")])
+
+        self.query_count += 1
+        errors = []
+        pokedex_objects = await self.objects.get_pokedex_objects(self.interface, query_type,
+                                                                 [str(item) for item in items],
+                                                                 bool(payload.get("expanded")), errors, moves)
+        if self.interface.cache is not None:
+            self.interface.cache.commit()
+
+        body = {"results": [pokedex_object.to_dict() for pokedex_object in pokedex_objects],
+                "errors": [str(error) for error in errors]}
+        if output_format is not None:
+            output = io.StringIO()
+            renderer.Renderer(output, output_format, payload.get("text_separator", "\n")).write_all(pokedex_objects)
+            body["output"] = output.getvalue()
+
+        return web.json_response(body)
+
+    async def handle_health(self, request: "web.Request") -> "web.Response":
+        """
+        Reports that the server is running, along with its cache statistics.
+        :param request: a web.Request
+        :return: a web.Response
+        """
+        from aiohttp import web
+
+        cache = self.interface.cache
+        return web.json_response({"status": "ok", "uptime": time.time() - self.started_at,
+                                  "queries": self.query_count, "cached_objects": len(self.objects),
+                                  "object_hits": self.objects.hits, "object_misses": self.objects.misses,
+                                  "response_hits": cache.hits if cache is not None else 0,
+                                  "response_misses": cache.misses if cache is not None else 0})
+
+    def create_application(self) -> "web.Application":
+        """
+        Creates the web application of the server's API.
+        :return: a web.Application
+        """
+        from aiohttp import web
+
+        application = web.Application()
+        application.router.add_post("/query", self.handle_query)
+        application.router.add_get("/health", self.handle_health)
+
+        return application
+
+    def serve_forever(self):
+        """
+        Serves queries on the interface's event loop until the process is interrupted or terminated.
+        """
+        from aiohttp import web
+
+        event_loop = self.interface.event_loop
+        runner = web.AppRunner(self.create_application())
+        event_loop.run_until_complete(runner.setup())
+
+        if self.unix_socket:
+            if os.path.exists(self.unix_socket):
+                os.remove(self.unix_socket)
+            site = web.UnixSite(runner, self.unix_socket)
+            address = f"unix:{self.unix_socket}"
+        else:
+            site = web.TCPSite(runner, self.host, self.port)
+            address = f"http://{self.host}:{self.port}"
+
+        event_loop.run_until_complete(site.start())
+        event_loop.add_signal_handler(signal.SIGTERM, event_loop.stop)
+        print(f"Serving the Pokédex on {address}", flush=True)
+
+        try:
+            event_loop.run_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            event_loop.remove_signal_handler(signal.SIGTERM)
+            event_loop.run_until_complete(runner.cleanup())
+            if self.unix_socket and os.path.exists(self.unix_socket):
+                os.remove(self.unix_socket)
@@ -0,0 +1,261 @@
+import argparse
+import cmd
+import os
+import shlex
+import sys
+import time
+
+import pokedex_interface
+from pokeretriever import api_handler, memory_cache, movepool_filter, object_memo, renderer
+
+try:
+    import readline
+except ImportError:
+    readline = None
+
+
+class PokedexShell(cmd.Cmd):
+    """
+    An interactive shell that answers one query per line, e.g.:
+
+    pokedex> pokemon pikachu --expanded
+    pokedex> move ice-beam thunderbolt --format json
+
+    A single PokedexInterface (and so a single event loop, pooled HTTP session and in-memory response cache) is kept
+    alive for the whole session, and every Pokédex object it creates is kept in an in-memory LRU, so that repeated
+    lookups are answered from memory. Commands are kept in a history file, and item names are completed with the tab
+    key from the name index and the results seen so far.
+    """
+
+    intro = "Pokédex shell. Type help for the commands, or exit to quit."
+    prompt = "pokedex> "
+    QUERY_TYPES = ("pokemon", "ability", "move")
+    DEFAULT_HISTORY_PATH = os.path.join(os.path.expanduser("~"), ".cache", "pokedex", "shell_history")
+    HISTORY_LENGTH = 1000
+
+    def __init__(self, interface: pokedex_interface.PokedexInterface,
+                 max_objects: int = memory_cache.MemoryCache.DEFAULT_MAX_ENTRIES, ttl: int = 0,
+                 history_path: str = DEFAULT_HISTORY_PATH, stdin=None, stdout=None):
+        """
+        Initializer method.
+        :param interface: a PokedexInterface, used to answer every query
+        :param max_objects: an int, the maximum number of Pokédex objects kept in memory
+        :param ttl: an int, the number of seconds a Pokédex object is kept for (0 or less never expires)
+        :param history_path: a string, the path of the command history file (None to keep no history)
+        :param stdin: a text stream, that commands are read from (defaults to sys.stdin)
+        :param stdout: a text stream, that results are written to (defaults to sys.stdout)
+        """
+        super().__init__(stdin=stdin, stdout=stdout)
+        self.interface = interface
+        self.objects = object_memo.ObjectMemo(max_objects, ttl)
+        self.history_path = history_path
+        self.seen_names = {query_type: set() for query_type in self.QUERY_TYPES}
+        self.query_parser = self.create_query_parser()
+        if stdin is not None:
+            self.use_rawinput = False
+
+    @staticmethod
+    def create_query_parser() -> argparse.ArgumentParser:
+        """
+        Creates the parser of the arguments of a query command.
+        :return: argparse.ArgumentParser object
+        """
+        parser = argparse.ArgumentParser(prog="<pokemon|ability|move>", add_help=False)
+        parser.add_argument("items", help="Names/IDs, or selectors (e.g. 1-151 or type:fire)", nargs="+")
+        parser.add_argument("--expanded", help="Provides additional information.", action="store_true")
+        parser.add_argument("--format", help="Output format of the results.", choices=renderer.Renderer.FORMATS,
+                            default="text")
+        parser.add_argument("--moves-limit", help="Maximum number of moves listed per Pokémon.",
+                            type=movepool_filter.MovepoolFilter.parse_limit)
+        parser.add_argument("--moves-filter", help="Only lists the moves learned by a learn method.",
+                            type=pokedex_interface.PokedexInterface.clean_input)
+        parser.add_argument("--version-group", help="Only lists the moves learned in a version group.",
+                            type=pokedex_interface.PokedexInterface.clean_input)
+
+        return parser
+
+    def preloop(self):
+        """
+        Loads the command history, and enables tab completion, before the first command is read.
+        """
+        if readline is None or self.history_path is None:
+            return
+
+        readline.set_history_length(self.HISTORY_LENGTH)
+        readline.set_completer_delims(" \t\n")
+        if os.path.exists(self.history_path):
+            readline.read_history_file(self.history_path)
+
+    def postloop(self):
+        """
+        Saves the command history after the last command.
+        """
+        if readline is None or self.history_path is None:
+            return
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.history_path)), exist_ok=True)
+        readline.write_history_file(self.history_path)
+
+    def emptyline(self):
+        """
+        Does nothing when an empty line is entered (instead of repeating the last command).
+        """
+
+    def default(self, line: str):
+        """
+        Reports an unknown command.
+        :param line: a string, the command
+        """
+        print(f"ERROR: Unknown command {line.split()[0]}, type help for the commands", file=self.stdout)
+
+    def do_pokemon(self, arguments: str):
+        """
+        pokemon NAME|ID... [--expanded] [--format F] [--moves-limit N] [--moves-filter M] [--version-group V]
+        Looks up Pokémon.
+        """
+        self.run_query("pokemon", arguments)
+
+    def do_ability(self, arguments: str):
+        """
+        ability NAME|ID... [--format F]
+        Looks up abilities.
+        """
+        self.run_query("ability", arguments)
+
+    def do_move(self, arguments: str):
+        """
+        move NAME|ID... [--format F]
+        Looks up moves.
+        """
+        self.run_query("move", arguments)
+
+    def do_history(self, arguments: str):
+        """
+        history
+        Lists the commands entered so far.
+        """
+        if readline is None:
+            print("ERROR: History requires the readline module", file=self.stdout)
+            return
+
+        for index in range(1, readline.get_current_history_length() + 1):
+            print(f"{index:>5}  {readline.get_history_item(index)}", file=self.stdout)
+
+    def do_cache(self, arguments: str):
+        """
+        cache
+        Shows how many responses and Pokédex objects are held in memory, and how often they were reused.
+        """
+        cache = self.interface.cache
+        if cache is not None:
+            print(f"Responses: {len(cache)} in memory, {cache.hits} hit(s), {cache.misses} miss(es)", file=self.stdout)
+        print(f"Objects: {len(self.objects)} in memory, {self.objects.hits} hit(s), {self.objects.misses} miss(es)",
+              file=self.stdout)
+
+    def do_exit(self, arguments: str) -> bool:
+        """
+        exit
+        Leaves the shell.
+        """
+        return True
+
+    do_quit = do_exit
+
+    def do_EOF(self, arguments: str) -> bool:
+        """
+        Leaves the shell at the end of the input (Ctrl-D).
+        """
+        print(file=self.stdout)
+        return True
+
+    def complete_pokemon(self, text: str, line: str, begin: int, end: int) -> list:
+        """
+        Completes the names of Pokémon, and the options of a query.
+        """
+        return self.complete_query("pokemon", text)
+
+    def complete_ability(self, text: str, line: str, begin: int, end: int) -> list:
+        """
+        Completes the names of abilities, and the options of a query.
+        """
+        return self.complete_query("ability", text)
+
+    def complete_move(self, text: str, line: str, begin: int, end: int) -> list:
+        """
+        Completes the names of moves, and the options of a query.
+        """
+        return self.complete_query("move", text)
+
+    def complete_query(self, query_type: str, text: str) -> list:
+        """
+        Returns the completions of a word of a query: an option, or a name from the name index or the results seen so
+        far.
+        :param query_type: a string, of the type of data queried
+        :param text: a string, the start of the word
+        :return: a list, of strings
+        """
+        if text.startswith("-"):
+            return sorted(option for option in self.query_parser._option_string_actions if option.startswith(text))
+
+        names = set(self.seen_names[query_type])
+        name_index = self.interface.name_index
+        if name_index is not None and name_index.has(query_type):
+            name_index.load(query_type)
+            names.update(name_index.names[query_type])
+
+        text = text.lower()
+        return sorted(name for name in names if name.startswith(text))
+
+    def run_query(self, query_type: str, arguments: str):
+        """
+        Answers a query command, and writes its results.
+        :param query_type: a string, of the type of data queried
+        :param arguments: a string, the arguments of the command
+        """
+        try:
+            args = self.query_parser.parse_args(shlex.split(arguments))
+        except ValueError as error:
+            print(f"ERROR: {error}", file=self.stdout)
+            return
+        except SystemExit:
+            # argparse has already reported the invalid arguments
+            return
+
+        moves = movepool_filter.MovepoolFilter(args.moves_limit, args.moves_filter, args.version_group)
+        started_at = time.perf_counter()
+        errors = []
+        try:
+            pokedex_objects = self.interface.event_loop.run_until_complete(
+                self.objects.get_pokedex_objects(self.interface, query_type, args.items, args.expanded, errors, moves))
+            renderer.Renderer(self.stdout, args.format, "\n").write_all(pokedex_objects)
+        except KeyboardInterrupt:
+            print("Interrupted", file=self.stdout)
+            return
+        except (api_handler.APIRequestError, ValueError) as error:
+            print(f"ERROR: {error}", file=self.stdout)
+            return
+        except KeyError as error:
+            print(f"ERROR: Unexpected response, missing {error}", file=self.stdout)
+            return
+        finally:
+            if self.interface.cache is not None:
+                self.interface.cache.commit()
+
+        self.seen_names[query_type].update(pokedex_object.name for pokedex_object in pokedex_objects)
+        for error in errors:
+            print(f"ERROR: {error}", file=self.stdout)
+        print(f"({len(pokedex_objects)} result(s) in {(time.perf_counter() - started_at) * 1000:.1f} ms)",
+              file=self.stdout)
+
+    def run(self):
+        """
+        Runs the shell until the user leaves it, or interrupts it.
+        """
+        try:
+            self.cmdloop()
+        except KeyboardInterrupt:
+            print(file=self.stdout)
+            self.postloop()
+        except api_handler.APIRequestError as error:
+            print(f"ERROR: {error}", file=sys.stderr)
+            self.postloop()
@@ -1,4 +1,4 @@
-from pokeretriever import pokedex_object
+from pokeretriever import pokedex_object, records
 
 
 class Ability(pokedex_object.PokedexObject):
@@ -7,6 +7,10 @@ class Ability(pokedex_object.PokedexObject):
     and reports it.
     """
 
+    __slots__ = ("generation", "effect", "effect_short", "pokemon")
+
+    CSV_FIELDS = ("id", "name", "generation", "effect", "effect_short", "pokemon")
+
     def __init__(self, name: str, ability_id: str, generation: str, effect: str, effect_short: str, pokemon: list):
         """
         Initializer method.
@@ -18,10 +22,10 @@ class Ability(pokedex_object.PokedexObject):
         :param pokemon: a list of strings, containing the names of the Pokémon who can learn the move
         """
         super().__init__(name, ability_id)
-        self.generation = generation
+        self.generation = records.intern(generation)
         self.effect = effect
         self.effect_short = effect_short
-        self.pokemon = pokemon
+        self.pokemon = tuple(records.intern(pkm) for pkm in pokemon)
 
     def __str__(self):
         """
@@ -38,10 +42,19 @@ class Ability(pokedex_object.PokedexObject):
         Unpacks the Pokémon who can learn this ability.
         :return: a string
         """
-        pokemon_string = ""
-        for pokemon in self.pokemon:
-            pokemon_string += f"{pokemon.title()}, "
+        return ", ".join([pokemon.title() for pokemon in self.pokemon]) + "."
 
-        pokemon_string = pokemon_string[:-2]
-        pokemon_string += "."
-        return pokemon_string
+    def to_dict(self) -> dict:
+        """
+        Returns the fields of the ability as a dictionary that can be serialized as JSON.
+        :return: a dictionary
+        """
+        return {"id": self.id, "name": self.name, "generation": self.generation, "effect": self.effect,
+                "effect_short": self.effect_short, "pokemon": list(self.pokemon)}
+
+    def to_row(self) -> list:
+        """
+        Returns the fields of the ability as a flat row, in the order of CSV_FIELDS.
+        :return: a list
+        """
+        return [self.id, self.name, self.generation, self.effect, self.effect_short, ";".join(self.pokemon)]
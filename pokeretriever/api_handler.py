@@ -1,6 +1,41 @@
+from pokeretriever import connection_pool, instrumentation, rate_limiter, response_decoder
+
 import asyncio
-import aiohttp
-import sys
+import contextlib
+import functools
+import typing
+
+if typing.TYPE_CHECKING:
+    import aiohttp
+
+
+class APIRequestError(Exception):
+    """
+    Describes a request that the API did not return any results for. Raised for single requests, and returned in place
+    of the response of a failed request when processing multiple requests.
+    """
+
+    NO_RESULTS_MESSAGE = "No results found, check your spelling and query type (Pokémon/Ability/Move)."
+
+    def __init__(self, message: str, url: str = None, status: int = None, retry_after: str = None):
+        """
+        Initializer method.
+        :param message: a string, describing why the request failed
+        :param url: a string, the URL of the failed request
+        :param status: an int, the HTTP status of the failed response (None if no response was received)
+        :param retry_after: a string, the Retry-After header of the failed response (optional)
+        """
+        super().__init__(message)
+        self.message = message
+        self.url = url
+        self.status = status
+        self.retry_after = retry_after
+
+    def __str__(self):
+        """
+        Overridden string method.
+        """
+        return f"{self.message} ({self.url})" if self.url else self.message
 
 
 class APIHandler:
@@ -8,71 +43,212 @@ class APIHandler:
     Encompasses the methods for making Asynchronous HTTP GET request(s) to the API, and returns the data.
     """
 
-    def __init__(self, query_type: str, target_urls: list):
+    BASE_URL = "https://pokeapi.co/api/v2"
+
+    def __init__(self, query_type: str, target_urls: list, cache=None, pool: connection_pool.ConnectionPool = None,
+                 raw: bool = False, name_index=None, resolve_aliases: bool = True):
+        """
+        Initializer method.
+        :param query_type: a string, of the type of data to be queried
+        :param target_urls: a list, of the API URLs to request
+        :param cache: a ResponseCache, checked before making any HTTP request (optional)
+        :param pool: a ConnectionPool, whose session is reused instead of opening a new one (optional)
+        :param raw: a boolean, if True the undecoded bodies of the responses are returned instead of dictionaries
+        :param name_index: a NameIndex, that URLs requesting a resource by name are canonicalized to its ID with
+        (optional)
+        :param resolve_aliases: a boolean, if False every URL is requested exactly as given, instead of through the
+        alias it shares with other URLs of the same resource
+        """
         self.query_type = query_type
         self.target_urls = target_urls
+        self.cache = cache
+        self.pool = pool
+        self.raw = raw
+        self.name_index = name_index
+        self.resolve_aliases = resolve_aliases
 
     @staticmethod
-    def generate_api_urls(query_type: str, input_data: list):
+    def generate_api_urls(query_type: str, input_data: list, base_url: str = BASE_URL):
         """
         Given the list of input data, the appropriate API URLs are generated and returned as a list
         :param query_type: a string, of the type of data to be queried
         :param input_data: a list, of the input data
+        :param base_url: a string, the root URL of the API
         :return: a list, containing the API URLs
         """
-        base_url = "https://pokeapi.co/api/v2/{0}/{1}"
+        target_url = base_url.rstrip("/") + "/{0}/{1}"
         target_urls = []
 
         for data in input_data:
-            target_urls.append(base_url.format(query_type, data))
+            target_urls.append(target_url.format(query_type, data))
 
         return target_urls
 
     @staticmethod
-    async def process_single_request_task(api_url: str) -> dict:
+    def get_cached_response(api_url: str, cache, raw: bool = False) -> dict:
         """
-        Handles a single Async task and returns the response as a JSON.
+        Returns the cached JSON of the specified URL, or None if there is no cache or the URL is not cached.
         :param api_url: a string, of the URL of the API to get data from
-        :return: a dictionary
+        :param cache: a ResponseCache, or None
+        :param raw: a boolean, if True the undecoded body is returned
+        :return: a dictionary (or a string if raw), or None
         """
-        async with aiohttp.ClientSession() as session:
-            response_dict = await APIHandler.get_api_response(api_url, session)
+        if cache is None:
+            return None
+
+        cached_body = cache.get(api_url)
+        instrumentation.PROFILER.record_cache_lookup(cached_body is not None)
+        if cached_body is None or raw:
+            return cached_body
+
+        return APIHandler.decode_response(api_url, cached_body)
 
-            return response_dict
+    @staticmethod
+    def decode_response(api_url: str, body) -> dict:
+        """
+        Decodes the body of a response, keeping only the fields needed for the resource type of the URL.
+        :param api_url: a string, of the URL of the response
+        :param body: a string or bytes object, the body of the response
+        :return: a dictionary
+        """
+        with instrumentation.PROFILER.phase("json_decode"):
+            resource_type = response_decoder.ResponseDecoder.get_resource_type(api_url)
+            return response_decoder.ResponseDecoder.decode(body, resource_type)
 
     @staticmethod
-    async def get_api_response(api_url: str, session: aiohttp.ClientSession) -> dict:
+    async def get_api_response(api_url: str, session: "aiohttp.ClientSession", cache=None,
+                               pool: connection_pool.ConnectionPool = None, raw: bool = False) -> dict:
         """
         An Async coroutine that performs a GET HTTP request to the API, converts the response to a JSON, and returns
-        the JSON.
+        the JSON. If a cache is provided, successful responses are stored in it along with their validators, and a
+        response it holds (e.g. one that has expired) is revalidated with a conditional request, so that its body is
+        reused without being downloaded again if the API reports that it has not changed (304). If a pool is provided,
+        its semaphore and token bucket limit the request, and rate limited (429) or failed (5xx) requests are retried
+        according to its retry policy.
         :param api_url: a string, of the target URL to make the API request to
         :param session: an HTTP session
-        :return: a dictionary
+        :param cache: a ResponseCache (optional)
+        :param pool: a ConnectionPool, whose limits and retry policy are applied (optional)
+        :param raw: a boolean, if True the undecoded body is returned (only checked to be a JSON object)
+        :return: a dictionary (or a bytes object if raw)
         """
+        stale = cache.get_stale(api_url) if cache is not None else None
+        attempt = 0
+        while True:
+            try:
+                body, etag, last_modified = await APIHandler.attempt_api_request(api_url, session, pool, stale)
+                break
+
+            except APIRequestError as error:
+                retryable = error.status is None or error.status in rate_limiter.RetryPolicy.RETRYABLE_STATUSES
+                if pool is None or not retryable or attempt >= pool.retry_policy.max_retries:
+                    raise
+
+                await asyncio.sleep(pool.retry_policy.get_delay(attempt, error.retry_after))
+                attempt += 1
+
+        revalidated = body is None
+        if revalidated:
+            body = stale[0].encode("utf-8")
+            instrumentation.PROFILER.record_revalidation()
+
         try:
-            response = await session.request(method="GET", url=api_url)
-            response_dict = await response.json()
+            if raw and not body.lstrip().startswith(b"{"):
+                raise ValueError("The body of the response is not a JSON object")
+            response = body if raw else APIHandler.decode_response(api_url, body)
+        except ValueError:
+            raise APIRequestError(APIRequestError.NO_RESULTS_MESSAGE, api_url, 200)
 
-            return response_dict
+        if revalidated:
+            cache.revalidate(api_url)
+        elif cache is not None:
+            cache.set(api_url, body.decode("utf-8"), etag, last_modified)
 
-        except aiohttp.ContentTypeError:
-            print("ERROR: No results found, check your spelling and query type (Pokémon/Ability/Move).")
-            sys.exit(1)
+        return response
 
-    def handle_api_requests(self):
+    @staticmethod
+    async def attempt_api_request(api_url: str, session: "aiohttp.ClientSession",
+                                  pool: connection_pool.ConnectionPool = None, stale: tuple = None) -> tuple:
         """
-        Handles the API get_pokedex_entry and responses by initiating the Asynchronous method call.
-        :return: a dictionary, or a list of dictionaries
+        Performs a single attempt at a GET HTTP request to the API, and returns the body of the response along with
+        its validators. If a stale response is given, the request is conditional on its validators.
+        :param api_url: a string, of the target URL to make the API request to
+        :param session: an HTTP session
+        :param pool: a ConnectionPool, whose semaphore and token bucket limit the request (optional)
+        :param stale: a tuple, of the body, ETag and Last-Modified header of a cached response (optional)
+        :return: a tuple, of the body (a bytes object, or None if the stale response has not changed), the ETag and
+        the Last-Modified header
         """
-        return asyncio.run(self.process_multiple_requests())
+        import aiohttp
+
+        headers = {}
+        if stale is not None and stale[1]:
+            headers["If-None-Match"] = stale[1]
+        if stale is not None and stale[2]:
+            headers["If-Modified-Since"] = stale[2]
 
-    async def process_multiple_requests(self) -> tuple:
+        if pool is not None and pool.token_bucket is not None:
+            await pool.token_bucket.acquire()
+
+        semaphore = pool.semaphore if pool is not None and pool.semaphore is not None else contextlib.nullcontext()
+        try:
+            async with semaphore:
+                profiled_request = instrumentation.PROFILER.request_started(api_url)
+                body, status = b"", None
+                try:
+                    async with session.get(api_url, headers=headers) as response:
+                        status = response.status
+                        body = await response.read()
+                finally:
+                    instrumentation.PROFILER.request_finished(api_url, profiled_request, len(body), status)
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+            raise APIRequestError(f"Request failed: {str(error) or type(error).__name__}.", api_url)
+
+        if response.status == 304 and headers:
+            return None, response.headers.get("ETag", stale[1]), response.headers.get("Last-Modified", stale[2])
+        if response.status == 404:
+            raise APIRequestError(APIRequestError.NO_RESULTS_MESSAGE, api_url, response.status)
+        if response.status != 200:
+            raise APIRequestError(f"Request failed with HTTP status {response.status}.", api_url, response.status,
+                                  response.headers.get("Retry-After"))
+
+        return body, response.headers.get("ETag"), response.headers.get("Last-Modified")
+
+    async def process_multiple_requests(self) -> list:
         """
-        Handles processing multiple HTTP GET request through Asynchronous coroutine calls.
-        :return: a list, of dictionaries of the requestd data from the API
+        Handles processing multiple HTTP GET request through Asynchronous coroutine calls. A failed request does not
+        stop the others; an APIRequestError describing the failure is returned in place of its response. Requests for
+        the same resource (including by name and by ID, if the name index or an earlier response links them) share a
+        single HTTP request, whose response is returned for each of them, unless resolve_aliases is False.
+        :return: a list, of dictionaries of the requestd data from the API (or APIRequestErrors)
         """
-        async with aiohttp.ClientSession() as session:
-            async_coroutines = [self.get_api_response(url, session) for url in self.target_urls]
-            responses = await asyncio.gather(*async_coroutines)
+        pool = self.pool or connection_pool.ConnectionPool()
+        request_urls = [pool.coalescer.resolve(url, self.name_index) if self.resolve_aliases else url
+                        for url in self.target_urls]
+        responses = [self.get_cached_response(url, self.cache, self.raw) for url in request_urls]
+        uncached_indexes = [index for index, response in enumerate(responses) if response is None]
 
+        for url, response in zip(request_urls, responses):
+            pool.coalescer.record_aliases(url, response)
+
+        if not uncached_indexes:
             return responses
+
+        try:
+            session = await pool.get_session()
+            fetch_response = functools.partial(self.get_api_response, session=session, cache=self.cache, pool=pool,
+                                               raw=self.raw)
+            async_coroutines = [pool.coalescer.fetch(request_urls[index], fetch_response, self.raw)
+                                for index in uncached_indexes]
+            fetched_responses = await asyncio.gather(*async_coroutines, return_exceptions=True)
+        finally:
+            if self.pool is None:
+                await pool.close()
+
+        for index, response in zip(uncached_indexes, fetched_responses):
+            if isinstance(response, BaseException) and not isinstance(response, APIRequestError):
+                raise response
+            responses[index] = response
+
+        return responses
@@ -0,0 +1,80 @@
+import time
+
+from pokeretriever import api_handler
+
+
+class CacheSyncer:
+    """
+    Brings every response held in the response cache up to date, whether or not it has expired. Each one is
+    revalidated with a conditional request on the validators (ETag and Last-Modified) it was stored with, so that only
+    the responses that have changed are downloaded again; the others are answered with an empty 304 and marked as
+    fresh. The requests are made in batches through the interface's connection pool, whose limits bound the number of
+    requests in flight. Every cached URL is requested exactly as it is stored (by name or by ID), without resolving it
+    to an alias, so that each entry is the one revalidated.
+    """
+
+    DEFAULT_BATCH_SIZE = 100
+
+    def __init__(self, interface, batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        Initializer method.
+        :param interface: a PokedexInterface, with the response cache to bring up to date
+        :param batch_size: an int, the number of responses revalidated between commits
+        """
+        self.interface = interface
+        self.batch_size = batch_size
+
+    def sync(self, resource_types: list = None, report_progress=None) -> tuple:
+        """
+        Brings the cached responses up to date, on the interface's event loop.
+        :param resource_types: a list, of the resource types to sync (optional, every cached type by default)
+        :param report_progress: a function, called after every batch with the number of responses checked, their
+        total, and the number checked per second (optional)
+        :return: a tuple, of a dictionary counting the responses checked, unchanged, updated and failed (along with the
+        number of bytes downloaded), and a list of the APIRequestErrors of the responses that could not be revalidated
+        """
+        return self.interface.event_loop.run_until_complete(self.sync_async(resource_types, report_progress))
+
+    async def sync_async(self, resource_types: list = None, report_progress=None) -> tuple:
+        """
+        Brings the cached responses up to date. A response counts as updated if its body has changed, and as
+        unchanged if the API reported that it has not (or returned the same body, when it sends no validators).
+        :param resource_types: a list, of the resource types to sync (optional, every cached type by default)
+        :param report_progress: a function, called after every batch with the number of responses checked, their
+        total, and the number checked per second (optional)
+        :return: a tuple, of a dictionary counting the responses checked, unchanged, updated and failed (along with the
+        number of bytes downloaded), and a list of the APIRequestErrors of the responses that could not be revalidated
+        """
+        cache = self.interface.cache
+        urls = cache.list_urls(resource_types)
+        counts = {"checked": 0, "unchanged": 0, "updated": 0, "failed": 0, "bytes": 0}
+        errors = []
+        started_at = time.perf_counter()
+
+        refresh, cache.refresh = cache.refresh, True
+        try:
+            for offset in range(0, len(urls), self.batch_size):
+                batch = urls[offset:offset + self.batch_size]
+                stored_bodies = [(cache.get_stale(url) or (None,))[0] for url in batch]
+                handler = api_handler.APIHandler("sync", batch, cache, self.interface.pool, True, None, False)
+                responses = await handler.process_multiple_requests()
+
+                for stored_body, response in zip(stored_bodies, responses):
+                    counts["checked"] += 1
+                    if isinstance(response, api_handler.APIRequestError):
+                        counts["failed"] += 1
+                        errors.append(response)
+                    elif response.decode("utf-8") == stored_body:
+                        counts["unchanged"] += 1
+                    else:
+                        counts["updated"] += 1
+                        counts["bytes"] += len(response)
+
+                cache.commit()
+                if report_progress is not None:
+                    report_progress(counts["checked"], len(urls),
+                                    counts["checked"] / max(time.perf_counter() - started_at, 1e-9))
+        finally:
+            cache.refresh = refresh
+
+        return counts, errors
@@ -0,0 +1,138 @@
+import json
+import os
+import time
+
+from pokeretriever import api_handler, name_index
+
+
+class CacheWarmer:
+    """
+    Prefetches every resource of the given types into the response cache, so that later queries (including expanded
+    ones) are answered without any HTTP requests. The resources are enumerated through the API's list endpoints and
+    fetched in batches through the interface's connection pool, whose limits bound the number of requests in flight.
+    Progress is recorded in a checkpoint file after every batch, so that a run that was stopped resumes where it left
+    off. The progress of a target is discarded once every one of its resources has been fetched, so that the next run
+    starts over (and picks up resources added to the API since).
+    """
+
+    DEFAULT_CHECKPOINT = os.path.join(os.path.expanduser("~"), ".cache", "pokedex", "warm-checkpoint.json")
+    DEFAULT_BATCH_SIZE = 100
+    RESOURCE_TYPES = {
+        "pokemon": ("pokemon", "stat", "ability", "move"),
+        "ability": ("ability",),
+        "move": ("move",),
+        "all": ("pokemon", "stat", "ability", "move"),
+    }
+
+    def __init__(self, interface, checkpoint_path: str = DEFAULT_CHECKPOINT, batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        Initializer method.
+        :param interface: a PokedexInterface, with the response cache the resources are fetched into
+        :param checkpoint_path: a string, the path of the checkpoint file
+        :param batch_size: an int, the number of resources fetched between checkpoints
+        """
+        self.interface = interface
+        self.checkpoint_path = checkpoint_path
+        self.batch_size = batch_size
+        self.checkpoint = self.read_checkpoint()
+
+    def read_checkpoint(self) -> dict:
+        """
+        Reads the checkpoint file.
+        :return: a dictionary, mapping each resource type to its progress (empty if there is no checkpoint)
+        """
+        try:
+            with open(self.checkpoint_path, mode="r", encoding="utf-8") as data:
+                return json.load(data)
+        except (OSError, ValueError):
+            return {}
+
+    def write_checkpoint(self):
+        """
+        Writes the checkpoint file, replacing the previous one atomically.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self.checkpoint_path)), exist_ok=True)
+        temporary_path = f"{self.checkpoint_path}.tmp"
+        with open(temporary_path, mode="w", encoding="utf-8") as data:
+            json.dump(self.checkpoint, data)
+        os.replace(temporary_path, self.checkpoint_path)
+
+    def reset(self):
+        """
+        Discards the checkpoint, so that every resource is fetched again.
+        """
+        self.checkpoint = {}
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+    def warm(self, target: str, report_progress=None) -> list:
+        """
+        Warms the response cache with every resource of a target, on the interface's event loop.
+        :param target: a string, one of the keys of RESOURCE_TYPES
+        :param report_progress: a function, called after every batch with the resource type, the number of resources
+        done, their total, and the number fetched per second (optional)
+        :return: a list, of the APIRequestErrors of the resources that could not be fetched
+        """
+        return self.interface.event_loop.run_until_complete(self.warm_async(target, report_progress))
+
+    async def warm_async(self, target: str, report_progress=None) -> list:
+        """
+        Warms the response cache with every resource of a target. The names of the Pokémon, abilities and moves
+        enumerated along the way are also stored in the interface's name index, if it has one, so that queries by name
+        are canonicalized to the cached URLs.
+        :param target: a string, one of the keys of RESOURCE_TYPES
+        :param report_progress: a function, called after every batch with the resource type, the number of resources
+        done, their total, and the number fetched per second (optional)
+        :return: a list, of the APIRequestErrors of the resources that could not be fetched
+        :raises APIRequestError: if a list endpoint could not be fetched
+        """
+        errors = []
+        for resource_type in self.RESOURCE_TYPES[target]:
+            count = await self.interface.fetch_list_count_async(resource_type)
+            page = await self.interface.fetch_list_page_async(resource_type, count)
+            urls = [result["url"] for result in page["results"]]
+
+            if self.interface.name_index is not None and resource_type in name_index.NameIndex.RESOURCE_TYPES:
+                self.interface.name_index.replace(resource_type, name_index.NameIndex.parse_list_response(page), count)
+
+            progress = self.checkpoint.get(resource_type)
+            if progress is None or progress["count"] != count:
+                progress = {"count": count, "done": 0, "failed": []}
+                self.checkpoint[resource_type] = progress
+
+            start = progress["done"]
+            retried_urls = progress["failed"]
+            pending_urls = retried_urls + urls[start:]
+            failed_urls = []
+            started_at = time.perf_counter()
+
+            for offset in range(0, len(pending_urls), self.batch_size):
+                batch = pending_urls[offset:offset + self.batch_size]
+                responses = await self.interface.fetch_urls_async(resource_type, batch, True)
+
+                for url, response in zip(batch, responses):
+                    if isinstance(response, api_handler.APIRequestError):
+                        errors.append(response)
+                        failed_urls.append(url)
+
+                progress["failed"] = failed_urls + retried_urls[offset + len(batch):]
+                progress["done"] = start + max(0, offset + len(batch) - len(retried_urls))
+                self.interface.cache.commit()
+                self.write_checkpoint()
+
+                if report_progress is not None:
+                    report_progress(resource_type, progress["done"], count,
+                                    (offset + len(batch)) / max(time.perf_counter() - started_at, 1e-9))
+
+            if not pending_urls and report_progress is not None:
+                report_progress(resource_type, progress["done"], count, 0.0)
+
+        if not any(self.checkpoint[resource_type]["failed"] for resource_type in self.RESOURCE_TYPES[target]):
+            for resource_type in self.RESOURCE_TYPES[target]:
+                del self.checkpoint[resource_type]
+            if self.checkpoint:
+                self.write_checkpoint()
+            else:
+                self.reset()
+
+        return errors
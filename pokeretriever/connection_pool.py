@@ -0,0 +1,81 @@
+from pokeretriever import rate_limiter, request_coalescer
+
+import asyncio
+import typing
+
+if typing.TYPE_CHECKING:
+    import aiohttp
+
+
+class ConnectionPool:
+    """
+    Owns a single long-lived HTTP session and connector, so that connections (and their TLS handshakes) are reused
+    across requests. Limits the number of requests in flight, the number of connections made to each host, and the rate
+    at which requests are made, and decides how failed requests are retried. Concurrent requests for the same resource
+    share a single request through the pool's RequestCoalescer. A session owned by the caller (e.g. one
+    shared by an existing asyncio service) can be used instead, in which case it is left open when the pool is closed.
+    aiohttp is only imported once a session is needed, so that queries answered entirely from local data never load it.
+    """
+
+    DEFAULT_CONCURRENCY = 20
+    DEFAULT_LIMIT_PER_HOST = 10
+    DEFAULT_DNS_CACHE_TTL = 300
+    DEFAULT_KEEPALIVE_TIMEOUT = 30
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, limit_per_host: int = DEFAULT_LIMIT_PER_HOST,
+                 dns_cache_ttl: int = DEFAULT_DNS_CACHE_TTL, keepalive_timeout: int = DEFAULT_KEEPALIVE_TIMEOUT,
+                 token_bucket: rate_limiter.TokenBucket = None, retry_policy: rate_limiter.RetryPolicy = None,
+                 session: "aiohttp.ClientSession" = None):
+        """
+        Initializer method.
+        :param concurrency: an int, the maximum number of requests in flight at once
+        :param limit_per_host: an int, the maximum number of simultaneous connections to a single host
+        :param dns_cache_ttl: an int, the number of seconds resolved host names are cached for
+        :param keepalive_timeout: an int, the number of seconds an idle connection is kept open for reuse
+        :param token_bucket: a TokenBucket, limiting the rate requests are made at (optional)
+        :param retry_policy: a RetryPolicy, deciding how failed requests are retried (optional)
+        :param session: an aiohttp.ClientSession owned by the caller, used instead of creating one (optional)
+        """
+        self.concurrency = concurrency
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.token_bucket = token_bucket
+        self.retry_policy = retry_policy or rate_limiter.RetryPolicy()
+        self.session = session
+        self.owns_session = session is None
+        self.semaphore = None
+        self.coalescer = request_coalescer.RequestCoalescer()
+
+    async def get_session(self) -> "aiohttp.ClientSession":
+        """
+        Returns the pooled HTTP session, creating it (and its connector) on the running event loop if it has not been
+        created yet and the caller did not provide one.
+        :return: an aiohttp.ClientSession
+        """
+        if self.owns_session and (self.session is None or self.session.closed):
+            import aiohttp
+
+            connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.limit_per_host,
+                                             use_dns_cache=True, ttl_dns_cache=self.dns_cache_ttl,
+                                             keepalive_timeout=self.keepalive_timeout)
+            self.session = aiohttp.ClientSession(connector=connector)
+            self.semaphore = None
+
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.concurrency)
+
+        return self.session
+
+    async def close(self):
+        """
+        Closes the pooled HTTP session and all of its connections, unless the session is owned by the caller.
+        """
+        self.semaphore = None
+        if not self.owns_session:
+            return
+
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+
+        self.session = None
@@ -0,0 +1,209 @@
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+
+
+class Profiler:
+    """
+    Records where the time of a request goes: the wall and CPU time of each phase (URL generation, JSON decoding,
+    object construction, rendering and writing), the timing and size of every HTTP request, cache hits and misses, and
+    the number of requests in flight. Disabled by default, in which case every hook returns immediately.
+    """
+
+    def __init__(self):
+        """
+        Initializer method.
+        """
+        self.enabled = False
+        self.started_at = time.perf_counter()
+        self.trace_events = []
+        self.phase_totals = {}
+        self.request_durations = []
+        self.bytes_transferred = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.coalesced_requests = 0
+        self.revalidated_requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.request_count = 0
+
+    def reset(self):
+        """
+        Discards everything recorded so far.
+        """
+        enabled = self.enabled
+        self.__init__()
+        self.enabled = enabled
+
+    def get_timestamp(self) -> float:
+        """
+        Returns the number of microseconds since the profiler was created, as used by Chrome traces.
+        :return: a float
+        """
+        return (time.perf_counter() - self.started_at) * 1_000_000
+
+    @contextlib.contextmanager
+    def phase(self, name: str, **details):
+        """
+        A context manager that records the wall and CPU time spent in a phase.
+        :param name: a string, the name of the phase
+        :param details: additional information stored with the trace event
+        """
+        if not self.enabled:
+            yield
+            return
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        timestamp = self.get_timestamp()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+
+            calls, wall_total, cpu_total = self.phase_totals.get(name, (0, 0.0, 0.0))
+            self.phase_totals[name] = (calls + 1, wall_total + wall, cpu_total + cpu)
+            self.trace_events.append({"name": name, "cat": "phase", "ph": "X", "ts": timestamp,
+                                      "dur": wall * 1_000_000, "pid": os.getpid(), "tid": threading.get_ident(),
+                                      "args": dict(details, cpu_ms=cpu * 1000)})
+
+    def request_started(self, url: str) -> tuple:
+        """
+        Records the start of an HTTP request.
+        :param url: a string, the URL of the request
+        :return: a tuple, of the ID of the request (shared by its begin and end trace events) and its start time (None
+        if the profiler is disabled)
+        """
+        if not self.enabled:
+            return None
+
+        self.request_count += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        self.record_in_flight()
+        self.trace_events.append({"name": url, "cat": "request", "ph": "b", "id": self.request_count,
+                                  "ts": self.get_timestamp(), "pid": os.getpid(), "tid": threading.get_ident()})
+
+        return self.request_count, time.perf_counter()
+
+    def request_finished(self, url: str, request: tuple, size: int, status):
+        """
+        Records the end of an HTTP request.
+        :param url: a string, the URL of the request
+        :param request: a tuple, the value returned by request_started
+        :param size: an int, the number of bytes received
+        :param status: an int, the HTTP status of the response (or a string describing the failure)
+        """
+        if not self.enabled or request is None:
+            return
+
+        request_id, started_at = request
+        self.in_flight -= 1
+        self.bytes_transferred += size
+        self.request_durations.append(time.perf_counter() - started_at)
+        self.record_in_flight()
+        self.trace_events.append({"name": url, "cat": "request", "ph": "e", "id": request_id,
+                                  "ts": self.get_timestamp(), "pid": os.getpid(), "tid": threading.get_ident(),
+                                  "args": {"bytes": size, "status": status}})
+
+    def record_in_flight(self):
+        """
+        Records the number of requests in flight as a Chrome trace counter.
+        """
+        self.trace_events.append({"name": "requests in flight", "ph": "C", "ts": self.get_timestamp(),
+                                  "pid": os.getpid(), "args": {"in_flight": self.in_flight}})
+
+    def record_cache_lookup(self, hit: bool):
+        """
+        Records a response cache lookup.
+        :param hit: a boolean, if the response was found in the cache
+        """
+        if not self.enabled:
+            return
+
+        if hit:
+            self.cache_hits += 1
+        else:
+            self.cache_misses += 1
+
+    def record_coalesced_request(self):
+        """
+        Records a request that shared the HTTP request already in flight for the same resource.
+        """
+        if not self.enabled:
+            return
+
+        self.coalesced_requests += 1
+
+    def record_revalidation(self):
+        """
+        Records a conditional request whose cached response had not changed (304), and so was reused.
+        """
+        if not self.enabled:
+            return
+
+        self.revalidated_requests += 1
+
+    def summary(self) -> str:
+        """
+        Returns a human readable summary of everything recorded.
+        :return: a string
+        """
+        lines = ["==================== Profile ====================",
+                 f"{'Phase':<28}{'Calls':>8}{'Wall (ms)':>14}{'CPU (ms)':>14}"]
+        for name, (calls, wall, cpu) in sorted(self.phase_totals.items(), key=lambda item: -item[1][1]):
+            lines.append(f"{name:<28}{calls:>8}{wall * 1000:>14.2f}{cpu * 1000:>14.2f}")
+
+        durations = sorted(self.request_durations)
+        lines.append("")
+        lines.append(f"HTTP requests: {self.request_count} ({self.bytes_transferred / 1024:.1f} KiB received, "
+                     f"at most {self.max_in_flight} in flight, {self.coalesced_requests} coalesced, "
+                     f"{self.revalidated_requests} revalidated)")
+        if durations:
+            p95 = durations[min(len(durations) - 1, int(len(durations) * 0.95))]
+            lines.append(f"Request latency: mean {sum(durations) / len(durations) * 1000:.2f} ms, "
+                         f"p95 {p95 * 1000:.2f} ms, max {durations[-1] * 1000:.2f} ms")
+        lines.append(f"Cache: {self.cache_hits} hit(s), {self.cache_misses} miss(es)")
+
+        return "\n".join(lines)
+
+    def write_chrome_trace(self, file_name: str):
+        """
+        Writes everything recorded as a Chrome trace (viewable in chrome://tracing or Perfetto).
+        :param file_name: a string, the file name
+        """
+        with open(file_name, mode="w", encoding="utf-8") as data:
+            json.dump({"traceEvents": self.trace_events, "displayTimeUnit": "ms",
+                       "otherData": {"cache_hits": self.cache_hits, "cache_misses": self.cache_misses,
+                                     "bytes_transferred": self.bytes_transferred,
+                                     "coalesced_requests": self.coalesced_requests,
+                                     "revalidated_requests": self.revalidated_requests,
+                                     "max_in_flight": self.max_in_flight}}, data)
+
+
+PROFILER = Profiler()
+
+
+def profiled(name: str):
+    """
+    A decorator that records the wall and CPU time of every call to the decorated function as a phase.
+    :param name: a string, the name of the phase
+    :return: a decorator
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return function(*args, **kwargs)
+
+            with PROFILER.phase(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
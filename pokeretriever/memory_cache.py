@@ -0,0 +1,128 @@
+import collections
+import time
+
+from pokeretriever import response_cache
+
+
+class MemoryCache:
+    """
+    An in-memory LRU cache with the same interface as ResponseCache, for long-running processes. Entries expire after a
+    configurable time-to-live, and the least recently used entries are evicted once the cache grows past its size cap.
+    An optional backing cache (e.g. a ResponseCache) is read on misses and written through on every store, so that the
+    entries outlive the process.
+    """
+
+    DEFAULT_MAX_ENTRIES = 100000
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: int = response_cache.ResponseCache.DEFAULT_TTL,
+                 backing=None):
+        """
+        Initializer method.
+        :param max_entries: an int, the maximum number of entries kept before the least recently used are evicted
+        :param ttl: an int, the number of seconds an entry stays fresh for (0 or less never expires)
+        :param backing: a ResponseCache, read on misses and written through on stores (optional)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.backing = backing
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str):
+        """
+        Returns the cached value of the specified key, or None if it is not cached or has expired.
+        :param key: a string, the key (e.g. the URL of a response)
+        :return: the cached value, or None
+        """
+        key = response_cache.ResponseCache.normalize_url(key)
+        entry = self.entries.get(key)
+
+        if entry is not None and (self.ttl <= 0 or time.time() - entry[1] <= self.ttl):
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        value = self.backing.get(key) if self.backing is not None else None
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.store(key, value)
+        self.hits += 1
+        return value
+
+    def get_stale(self, key: str) -> tuple:
+        """
+        Returns the body and validators of a response from the backing cache, whether or not it has expired, so that
+        it can be revalidated. Validators are not held in memory.
+        :param key: a string, the URL of the response
+        :return: a tuple, of the body, ETag and Last-Modified header, or None if there is no backing cache or the
+        response is not in it
+        """
+        return self.backing.get_stale(key) if self.backing is not None else None
+
+    def set(self, key: str, value, etag: str = None, last_modified: str = None):
+        """
+        Stores a value (and writes it through to the backing cache, along with its validators), evicting the least
+        recently used entries if the size cap is exceeded.
+        :param key: a string, the key (e.g. the URL of a response)
+        :param value: the value to cache
+        :param etag: a string, the ETag header of the response (optional)
+        :param last_modified: a string, the Last-Modified header of the response (optional)
+        """
+        key = response_cache.ResponseCache.normalize_url(key)
+        self.store(key, value)
+
+        if self.backing is not None:
+            self.backing.set(key, value, etag, last_modified)
+
+    def revalidate(self, key: str):
+        """
+        Marks a response as fresh again in the backing cache, after the API reported that it has not changed. It is
+        read back into memory on its next lookup.
+        :param key: a string, the URL of the response
+        """
+        if self.backing is not None:
+            self.backing.revalidate(key)
+
+    def list_urls(self, resource_types: list = None) -> list:
+        """
+        Returns the URLs of every single resource in the backing cache.
+        :param resource_types: a list, of the resource types to include (optional, every type by default)
+        :return: a list, of strings (empty if there is no backing cache)
+        """
+        return self.backing.list_urls(resource_types) if self.backing is not None else []
+
+    def store(self, key: str, value):
+        """
+        Stores a value in memory only.
+        :param key: a string, the normalized key
+        :param value: the value to cache
+        """
+        self.entries[key] = (value, time.time())
+        self.entries.move_to_end(key)
+
+        while 0 < self.max_entries < len(self.entries):
+            self.entries.popitem(last=False)
+
+    def commit(self):
+        """
+        Commits the pending writes of the backing cache, if there is one.
+        """
+        if self.backing is not None:
+            self.backing.commit()
+
+    def __len__(self) -> int:
+        """
+        Returns the number of entries held in memory.
+        :return: an int
+        """
+        return len(self.entries)
+
+    def close(self):
+        """
+        Closes the backing cache, if there is one.
+        """
+        if self.backing is not None:
+            self.backing.close()
@@ -1,4 +1,4 @@
-from pokeretriever import pokedex_object
+from pokeretriever import pokedex_object, records
 
 
 class Move(pokedex_object.PokedexObject):
@@ -6,6 +6,10 @@ class Move(pokedex_object.PokedexObject):
     Stores and provides the information of the specified Pokemon move.
     """
 
+    __slots__ = ("generation", "accuracy", "pp", "power", "move_type", "damage_class", "effect_short")
+
+    CSV_FIELDS = ("id", "name", "generation", "accuracy", "pp", "power", "type", "damage_class", "effect_short")
+
     def __init__(self, name: str, move_id: str, generation: str, accuracy: str, pp: str, power: str, move_type: str,
                  damage_class: str, effect_short: str):
         """
@@ -21,12 +25,12 @@ class Move(pokedex_object.PokedexObject):
         :param effect_short: a string, a brief summary of the effect of the move
         """
         super().__init__(name, move_id)
-        self.generation = generation
+        self.generation = records.intern(generation)
         self.accuracy = accuracy
         self.pp = pp
         self.power = power
-        self.move_type = move_type
-        self.damage_class = damage_class
+        self.move_type = records.intern(move_type)
+        self.damage_class = records.intern(damage_class)
         self.effect_short = effect_short
 
     def __str__(self):
@@ -41,3 +45,18 @@ class Move(pokedex_object.PokedexObject):
                f"Move Type: {self.move_type.title()}\n" \
                f"Damage Class: {self.damage_class.title()}\n" \
                f"Effect: {self.effect_short}\n"
+
+    def to_dict(self) -> dict:
+        """
+        Returns the fields of the move as a dictionary that can be serialized as JSON.
+        :return: a dictionary
+        """
+        return dict(zip(self.CSV_FIELDS, self.to_row()))
+
+    def to_row(self) -> list:
+        """
+        Returns the fields of the move as a flat row, in the order of CSV_FIELDS.
+        :return: a list
+        """
+        return [self.id, self.name, self.generation, self.accuracy, self.pp, self.power, self.move_type,
+                self.damage_class, self.effect_short]
@@ -0,0 +1,81 @@
+import argparse
+
+
+class MovepoolFilter:
+    """
+    Prunes the moves of a Pokémon before any of them are created or their expanded information is fetched: only the
+    moves learned in a version group, only those learned by a learn method (e.g. "level-up" or "machine"), and at most
+    a number of them. The level a move is learned at is taken from the first of its learn details that matches, so
+    that it describes the selected version group and learn method. Without any criteria every move is kept, with its
+    first learn details.
+    """
+
+    def __init__(self, limit: int = None, learn_method: str = None, version_group: str = None):
+        """
+        Initializer method.
+        :param limit: an int, the maximum number of moves kept (optional)
+        :param learn_method: a string, the learn method a move must be learned by (optional)
+        :param version_group: a string, the version group a move must be learned in (e.g. "red-blue") (optional)
+        """
+        self.limit = limit
+        self.learn_method = learn_method
+        self.version_group = version_group
+
+    @staticmethod
+    def parse_limit(limit: str) -> int:
+        """
+        Parses a moves limit argument, which must be a non-negative integer (as the server requires).
+        :param limit: a string, the argument
+        :return: an int
+        :raises ArgumentTypeError: if the argument is not a non-negative integer
+        """
+        if not limit.strip().isdigit():
+            raise argparse.ArgumentTypeError(f"expected a non-negative integer, got {limit}")
+
+        return int(limit)
+
+    def select_details(self, version_group_details: list) -> dict:
+        """
+        Returns the first learn details of a move that match the learn method and version group.
+        :param version_group_details: a list, of the learn details of the move
+        :return: a dictionary, or None if none of them match
+        """
+        for details in version_group_details:
+            if self.learn_method is not None and details["move_learn_method"]["name"] != self.learn_method:
+                continue
+            if self.version_group is not None and details["version_group"]["name"] != self.version_group:
+                continue
+
+            return details
+
+        return None
+
+    def has_details_criteria(self) -> bool:
+        """
+        Returns whether moves are selected by their learn details (a learn method or version group).
+        :return: a boolean
+        """
+        return self.learn_method is not None or self.version_group is not None
+
+    def select(self, pokemon_move_data: list) -> list:
+        """
+        Returns the moves of a Pokémon that are kept, in order.
+        :param pokemon_move_data: a list, containing the unprocessed information about the moves of a Pokémon
+        :return: a list, of tuples of the unprocessed information of each move and its selected learn details (None
+        if the move has no learn details)
+        """
+        selected = []
+        for move in pokemon_move_data:
+            if self.limit is not None and len(selected) >= self.limit:
+                break
+
+            if self.has_details_criteria():
+                details = self.select_details(move["version_group_details"])
+                if details is None:
+                    continue
+            else:
+                details = move["version_group_details"][0] if move.get("version_group_details") else None
+
+            selected.append((move, details))
+
+        return selected
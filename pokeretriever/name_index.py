@@ -0,0 +1,157 @@
+import difflib
+import os
+import sqlite3
+
+
+class NameIndex:
+    """
+    A persistent index of the names and IDs of every Pokémon, ability and move, built from the API's paginated list
+    endpoints. Used to validate and canonicalize input before any request is made, and to suggest the closest names
+    (found through a trigram index, and ranked by similarity) for input that does not match any of them.
+    """
+
+    DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "pokedex", "names.sqlite3")
+    RESOURCE_TYPES = ("pokemon", "ability", "move")
+    SUGGESTION_CUTOFF = 0.6
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        """
+        Initializer method.
+        :param path: a string, the path of the index database
+        """
+        self.path = path
+        self.names = {}
+        self.ids = {}
+        self.trigrams = {}
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript("CREATE TABLE IF NOT EXISTS names ("
+                                      "resource_type TEXT NOT NULL, name TEXT NOT NULL, id INTEGER NOT NULL, "
+                                      "PRIMARY KEY (resource_type, name)) WITHOUT ROWID;"
+                                      "CREATE TABLE IF NOT EXISTS list_counts ("
+                                      "resource_type TEXT PRIMARY KEY, count INTEGER NOT NULL);")
+        self.connection.commit()
+
+    @staticmethod
+    def parse_list_response(data: dict) -> list:
+        """
+        Returns the names and IDs of a page of a list endpoint (e.g. /pokemon/?limit=100).
+        :param data: a dictionary, the JSON data of the page
+        :return: a list, of tuples of each name and ID
+        """
+        return [(result["name"], int(result["url"].rstrip("/").rpartition("/")[2])) for result in data["results"]]
+
+    @staticmethod
+    def get_trigrams(name: str) -> set:
+        """
+        Returns the trigrams of a name, padded so that its first and last letters form trigrams of their own.
+        :param name: a string
+        :return: a set, of strings
+        """
+        padded = f"  {name} "
+        return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+    def get_count(self, resource_type: str) -> int:
+        """
+        Returns the number of items of a resource type reported by its list endpoint when it was last indexed.
+        :param resource_type: a string, one of RESOURCE_TYPES
+        :return: an int, or None if the resource type has not been indexed
+        """
+        row = self.connection.execute("SELECT count FROM list_counts WHERE resource_type = ?",
+                                      (resource_type,)).fetchone()
+
+        return row[0] if row else None
+
+    def has(self, resource_type: str) -> bool:
+        """
+        Returns whether any names of a resource type have been indexed.
+        :param resource_type: a string, one of RESOURCE_TYPES
+        :return: a boolean
+        """
+        return bool(self.get_count(resource_type))
+
+    def replace(self, resource_type: str, entries: list, count: int):
+        """
+        Replaces every indexed name of a resource type.
+        :param resource_type: a string, one of RESOURCE_TYPES
+        :param entries: a list, of tuples of each name and ID
+        :param count: an int, the number of items reported by the list endpoint
+        """
+        with self.connection:
+            self.connection.execute("DELETE FROM names WHERE resource_type = ?", (resource_type,))
+            self.connection.executemany("INSERT OR REPLACE INTO names (resource_type, name, id) VALUES (?, ?, ?)",
+                                        [(resource_type, name, pkm_id) for name, pkm_id in entries])
+            self.connection.execute("INSERT OR REPLACE INTO list_counts (resource_type, count) VALUES (?, ?)",
+                                    (resource_type, count))
+
+        self.names.pop(resource_type, None)
+        self.ids.pop(resource_type, None)
+        self.trigrams.pop(resource_type, None)
+
+    def load(self, resource_type: str):
+        """
+        Loads the names of a resource type into memory, if they have not been loaded yet.
+        :param resource_type: a string, one of RESOURCE_TYPES
+        """
+        if resource_type in self.names:
+            return
+
+        rows = self.connection.execute("SELECT name, id FROM names WHERE resource_type = ?", (resource_type,))
+        self.names[resource_type] = dict(rows.fetchall())
+        self.ids[resource_type] = {item_id: name for name, item_id in self.names[resource_type].items()}
+
+    def resolve(self, resource_type: str, item: str) -> str:
+        """
+        Returns the canonical form of an item, given its (cleaned) name or ID: its ID, since that is the form of the
+        URLs that Pokémon reference their abilities and moves by, so that both share a single cache entry.
+        :param resource_type: a string, one of RESOURCE_TYPES
+        :param item: a string, the name or ID of the item
+        :return: a string, or None if no item of the resource type has that name or ID
+        """
+        self.load(resource_type)
+        if item.isdigit():
+            item_id = int(item) if int(item) in self.ids[resource_type] else None
+        else:
+            item_id = self.names[resource_type].get(item)
+
+        return str(item_id) if item_id is not None else None
+
+    def suggest(self, resource_type: str, item: str, count: int = 3) -> list:
+        """
+        Returns the indexed names most similar to an unknown name. Candidates sharing a trigram with the name are
+        ranked by their similarity to it.
+        :param resource_type: a string, one of RESOURCE_TYPES
+        :param item: a string, the unknown name
+        :param count: an int, the maximum number of suggestions
+        :return: a list, of strings
+        """
+        self.load(resource_type)
+        if resource_type not in self.trigrams:
+            trigrams = {}
+            for name in self.names[resource_type]:
+                for trigram in self.get_trigrams(name):
+                    trigrams.setdefault(trigram, []).append(name)
+            self.trigrams[resource_type] = trigrams
+
+        candidates = set()
+        for trigram in self.get_trigrams(item):
+            candidates.update(self.trigrams[resource_type].get(trigram, ()))
+
+        matcher = difflib.SequenceMatcher(b=item)
+        scores = []
+        for name in candidates:
+            matcher.set_seq1(name)
+            if matcher.real_quick_ratio() >= self.SUGGESTION_CUTOFF and matcher.quick_ratio() >= self.SUGGESTION_CUTOFF:
+                score = matcher.ratio()
+                if score >= self.SUGGESTION_CUTOFF:
+                    scores.append((-score, name))
+
+        return [name for _, name in sorted(scores)[:count]]
+
+    def close(self):
+        """
+        Closes the connection to the index database.
+        """
+        self.connection.close()
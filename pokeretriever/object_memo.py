@@ -0,0 +1,85 @@
+import asyncio
+
+from pokeretriever import api_handler, memory_cache, movepool_filter
+
+
+class ObjectMemo(memory_cache.MemoryCache):
+    """
+    An in-memory LRU of the Pokédex objects created by a long-running process (the server or the shell), so that
+    repeated lookups are answered without decoding or fetching anything. Objects are keyed by their query type, their
+    item and, for Pokémon, whether they are expanded and the movepool filter they were pruned with. Items are keyed by
+    their ID where it is known (from the name index, or from the object once it has been fetched), so that an item
+    looked up by name, by ID or by a zero-padded ID shares a single object.
+    """
+
+    @staticmethod
+    def get_canonical_item(interface, query_type: str, item: str) -> str:
+        """
+        Returns the form of an item that its object is memoized under: its ID if the item is an ID or the name index
+        has its name, and otherwise its cleaned name.
+        :param interface: a PokedexInterface, whose name index the item is resolved with
+        :param query_type: a string, of the type of data queried
+        :param item: a string, the name or ID of the item
+        :return: a string
+        """
+        item = interface.clean_input(item)
+        if item.isdigit():
+            return str(int(item))
+
+        name_index = interface.name_index
+        if name_index is not None and name_index.has(query_type):
+            return name_index.resolve(query_type, item) or item
+
+        return item
+
+    @staticmethod
+    def get_object_key(query_type: str, item: str, expanded: bool, moves: movepool_filter.MovepoolFilter) -> str:
+        """
+        Returns the key a Pokédex object is memoized under, which includes the movepool filter it was created with.
+        :param query_type: a string, of the type of data queried
+        :param item: a string, the canonical name or ID of the item (see get_canonical_item)
+        :param expanded: a boolean, if the object includes additional information
+        :param moves: a MovepoolFilter, that the moves of the object were pruned with
+        :return: a string
+        """
+        if query_type != "pokemon":
+            return f"{query_type}/basic/{item}"
+
+        return f"pokemon/{'expanded' if expanded else 'basic'}/{moves.limit}/{moves.learn_method}/" \
+               f"{moves.version_group}/{item}"
+
+    async def get_pokedex_objects(self, interface, query_type: str, items: list, expanded: bool, errors: list,
+                                  moves: movepool_filter.MovepoolFilter) -> list:
+        """
+        Returns the Pokédex objects of the items, in order, from memory where possible and otherwise by fetching them
+        concurrently through the interface. Blank items, and items that could not be fetched, are left out and an
+        error is added to errors in their place.
+        :param interface: a PokedexInterface, used to fetch the objects that are not in memory
+        :param query_type: a string, of the type of data queried
+        :param items: a list, of the names or IDs of the items, or selectors of them (e.g. "1-151")
+        :param expanded: a boolean, indicating whether or not to include additional information
+        :param errors: a list, that the errors of items that could not be fetched are added to
+        :param moves: a MovepoolFilter, that the moves of every Pokémon are pruned with
+        :return: a list, of PokédexObject(s)
+        """
+        interface = interface.with_movepool_filter(moves)
+        blank_items = [item for item in items if not interface.clean_input(item).strip("-")]
+        if blank_items:
+            errors.append(api_handler.APIRequestError(f"{len(blank_items)} blank {query_type} name(s) or ID(s)"))
+            items = [item for item in items if interface.clean_input(item).strip("-")]
+
+        items = [item async for item in interface.plan_input_async(query_type, items, errors)]
+        keys = [self.get_object_key(query_type, self.get_canonical_item(interface, query_type, item), expanded, moves)
+                for item in items]
+        found = {key: self.get(key) for key in keys}
+        missing = {key: item for key, item in zip(keys, items) if found[key] is None}
+
+        fetched = await asyncio.gather(*[interface.fetch_pokedex_object(query_type, item, expanded, errors)
+                                         for item in missing.values()])
+        for key, pokedex_object in zip(missing, fetched):
+            if pokedex_object is not None:
+                self.set(key, pokedex_object)
+                self.set(self.get_object_key(query_type, str(pokedex_object.id), expanded, moves), pokedex_object)
+                found[key] = pokedex_object
+
+        return [found[key] for key in keys if found[key] is not None]
@@ -1,9 +1,14 @@
+from pokeretriever import records
+
 
 class PokedexObject:
     """
-    Base class that is the superclass of the Pokemon, Ability, and Move subclasses.
+    Base class that is the superclass of the Pokemon, Ability, and Move subclasses. Uses __slots__ (as do the
+    subclasses) so that instances do not carry a per-instance __dict__.
     """
 
+    __slots__ = ("name", "id")
+
     def __init__(self, name, id):
-        self.name = name
+        self.name = records.intern(name)
         self.id = id
@@ -1,4 +1,4 @@
-from pokeretriever import pokedex_object
+from pokeretriever import pokedex_object, records
 
 
 class Pokemon(pokedex_object.PokedexObject):
@@ -6,6 +6,10 @@ class Pokemon(pokedex_object.PokedexObject):
     Represent a Pokémon. Stores the information of the Pokémon it's representing.
     """
 
+    __slots__ = ("height", "weight", "stats", "types", "abilities", "moves")
+
+    CSV_FIELDS = ("id", "name", "height", "weight", "types", "stats", "abilities", "moves")
+
     def __init__(self, name: str, pkm_id: str, height: str, weight: str, stats: list, types: list, abilities: list,
                  moves: list):
         """
@@ -14,18 +18,18 @@ class Pokemon(pokedex_object.PokedexObject):
         :param pkm_id: an int, the ID of the Pokémon
         :param height: an int, the height of the Pokémon
         :param weight: an int, the weight of the Pokemon
-        :param stats: a list, containing the name of the stat and it's base value
+        :param stats: a list, of StatRecords containing the name of the stat and it's base value
         :param types: a list of strings, of the Pokémon types
-        :param abilities: a list, containing the abilities of the Pokémon and their URLs
-        :param moves: a list, containing details of the Pokémon moves
+        :param abilities: a list, of AbilityRecords containing the abilities of the Pokémon and their URLs
+        :param moves: a list, of MoveRecords containing details of the Pokémon moves
         """
         super().__init__(name, pkm_id)
         self.height = height
         self.weight = weight
-        self.stats = stats
-        self.types = types
-        self.abilities = abilities
-        self.moves = moves
+        self.stats = tuple(stats)
+        self.types = tuple(records.intern(pkm_type) for pkm_type in types)
+        self.abilities = tuple(abilities)
+        self.moves = tuple(moves)
 
     def __str__(self):
         """
@@ -45,47 +49,63 @@ class Pokemon(pokedex_object.PokedexObject):
         Gets the stats of the Pokémon to be printed.
         :return: a string
         """
-        stats = ""
-        for stat in self.stats:
-            stats += f"{stat['name'].title()} - Base Value: {stat['base_stat']}\n"
-
-        return stats
+        return "".join([f"{stat.name.title()} - Base Value: {stat.base_stat}\n" for stat in self.stats])
 
     def get_types(self) -> str:
         """
         Gets the types of the Pokémon to be printed.
         :return: a string
         """
-        types = "\n"
-        for pkm_type in self.types:
-            types += f"{pkm_type.title()} "
-
-        return types
+        return "\n" + "".join([f"{pkm_type.title()} " for pkm_type in self.types])
 
     def get_abilities(self) -> str:
         """
         Gets the abilities of the Pokémon to be printed.
         :return: a string
         """
-        abilities = "\n"
-        for ability in self.abilities:
-            try:
-                abilities += f"{ability['expanded']}\n"
-            except KeyError:
-                abilities += f"{ability['name'].title()} -> Additional Info: {ability['url']}\n"
-
-        return abilities
+        return "\n" + "".join([f"{ability.expanded}\n" if ability.expanded is not None
+                               else f"{ability.name.title()} -> Additional Info: {ability.url}\n"
+                               for ability in self.abilities])
 
     def get_moves(self) -> str:
         """
         Gets the moves of the Pokémon to be printed.
         :return: a string
         """
-        moves = "\n"
-        for move in self.moves:
-            try:
-                moves += f"{move['expanded']}\n"
-            except KeyError:
-                moves += f"{move['name'].title()} -> Additional Info: {move['url']}\n"
+        return "\n" + "".join([f"{move.expanded}\n" if move.expanded is not None
+                               else f"{move.name.title()} -> Additional Info: {move.url}\n"
+                               for move in self.moves])
 
-        return moves
+    def to_dict(self) -> dict:
+        """
+        Returns the fields of the Pokémon (and of any expanded stats, abilities and moves) as a dictionary that can be
+        serialized as JSON.
+        :return: a dictionary
+        """
+        return {
+            "id": self.id,
+            "name": self.name,
+            "height": self.height,
+            "weight": self.weight,
+            "stats": [{"name": stat.name, "base_stat": stat.base_stat, "url": stat.url,
+                       "expanded": stat.expanded._asdict() if stat.expanded is not None else None}
+                      for stat in self.stats],
+            "types": list(self.types),
+            "abilities": [{"name": ability.name, "url": ability.url,
+                           "expanded": ability.expanded.to_dict() if ability.expanded is not None else None}
+                          for ability in self.abilities],
+            "moves": [{"name": move.name, "level_learned_at": move.level_learned_at, "url": move.url,
+                       "expanded": move.expanded.to_dict() if move.expanded is not None else None}
+                      for move in self.moves],
+        }
+
+    def to_row(self) -> list:
+        """
+        Returns the fields of the Pokémon as a flat row, in the order of CSV_FIELDS. Stats are written as
+        "name=value" pairs, and lists are separated by semicolons.
+        :return: a list
+        """
+        return [self.id, self.name, self.height, self.weight, ";".join(self.types),
+                ";".join([f"{stat.name}={stat.base_stat}" for stat in self.stats]),
+                ";".join([ability.name for ability in self.abilities]),
+                ";".join([move.name for move in self.moves])]
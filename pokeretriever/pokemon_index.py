@@ -0,0 +1,116 @@
+import os
+import sqlite3
+
+
+class PokemonIndex:
+    """
+    A persistent set of inverted indexes over Pokémon, for reverse queries: which Pokémon learn a move, have an
+    ability or a type, or have a base stat within a range. Built from Pokémon objects that have already been fetched
+    (or are cached), and stored in SQLite so that queries are answered from indexes without any network access.
+    """
+
+    DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "pokedex", "index.sqlite3")
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        """
+        Initializer method.
+        :param path: a string, the path of the index database
+        """
+        self.path = path
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript("CREATE TABLE IF NOT EXISTS pokemon ("
+                                      "id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);"
+                                      "CREATE TABLE IF NOT EXISTS pokemon_moves ("
+                                      "move TEXT NOT NULL, pokemon_id INTEGER NOT NULL, "
+                                      "PRIMARY KEY (move, pokemon_id)) WITHOUT ROWID;"
+                                      "CREATE TABLE IF NOT EXISTS pokemon_abilities ("
+                                      "ability TEXT NOT NULL, pokemon_id INTEGER NOT NULL, "
+                                      "PRIMARY KEY (ability, pokemon_id)) WITHOUT ROWID;"
+                                      "CREATE TABLE IF NOT EXISTS pokemon_types ("
+                                      "type TEXT NOT NULL, pokemon_id INTEGER NOT NULL, "
+                                      "PRIMARY KEY (type, pokemon_id)) WITHOUT ROWID;"
+                                      "CREATE TABLE IF NOT EXISTS pokemon_stats ("
+                                      "stat TEXT NOT NULL, value INTEGER NOT NULL, pokemon_id INTEGER NOT NULL, "
+                                      "PRIMARY KEY (stat, value, pokemon_id)) WITHOUT ROWID;")
+        self.connection.commit()
+
+    def add_pokemon(self, pokemon):
+        """
+        Adds a Pokémon to every index, replacing any earlier entries of the same Pokémon. Changes are not visible to
+        other connections until commit is called.
+        :param pokemon: a Pokemon object
+        """
+        pokemon_id = int(pokemon.id)
+        for table in ("pokemon_moves", "pokemon_abilities", "pokemon_types", "pokemon_stats"):
+            self.connection.execute(f"DELETE FROM {table} WHERE pokemon_id = ?", (pokemon_id,))
+
+        self.connection.execute("DELETE FROM pokemon WHERE name = ? AND id != ?", (pokemon.name, pokemon_id))
+        self.connection.execute("INSERT OR REPLACE INTO pokemon (id, name) VALUES (?, ?)", (pokemon_id, pokemon.name))
+        self.connection.executemany("INSERT OR IGNORE INTO pokemon_moves (move, pokemon_id) VALUES (?, ?)",
+                                    [(move.name, pokemon_id) for move in pokemon.moves])
+        self.connection.executemany("INSERT OR IGNORE INTO pokemon_abilities (ability, pokemon_id) VALUES (?, ?)",
+                                    [(ability.name, pokemon_id) for ability in pokemon.abilities])
+        self.connection.executemany("INSERT OR IGNORE INTO pokemon_types (type, pokemon_id) VALUES (?, ?)",
+                                    [(pkm_type, pokemon_id) for pkm_type in pokemon.types])
+        self.connection.executemany("INSERT OR IGNORE INTO pokemon_stats (stat, value, pokemon_id) VALUES (?, ?, ?)",
+                                    [(stat.name, int(stat.base_stat), pokemon_id) for stat in pokemon.stats])
+
+    def commit(self):
+        """
+        Commits every Pokémon added since the last commit.
+        """
+        self.connection.commit()
+
+    def count(self) -> int:
+        """
+        Returns the number of indexed Pokémon.
+        :return: an int
+        """
+        return self.connection.execute("SELECT COUNT(*) FROM pokemon").fetchone()[0]
+
+    def learners(self, move: str) -> list:
+        """
+        Returns the names of the indexed Pokémon that can learn a move, in order of their IDs.
+        :param move: a string, the name of the move (e.g. "ice-beam")
+        :return: a list, of strings
+        """
+        return self.search(moves=[move])
+
+    def search(self, types: list = (), abilities: list = (), moves: list = (), min_stats: dict = None,
+               max_stats: dict = None) -> list:
+        """
+        Returns the names of the indexed Pokémon that match every one of the given criteria, in order of their IDs.
+        :param types: a list, of type names the Pokémon must all have (e.g. ["water", "ground"])
+        :param abilities: a list, of ability names the Pokémon must all have
+        :param moves: a list, of move names the Pokémon must all be able to learn
+        :param min_stats: a dictionary, mapping stat names to the minimum base value of that stat (e.g. {"speed": 100})
+        :param max_stats: a dictionary, mapping stat names to the maximum base value of that stat
+        :return: a list, of strings
+        """
+        conditions = []
+        parameters = []
+        for table, column, values in (("pokemon_types", "type", types), ("pokemon_abilities", "ability", abilities),
+                                      ("pokemon_moves", "move", moves)):
+            for value in values:
+                conditions.append(f"id IN (SELECT pokemon_id FROM {table} WHERE {column} = ?)")
+                parameters.append(value)
+
+        for operator, stats in ((">=", min_stats), ("<=", max_stats)):
+            for stat, value in (stats or {}).items():
+                conditions.append(f"id IN (SELECT pokemon_id FROM pokemon_stats WHERE stat = ? AND value {operator} ?)")
+                parameters += [stat, value]
+
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self.connection.execute(f"SELECT name FROM pokemon{where} ORDER BY id", parameters).fetchall()
+
+        return [row[0] for row in rows]
+
+    def close(self):
+        """
+        Commits any pending changes, and closes the connection to the index database.
+        """
+        self.connection.commit()
+        self.connection.close()
@@ -0,0 +1,99 @@
+import asyncio
+import email.utils
+import random
+import time
+
+
+class TokenBucket:
+    """
+    A token bucket rate limiter, which allows short bursts of requests while keeping the sustained request rate under a
+    configured limit.
+    """
+
+    def __init__(self, rate: float, capacity: int = None):
+        """
+        Initializer method.
+        :param rate: a float, the number of requests allowed per second (0 or less disables the limit)
+        :param capacity: an int, the maximum number of requests that can be made in a burst (defaults to the rate)
+        """
+        self.rate = rate
+        self.capacity = capacity or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+
+    async def acquire(self):
+        """
+        Waits until a token is available, and takes it.
+        """
+        if self.rate <= 0:
+            return
+
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class RetryPolicy:
+    """
+    Decides how many times a failed request is retried, and how long to wait before each retry, using exponential
+    backoff with full jitter. A Retry-After header sent by the server is always honoured.
+    """
+
+    DEFAULT_MAX_RETRIES = 3
+    DEFAULT_BACKOFF_BASE = 0.5
+    DEFAULT_BACKOFF_MAX = 30.0
+    RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self, max_retries: int = DEFAULT_MAX_RETRIES, backoff_base: float = DEFAULT_BACKOFF_BASE,
+                 backoff_max: float = DEFAULT_BACKOFF_MAX):
+        """
+        Initializer method.
+        :param max_retries: an int, the number of times a failed request is retried
+        :param backoff_base: a float, the maximum number of seconds waited before the first retry
+        :param backoff_max: a float, the maximum number of seconds waited before any retry
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def get_delay(self, attempt: int, retry_after: str = None) -> float:
+        """
+        Returns the number of seconds to wait before retrying a request.
+        :param attempt: an int, the number of attempts that have already failed, minus one
+        :param retry_after: a string, the value of the Retry-After header of the failed response (optional)
+        :return: a float
+        """
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+        retry_after_seconds = self.parse_retry_after(retry_after)
+        if retry_after_seconds is not None:
+            delay = max(delay, retry_after_seconds)
+
+        return delay
+
+    @staticmethod
+    def parse_retry_after(retry_after: str) -> float:
+        """
+        Parses a Retry-After header, which is either a number of seconds or an HTTP date.
+        :param retry_after: a string, the value of the header
+        :return: a float, the number of seconds to wait, or None if the header is missing or invalid
+        """
+        if not retry_after:
+            return None
+
+        if retry_after.strip().isdigit():
+            return float(retry_after)
+
+        try:
+            retry_date = email.utils.parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+
+        return max(0.0, retry_date.timestamp() - time.time())
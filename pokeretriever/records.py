@@ -0,0 +1,50 @@
+import sys
+import typing
+
+
+class StatDetail(typing.NamedTuple):
+    """
+    The expanded information of a Pokémon stat.
+    """
+    name: str
+    id: int
+    is_battle_only: bool
+
+
+class StatRecord(typing.NamedTuple):
+    """
+    A Pokémon's base value of a stat, and optionally the expanded information of the stat.
+    """
+    name: str
+    base_stat: int
+    url: str
+    expanded: StatDetail = None
+
+
+class AbilityRecord(typing.NamedTuple):
+    """
+    An ability of a Pokémon, and optionally the expanded Ability.
+    """
+    name: str
+    url: str
+    expanded: object = None
+
+
+class MoveRecord(typing.NamedTuple):
+    """
+    A move that a Pokémon can learn, and optionally the expanded Move.
+    """
+    name: str
+    level_learned_at: int
+    url: str
+    expanded: object = None
+
+
+def intern(text):
+    """
+    Interns a string, so that names and URLs shared by many Pokémon are only stored once. Values that are not strings
+    (e.g. None) are returned unchanged.
+    :param text: a string
+    :return: a string
+    """
+    return sys.intern(text) if type(text) is str else text
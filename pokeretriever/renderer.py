@@ -0,0 +1,132 @@
+import csv
+import io
+import json
+
+from pokeretriever import instrumentation
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class Renderer:
+    """
+    Writes Pokédex objects to a stream one at a time, in one of the supported output formats:
+
+    text: the human readable report of each object
+    json: a single JSON array of every object
+    jsonl: one JSON object per line
+    csv: a header row, followed by one flat row per object
+
+    Each object is written as soon as it is rendered, so that no output larger than a single object is ever built in
+    memory, and the stream's own buffering decides when the output is actually written.
+    """
+
+    FORMATS = ("text", "json", "jsonl", "csv")
+
+    def __init__(self, stream, output_format: str = "text", text_separator: str = "", flush: bool = False):
+        """
+        Initializer method.
+        :param stream: a text stream, that the output is written to (None if the renderer is only used to render)
+        :param output_format: a string, one of FORMATS
+        :param text_separator: a string, written after each object in the text format
+        :param flush: a boolean, if the stream should be flushed after each object (e.g. when streaming)
+        """
+        if output_format not in self.FORMATS:
+            raise ValueError(f"Unsupported output format: {output_format}")
+
+        self.stream = stream
+        self.output_format = output_format
+        self.text_separator = text_separator
+        self.flush = flush
+        self.count = 0
+        self.csv_buffer = io.StringIO()
+        self.csv_writer = csv.writer(self.csv_buffer, lineterminator="\n")
+
+    @staticmethod
+    def dump_json(value: dict) -> str:
+        """
+        Serializes a value as compact JSON, using orjson if it is installed.
+        :param value: a dictionary
+        :return: a string
+        """
+        if orjson is not None:
+            return orjson.dumps(value).decode("utf-8")
+
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+    def format_csv_row(self, values) -> str:
+        """
+        Formats a single CSV row.
+        :param values: a list, of the values of the row
+        :return: a string
+        """
+        self.csv_buffer.seek(0)
+        self.csv_buffer.truncate()
+        self.csv_writer.writerow(values)
+
+        return self.csv_buffer.getvalue()
+
+    def render(self, entry) -> str:
+        """
+        Renders a single Pokédex object on its own, without the separators that depend on its position in the output
+        (e.g. the commas of a JSON array, or the CSV header). Used directly by worker processes.
+        :param entry: a PokedexObject
+        :return: a string
+        """
+        if self.output_format == "text":
+            return f"{entry}{self.text_separator}"
+        if self.output_format == "jsonl":
+            return f"{self.dump_json(entry.to_dict())}\n"
+        if self.output_format == "json":
+            return self.dump_json(entry.to_dict())
+
+        return self.format_csv_row(entry.to_row())
+
+    def write_rendered(self, text: str, csv_fields: tuple):
+        """
+        Writes an already rendered Pokédex object to the stream.
+        :param text: a string, the value returned by render
+        :param csv_fields: a tuple, of the CSV header of the object's type
+        """
+        if self.output_format == "json":
+            text = f"{',' if self.count else '['}\n{text}"
+        elif self.output_format == "csv" and self.count == 0:
+            text = f"{self.format_csv_row(csv_fields)}{text}"
+
+        with instrumentation.PROFILER.phase("write"):
+            self.stream.write(text)
+            if self.flush:
+                self.stream.flush()
+        self.count += 1
+
+    def write(self, entry):
+        """
+        Renders a single Pokédex object, and writes it to the stream.
+        :param entry: a PokedexObject
+        """
+        with instrumentation.PROFILER.phase("render"):
+            text = self.render(entry)
+
+        self.write_rendered(text, type(entry).CSV_FIELDS)
+
+    def close(self):
+        """
+        Finishes the output (closing the JSON array), without closing the stream itself.
+        """
+        with instrumentation.PROFILER.phase("write"):
+            if self.output_format == "json":
+                self.stream.write("\n]\n" if self.count else "[]\n")
+
+            self.stream.flush()
+
+    def write_all(self, pokedex_data):
+        """
+        Renders and writes every Pokédex object, then finishes the output.
+        :param pokedex_data: a list, or generator, of PokedexObjects
+        """
+        for entry in pokedex_data:
+            self.write(entry)
+
+        self.close()
@@ -0,0 +1,122 @@
+import asyncio
+import collections
+
+from pokeretriever import instrumentation, response_cache
+
+
+class RequestCoalescer:
+    """
+    Coalesces concurrent requests for the same resource into a single in-flight request (in the manner of a
+    "singleflight"), whose result is shared by every requester. Requests are keyed by the canonical form of their URL.
+    Requests by name are rewritten to the numeric ID the caller's name index has for them, if it has one, so that
+    "pokemon/pikachu" and "pokemon/25" share a single request even within one batch. Otherwise, once the response of a
+    resource has been decoded, its name and numeric ID are recorded as aliases of one another, so that later requests
+    share the same key; the aliases are kept in an LRU of bounded size.
+    """
+
+    DEFAULT_MAX_ALIASES = 100000
+
+    def __init__(self, max_aliases: int = DEFAULT_MAX_ALIASES):
+        """
+        Initializer method.
+        :param max_aliases: an int, the maximum number of aliases kept before the least recently used are evicted
+        """
+        self.max_aliases = max_aliases
+        self.in_flight = {}
+        self.aliases = collections.OrderedDict()
+
+    @staticmethod
+    def get_key(api_url: str) -> str:
+        """
+        Returns the canonical form of a URL: normalized as in the response cache, with leading zeros removed from a
+        numeric ID (e.g. "pokemon/025" and "pokemon/25/" share the key ".../pokemon/25").
+        :param api_url: a string, the URL of the request
+        :return: a string
+        """
+        key = response_cache.ResponseCache.normalize_url(api_url)
+        base, _, item = key.rpartition("/")
+        if item.isdigit():
+            return f"{base}/{int(item)}"
+
+        return key
+
+    def canonicalize(self, api_url: str, name_index) -> str:
+        """
+        Returns the URL of a resource by its numeric ID, if it is requested by a name that the name index has.
+        :param api_url: a string, the URL of the request
+        :param name_index: a NameIndex, or None
+        :return: a string, the URL by ID, or the URL itself
+        """
+        base, _, item = self.get_key(api_url).rpartition("/")
+        resource_type = base.rpartition("/")[2]
+        if name_index is None or item.isdigit() or not name_index.has(resource_type):
+            return api_url
+
+        item_id = name_index.resolve(resource_type, item)
+        return f"{base}/{item_id}/" if item_id is not None else api_url
+
+    def resolve(self, api_url: str, name_index=None) -> str:
+        """
+        Returns the URL that a request is made to: the URL already used for the same resource, if one of its aliases
+        has been requested before, or otherwise the URL canonicalized through the name index.
+        :param api_url: a string, the URL of the request
+        :param name_index: a NameIndex, that a request by name is canonicalized against (optional)
+        :return: a string
+        """
+        key = self.get_key(api_url)
+        if key in self.aliases:
+            self.aliases.move_to_end(key)
+            return self.aliases[key]
+
+        return self.canonicalize(api_url, name_index)
+
+    def record_aliases(self, api_url: str, response):
+        """
+        Records the name and numeric ID of a decoded response as aliases of the URL it was requested from.
+        :param api_url: a string, the URL of the response
+        :param response: a dictionary (or an undecoded body, which is ignored)
+        """
+        if type(response) is not dict or "id" not in response or "name" not in response:
+            return
+
+        base = self.get_key(api_url).rpartition("/")[0]
+        for item in (response["id"], response["name"]):
+            self.aliases.setdefault(self.get_key(f"{base}/{item}"), api_url)
+        while len(self.aliases) > self.max_aliases:
+            self.aliases.popitem(last=False)
+
+    def finish(self, key: tuple, future: asyncio.Future):
+        """
+        Removes a finished request from the requests in flight. Its exception is marked as retrieved, since every
+        requester may have been cancelled while it was in flight.
+        :param key: a tuple, of the canonical URL of the request and whether it is raw
+        :param future: an asyncio.Future, of the finished request
+        """
+        self.in_flight.pop(key, None)
+        if not future.cancelled():
+            future.exception()
+
+    async def fetch(self, api_url: str, fetch_response, raw: bool = False):
+        """
+        Returns the response of a URL, sharing the request already in flight for the same resource if there is one.
+        :param api_url: a string, the URL of the request
+        :param fetch_response: a function, called with the URL to create the coroutine that makes the request
+        :param raw: a boolean, if the response is returned undecoded (raw and decoded requests are not shared)
+        :return: the response of the request
+        :raises APIRequestError: if the request failed
+        """
+        api_url = self.resolve(api_url)
+        key = (self.get_key(api_url), raw)
+
+        future = self.in_flight.get(key)
+        if future is not None:
+            instrumentation.PROFILER.record_coalesced_request()
+        else:
+            future = asyncio.ensure_future(fetch_response(api_url))
+            self.in_flight[key] = future
+            future.add_done_callback(lambda done: self.finish(key, done))
+
+        response = await asyncio.shield(future)
+        self.record_aliases(api_url, response)
+
+        return response
@@ -0,0 +1,210 @@
+import os
+import sqlite3
+import time
+
+
+class ResponseCache:
+    """
+    A persistent, SQLite backed store of raw API responses keyed by their normalized URL. Entries expire after a
+    configurable time-to-live, and the least recently used entries are evicted once the cache grows past its size cap.
+    The validators of each response (its ETag and Last-Modified headers) are stored alongside it, so that an expired
+    entry can be revalidated with a conditional request, and reused as is if it has not changed.
+    Stores are committed, and the size cap enforced, in batches of at most COMMIT_INTERVAL writes or COMMIT_SECONDS,
+    at the end of each query of a long-running process, and when the cache is closed, rather than one transaction per
+    lookup. Cache hits never write: their access times are kept in memory and written when the pending writes are
+    committed. The database is in WAL mode, so that other processes sharing the cache can read while it is written, and
+    wait (up to BUSY_TIMEOUT seconds) rather than fail while another one commits.
+    """
+
+    DEFAULT_DIRECTORY = os.path.join(os.path.expanduser("~"), ".cache", "pokedex")
+    DEFAULT_TTL = 7 * 24 * 60 * 60
+    DEFAULT_MAX_ENTRIES = 50000
+    DATABASE_NAME = "responses.sqlite3"
+    COMMIT_INTERVAL = 200
+    COMMIT_SECONDS = 1.0
+    BUSY_TIMEOUT = 30
+
+    def __init__(self, cache_dir: str = None, ttl: int = DEFAULT_TTL, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 refresh: bool = False):
+        """
+        Initializer method.
+        :param cache_dir: a string, the directory the cache database is stored in
+        :param ttl: an int, the number of seconds an entry stays fresh for (0 or less never expires)
+        :param max_entries: an int, the maximum number of entries kept before the least recently used are evicted
+        :param refresh: a boolean, if True cached entries are ignored on reads (so they are revalidated) but responses
+        are still stored
+        """
+        self.cache_dir = cache_dir or self.DEFAULT_DIRECTORY
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self.pending_writes = 0
+        self.pending_since = None
+        self.accessed = {}
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.connection = sqlite3.connect(os.path.join(self.cache_dir, self.DATABASE_NAME), timeout=self.BUSY_TIMEOUT)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS responses ("
+                                "url TEXT PRIMARY KEY, "
+                                "body TEXT NOT NULL, "
+                                "stored_at REAL NOT NULL, "
+                                "accessed_at REAL NOT NULL, "
+                                "etag TEXT, "
+                                "last_modified TEXT)")
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(responses)")}
+        for column in ("etag", "last_modified"):
+            if column not in columns:
+                self.connection.execute(f"ALTER TABLE responses ADD COLUMN {column} TEXT")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+        self.connection.commit()
+
+    @staticmethod
+    def normalize_url(api_url: str) -> str:
+        """
+        Normalizes a URL so that equivalent URLs (e.g. with or without a trailing slash) share a single cache entry.
+        :param api_url: a string, the URL to normalize
+        :return: a string
+        """
+        return api_url.strip().rstrip("/").lower()
+
+    def get(self, api_url: str) -> str:
+        """
+        Returns the cached body of the specified URL, or None if it is not cached, has expired, or the cache is being
+        refreshed.
+        :param api_url: a string, the URL of the cached response
+        :return: a string, or None
+        """
+        if self.refresh:
+            self.misses += 1
+            return None
+
+        key = self.normalize_url(api_url)
+        row = self.connection.execute("SELECT body, stored_at FROM responses WHERE url = ?", (key,)).fetchone()
+        now = time.time()
+
+        if row is None or (self.ttl > 0 and now - row[1] > self.ttl):
+            self.misses += 1
+            return None
+
+        self.accessed[key] = now
+        self.hits += 1
+        return row[0]
+
+    def get_stale(self, api_url: str) -> tuple:
+        """
+        Returns the cached body of the specified URL along with its validators, whether or not it has expired, so that
+        it can be revalidated.
+        :param api_url: a string, the URL of the cached response
+        :return: a tuple, of the body, ETag and Last-Modified header (either may be None), or None if it is not cached
+        """
+        return self.connection.execute("SELECT body, etag, last_modified FROM responses WHERE url = ?",
+                                       (self.normalize_url(api_url),)).fetchone()
+
+    def set(self, api_url: str, body: str, etag: str = None, last_modified: str = None):
+        """
+        Stores the body of a response, and its validators. The size cap is enforced when the pending writes are
+        committed.
+        :param api_url: a string, the URL of the response
+        :param body: a string, the raw body of the response
+        :param etag: a string, the ETag header of the response (optional)
+        :param last_modified: a string, the Last-Modified header of the response (optional)
+        """
+        now = time.time()
+        self.connection.execute("INSERT OR REPLACE INTO responses (url, body, stored_at, accessed_at, etag, "
+                                "last_modified) VALUES (?, ?, ?, ?, ?, ?)",
+                                (self.normalize_url(api_url), body, now, now, etag, last_modified))
+        self.record_write()
+
+    def revalidate(self, api_url: str):
+        """
+        Marks the cached body of the specified URL as fresh again, after the API reported that it has not changed.
+        :param api_url: a string, the URL of the cached response
+        """
+        now = time.time()
+        self.connection.execute("UPDATE responses SET stored_at = ?, accessed_at = ? WHERE url = ?",
+                                (now, now, self.normalize_url(api_url)))
+        self.record_write()
+
+    def record_write(self):
+        """
+        Counts a pending write, and commits the pending writes once there are COMMIT_INTERVAL of them, or the oldest of
+        them was made COMMIT_SECONDS ago.
+        """
+        now = time.monotonic()
+        if self.pending_since is None:
+            self.pending_since = now
+
+        self.pending_writes += 1
+        if self.pending_writes >= self.COMMIT_INTERVAL or now - self.pending_since >= self.COMMIT_SECONDS:
+            self.commit()
+
+    def commit(self):
+        """
+        Writes the access times of the cache hits, evicts the least recently used entries if the size cap is exceeded,
+        and commits every pending write.
+        """
+        if self.accessed:
+            self.connection.executemany("UPDATE responses SET accessed_at = ? WHERE url = ?",
+                                        [(accessed_at, url) for url, accessed_at in self.accessed.items()])
+            self.accessed = {}
+
+        if self.pending_writes:
+            self.evict()
+        self.connection.commit()
+        self.pending_writes = 0
+        self.pending_since = None
+
+    def evict(self):
+        """
+        Deletes the least recently used entries until the cache is within its size cap.
+        """
+        if self.max_entries <= 0:
+            return
+
+        count = self.connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        if count > self.max_entries:
+            self.connection.execute("DELETE FROM responses WHERE url IN "
+                                    "(SELECT url FROM responses ORDER BY accessed_at ASC LIMIT ?)",
+                                    (count - self.max_entries,))
+
+    def iter_bodies(self, resource_type: str):
+        """
+        Lazily returns the cached bodies of every single resource of the specified type (e.g. every cached Pokémon),
+        whether or not they have expired.
+        :param resource_type: a string, the resource type (e.g. "pokemon")
+        :return: a generator, of strings
+        """
+        for url, body in self.connection.execute("SELECT url, body FROM responses WHERE url LIKE ?",
+                                                 (f"%/{resource_type}/%",)):
+            if self.get_resource_type(url) == resource_type:
+                yield body
+
+    @staticmethod
+    def get_resource_type(url: str) -> str:
+        """
+        Returns the resource type of the normalized URL of a single resource (e.g. "pokemon" for .../pokemon/25).
+        :param url: a string, the normalized URL
+        :return: a string, or None if the URL is not that of a single resource (e.g. a page of a list endpoint)
+        """
+        parts = url.split("/")
+        return parts[-2] if "?" not in url and len(parts) >= 2 else None
+
+    def list_urls(self, resource_types: list = None) -> list:
+        """
+        Returns the URLs of every cached single resource, whether or not they have expired.
+        :param resource_types: a list, of the resource types to include (optional, every type by default)
+        :return: a list, of strings
+        """
+        urls = [row[0] for row in self.connection.execute("SELECT url FROM responses ORDER BY url")]
+        return [url for url in urls if self.get_resource_type(url) is not None
+                and (resource_types is None or self.get_resource_type(url) in resource_types)]
+
+    def close(self):
+        """
+        Commits any pending writes, and closes the connection to the cache database.
+        """
+        self.commit()
+        self.connection.close()
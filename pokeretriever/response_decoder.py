@@ -0,0 +1,161 @@
+import json
+import typing
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ResponseDecoder:
+    """
+    Decodes API responses, keeping only the fields that the Pokédex objects are built from. Each resource type declares
+    a projection of the fields it needs; large unused sections (e.g. a Pokémon's sprites, game indices, and the details
+    of every game a move is learned in) are skipped. The "pokemon-references" projection only keeps the URLs of the
+    stats, abilities and moves a Pokémon references.
+
+    If msgspec is installed, responses are decoded straight into the projection, so skipped sections are never
+    materialized. Otherwise responses are decoded with orjson (if installed) or the json module, and then pruned. Either
+    way, every projected field is present in the result, and fields missing from the response are None.
+    """
+
+    PROJECTIONS = {
+        "pokemon": {
+            "id": True,
+            "name": True,
+            "height": True,
+            "weight": True,
+            "stats": [{"base_stat": True, "stat": {"name": True, "url": True}}],
+            "types": [{"type": {"name": True}}],
+            "abilities": [{"ability": {"name": True, "url": True}}],
+            "moves": [{"move": {"name": True, "url": True},
+                       "version_group_details": [{"level_learned_at": True,
+                                                  "move_learn_method": {"name": True},
+                                                  "version_group": {"name": True}}]}],
+        },
+        "ability": {
+            "id": True,
+            "name": True,
+            "generation": {"name": True},
+            "effect_entries": [{"effect": True, "language": {"name": True}}],
+            "flavor_text_entries": [{"flavor_text": True, "language": {"name": True}}],
+            "pokemon": [{"pokemon": {"name": True, "url": True}}],
+        },
+        "move": {
+            "id": True,
+            "name": True,
+            "accuracy": True,
+            "pp": True,
+            "power": True,
+            "generation": {"name": True},
+            "type": {"name": True},
+            "damage_class": {"name": True},
+            "flavor_text_entries": [{"flavor_text": True, "language": {"name": True}}],
+        },
+        "stat": {
+            "id": True,
+            "name": True,
+            "is_battle_only": True,
+        },
+        "pokemon-references": {
+            "stats": [{"stat": {"url": True}}],
+            "abilities": [{"ability": {"url": True}}],
+            "moves": [{"move": {"url": True}}],
+        },
+    }
+
+    msgspec_types = {}
+
+    @staticmethod
+    def get_resource_type(api_url: str) -> str:
+        """
+        Returns the resource type of a single resource URL (e.g. "move" for ".../api/v2/move/1/").
+        :param api_url: a string, the URL of the resource
+        :return: a string, or None if the URL is not a single resource (e.g. a paginated list)
+        """
+        if "?" in api_url:
+            return None
+
+        parts = api_url.rstrip("/").split("/")
+        if len(parts) < 2:
+            return None
+
+        return parts[-2].lower()
+
+    @staticmethod
+    def decode(body, resource_type: str = None) -> dict:
+        """
+        Decodes the body of a response, keeping only the fields projected for its resource type. Bodies of resources
+        without a projection are decoded in full.
+        :param body: a string or bytes object, the body of the response
+        :param resource_type: a string, the resource type of the response (e.g. "pokemon")
+        :return: a dictionary
+        """
+        projection = ResponseDecoder.PROJECTIONS.get(resource_type)
+
+        if projection is None:
+            return orjson.loads(body) if orjson is not None else json.loads(body)
+
+        if msgspec is not None:
+            decoded = msgspec.json.decode(body, type=ResponseDecoder.get_msgspec_type(resource_type))
+            return msgspec.to_builtins(decoded)
+
+        decoded = orjson.loads(body) if orjson is not None else json.loads(body)
+        return ResponseDecoder.project(decoded, projection)
+
+    @staticmethod
+    def project(value, projection):
+        """
+        Returns a copy of the decoded JSON value that only contains the projected fields, with the projected fields it
+        is missing set to None (as msgspec decodes them).
+        :param value: the decoded JSON value
+        :param projection: True (keep the whole value), a dictionary of projected fields, or a list of the projection
+        of each element
+        :return: the projected value
+        """
+        if projection is True or value is None:
+            return value
+
+        if type(projection) is list:
+            return [ResponseDecoder.project(element, projection[0]) for element in value]
+
+        return {key: ResponseDecoder.project(value.get(key), sub_projection)
+                for key, sub_projection in projection.items()}
+
+    @staticmethod
+    def get_msgspec_type(resource_type: str):
+        """
+        Returns (creating it on first use) the msgspec type that decodes the projection of a resource type.
+        :param resource_type: a string, the resource type
+        :return: a msgspec Struct type
+        """
+        if resource_type not in ResponseDecoder.msgspec_types:
+            ResponseDecoder.msgspec_types[resource_type] = ResponseDecoder.build_msgspec_type(
+                ResponseDecoder.PROJECTIONS[resource_type], resource_type.title().replace("-", ""))
+
+        return ResponseDecoder.msgspec_types[resource_type]
+
+    @staticmethod
+    def build_msgspec_type(projection, name: str):
+        """
+        Builds the msgspec type of a projection. Every field is optional, and fields that are not projected are
+        skipped by the decoder without being materialized.
+        :param projection: True, a dictionary of projected fields, or a list of the projection of each element
+        :param name: a string, the name of the Struct type
+        :return: a type
+        """
+        if projection is True:
+            return typing.Any
+
+        if type(projection) is list:
+            return typing.Optional[typing.List[ResponseDecoder.build_msgspec_type(projection[0], name)]]
+
+        fields = [(key, ResponseDecoder.build_msgspec_type(sub_projection, f"{name}_{key}"), None)
+                  for key, sub_projection in projection.items()]
+
+        return typing.Optional[msgspec.defstruct(name, fields)]
@@ -0,0 +1,172 @@
+import re
+
+from pokeretriever import api_handler
+
+
+class SelectorPlanner:
+    """
+    Expands the selectors of the input data into the IDs of the items they select, so that a whole group of items can
+    be queried with a single line of input:
+
+    1-151: every item whose ID is within the range (inclusive)
+    all: every item of the query type
+    type:fire: every Pokémon (or move) of a type
+    ability:levitate: every Pokémon with an ability
+
+    Ranges are expanded without any requests, and "all" is answered from the name index or the snapshot when they have
+    the IDs of the query type. Otherwise "all" takes a single request to a list endpoint, and the membership selectors
+    a single request to the type or ability itself (through the response cache). Items are yielded as soon as they
+    are known, so that the expansion streams into the fetches rather than being built up as a list first. Any other
+    input is yielded unchanged.
+    """
+
+    RANGE_PATTERN = re.compile(r"^(\d+)\s*-\s*(\d+)$")
+    ALL = "all"
+    MEMBERSHIP_SELECTORS = {
+        "type": {"pokemon": "pokemon", "move": "moves"},
+        "ability": {"pokemon": "pokemon"},
+    }
+
+    def __init__(self, interface):
+        """
+        Initializer method.
+        :param interface: a PokedexInterface, used to fetch the lists and resources the selectors are resolved with
+        """
+        self.interface = interface
+
+    @staticmethod
+    def get_id(api_url: str) -> str:
+        """
+        Returns the ID at the end of the URL of a resource.
+        :param api_url: a string, the URL of the resource
+        :return: a string
+        """
+        return api_url.rstrip("/").rpartition("/")[2]
+
+    @staticmethod
+    def is_selector(data: str) -> bool:
+        """
+        Returns whether a line of input is a selector.
+        :param data: a string, the line of input
+        :return: a boolean
+        """
+        data = data.strip().lower()
+        return (data == SelectorPlanner.ALL or SelectorPlanner.RANGE_PATTERN.match(data) is not None
+                or data.partition(":")[0] in SelectorPlanner.MEMBERSHIP_SELECTORS)
+
+    async def plan(self, query_type: str, input_data, errors: list):
+        """
+        An Async generator that yields every item of the input data, with its selectors expanded. Selectors that
+        cannot be resolved are left out, and their errors are added to errors.
+        :param query_type: a string, of the type of data queried
+        :param input_data: an iterable, of the input data
+        :param errors: a list, that the errors of selectors that could not be resolved are added to
+        :return: an async generator, of strings
+        """
+        for data in input_data:
+            if not self.is_selector(data):
+                yield data
+                continue
+
+            selector = data.strip().lower()
+            try:
+                range_match = self.RANGE_PATTERN.match(selector)
+                if range_match is not None:
+                    items = self.expand_range(query_type, int(range_match.group(1)), int(range_match.group(2)),
+                                              errors)
+                elif selector == self.ALL:
+                    items = await self.expand_all(query_type)
+                else:
+                    items = await self.expand_membership(query_type, *selector.split(":", 1))
+
+            except api_handler.APIRequestError as error:
+                errors.append(error)
+                continue
+
+            for item in items:
+                yield item
+
+    def get_known_ids(self, query_type: str) -> list:
+        """
+        Returns the IDs of every item of the query type, from the name index if it has them, and otherwise from the
+        snapshot the interface reads from.
+        :param query_type: a string, of the type of data queried
+        :return: a list, of ints in ascending order, or None if neither knows the IDs of the query type
+        """
+        name_index = self.interface.name_index
+        if name_index is not None and name_index.has(query_type):
+            name_index.load(query_type)
+            return sorted(name_index.ids[query_type])
+
+        if self.interface.data_source is not None:
+            return self.interface.data_source.list_ids(query_type) or None
+
+        return None
+
+    def expand_range(self, query_type: str, start: int, end: int, errors: list):
+        """
+        Expands an ID range. If the IDs of the query type are known (see get_known_ids), only the IDs that exist are
+        selected, and the number of IDs that were skipped is added to errors. Otherwise every ID is selected, and each
+        one that does not exist is reported when it is fetched.
+        :param query_type: a string, of the type of data queried
+        :param start: an int, the first ID of the range
+        :param end: an int, the last ID of the range
+        :param errors: a list, that the error of the IDs that were skipped is added to
+        :return: an iterable, of strings
+        :raises APIRequestError: if the range is reversed
+        """
+        if start > end:
+            raise api_handler.APIRequestError(f"Invalid range {start}-{end}, its first ID is greater than its last.")
+
+        known_ids = self.get_known_ids(query_type)
+        if known_ids is None:
+            return (str(item_id) for item_id in range(start, end + 1))
+
+        items = [str(item_id) for item_id in known_ids if start <= item_id <= end]
+        skipped = end - start + 1 - len(items)
+        if skipped:
+            errors.append(api_handler.APIRequestError(f"{skipped} ID(s) in the range {start}-{end} have no "
+                                                      f"{query_type}, they were skipped."))
+
+        return items
+
+    async def expand_all(self, query_type: str) -> list:
+        """
+        Expands the "all" selector, from the known IDs of the query type (see get_known_ids), and otherwise from the
+        list endpoint of the query type.
+        :param query_type: a string, of the type of data queried
+        :return: a list, of strings
+        :raises APIRequestError: if the list could not be fetched
+        """
+        known_ids = self.get_known_ids(query_type)
+        if known_ids is not None:
+            return [str(item_id) for item_id in known_ids]
+
+        count = await self.interface.fetch_list_count_async(query_type)
+        page = await self.interface.fetch_list_page_async(query_type, count)
+
+        return [self.get_id(result["url"]) for result in page["results"]]
+
+    async def expand_membership(self, query_type: str, selector_type: str, name: str) -> list:
+        """
+        Expands a membership selector (e.g. "type:fire"), from the resource it names.
+        :param query_type: a string, of the type of data queried
+        :param selector_type: a string, one of the keys of MEMBERSHIP_SELECTORS
+        :param name: a string, the name or ID of the type or ability
+        :return: a list, of strings
+        :raises APIRequestError: if the selector does not apply to the query type, or its resource could not be
+        fetched
+        """
+        field = self.MEMBERSHIP_SELECTORS[selector_type].get(query_type)
+        if field is None:
+            raise api_handler.APIRequestError(f"The {selector_type}: selector cannot be used in {query_type} queries.")
+
+        name = self.interface.clean_input(name.strip())
+        target_url = api_handler.APIHandler.generate_api_urls(selector_type, [name], self.interface.base_url)[0]
+        response = (await self.interface.fetch_urls_async(selector_type, [target_url]))[0]
+        if isinstance(response, api_handler.APIRequestError):
+            raise response
+
+        members = response.get(field) or []
+        return [self.get_id(member[query_type]["url"] if query_type in member else member["url"])
+                for member in members]
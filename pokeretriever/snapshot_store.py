@@ -0,0 +1,149 @@
+from pokeretriever import response_decoder
+
+import json
+import os
+import sqlite3
+
+
+class SnapshotStore:
+    """
+    An indexed local copy of the API, built from a directory of PokéAPI JSON files. Resources are stored by their type,
+    ID and name, so that queries (including expanded ones) can be answered without any network access.
+    """
+
+    DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "pokedex", "snapshot.sqlite3")
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        """
+        Initializer method.
+        :param path: a string, the path of the snapshot database
+        """
+        self.path = path
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS resources ("
+                                "resource_type TEXT NOT NULL, "
+                                "id INTEGER NOT NULL, "
+                                "name TEXT NOT NULL, "
+                                "body TEXT NOT NULL, "
+                                "PRIMARY KEY (resource_type, id))")
+        self.connection.execute("CREATE UNIQUE INDEX IF NOT EXISTS resources_name ON resources (resource_type, name)")
+        self.connection.commit()
+
+    @staticmethod
+    def get_resource_type(relative_directory: str) -> str:
+        """
+        Determines the resource type of a JSON file from the directory it is in. Both the layout of the official data
+        dump (api/v2/pokemon/25/index.json) and a flat layout (pokemon/25.json) are supported.
+        :param relative_directory: a string, the directory of the file relative to the snapshot directory
+        :return: a string, or None if the type cannot be determined
+        """
+        parts = [part for part in relative_directory.replace("\\", "/").split("/") if part and part != "."]
+
+        if "v2" in parts and parts.index("v2") + 1 < len(parts):
+            return parts[parts.index("v2") + 1]
+
+        for part in reversed(parts):
+            if not part.isdigit():
+                return part
+
+        return None
+
+    def import_directory(self, directory: str) -> int:
+        """
+        Ingests every PokéAPI resource found in the JSON files of the specified directory, replacing any resource that
+        has already been imported.
+        :param directory: a string, the path of the directory containing the PokéAPI JSON files
+        :return: an int, the number of resources imported
+        """
+        imported = 0
+        for root, _, file_names in os.walk(directory):
+            resource_type = self.get_resource_type(os.path.relpath(root, directory))
+            if resource_type is None:
+                continue
+
+            rows = []
+            for file_name in file_names:
+                if not file_name.endswith(".json"):
+                    continue
+
+                with open(os.path.join(root, file_name), mode="r", encoding="utf-8") as data:
+                    resource = json.load(data)
+
+                if type(resource) is not dict or "id" not in resource or "name" not in resource:
+                    continue
+
+                rows.append((resource_type, resource["id"], resource["name"],
+                             json.dumps(resource, separators=(",", ":"))))
+
+            self.connection.executemany("INSERT OR REPLACE INTO resources (resource_type, id, name, body) "
+                                        "VALUES (?, ?, ?, ?)", rows)
+            imported += len(rows)
+
+        self.connection.commit()
+        return imported
+
+    def get(self, resource_type: str, key: str) -> dict:
+        """
+        Returns the stored JSON of the specified resource, looked up by ID or name, keeping only the fields needed for
+        its resource type.
+        :param resource_type: a string, the type of resource (e.g. "pokemon", "ability" or "move")
+        :param key: a string, the name or ID of the resource
+        :return: a dictionary, or None if the resource is not in the snapshot
+        """
+        if key.isdigit():
+            row = self.connection.execute("SELECT body FROM resources WHERE resource_type = ? AND id = ?",
+                                          (resource_type, int(key))).fetchone()
+        else:
+            row = self.connection.execute("SELECT body FROM resources WHERE resource_type = ? AND name = ?",
+                                          (resource_type, key)).fetchone()
+
+        return response_decoder.ResponseDecoder.decode(row[0], resource_type) if row else None
+
+    def list_ids(self, resource_type: str) -> list:
+        """
+        Returns the IDs of every stored resource of a type.
+        :param resource_type: a string, the type of resource (e.g. "pokemon", "ability" or "move")
+        :return: a list, of ints in ascending order
+        """
+        rows = self.connection.execute("SELECT id FROM resources WHERE resource_type = ? ORDER BY id",
+                                       (resource_type,))
+        return [row[0] for row in rows]
+
+    def get_url(self, api_url: str) -> dict:
+        """
+        Returns the stored JSON of the resource the specified API URL refers to.
+        :param api_url: a string, an API URL (e.g. "https://pokeapi.co/api/v2/move/1/")
+        :return: a dictionary, or None if the resource is not in the snapshot
+        """
+        parts = api_url.rstrip("/").split("/")
+        if len(parts) < 2:
+            return None
+
+        return self.get(parts[-2].lower(), parts[-1].lower())
+
+    def get_responses(self, target_urls: list) -> list:
+        """
+        Returns the stored JSON of every specified API URL, in the same shape as APIHandler responses.
+        :param target_urls: a list, of the API URLs
+        :return: a list, of dictionaries (None for URLs that are not in the snapshot)
+        """
+        return [self.get_url(url) for url in target_urls]
+
+    def iter_bodies(self, resource_type: str):
+        """
+        Lazily returns the stored JSON of every resource of the specified type.
+        :param resource_type: a string, the resource type (e.g. "pokemon")
+        :return: a generator, of strings
+        """
+        for row in self.connection.execute("SELECT body FROM resources WHERE resource_type = ? ORDER BY id",
+                                           (resource_type,)):
+            yield row[0]
+
+    def close(self):
+        """
+        Closes the connection to the snapshot database.
+        """
+        self.connection.close()
@@ -0,0 +1,168 @@
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class StatAnalytics:
+    """
+    Vectorized analytics over the base stats of every indexed Pokémon. The stats are loaded once into a matrix (one
+    row per Pokémon, one column per stat) with an index of the names and IDs of its rows, so that ranking, filtering,
+    percentile, similarity and comparison queries over the whole Pokédex are single NumPy operations.
+
+    Requires NumPy ("pip install numpy").
+    """
+
+    STATS = ("hp", "attack", "defense", "special-attack", "special-defense", "speed")
+    TOTAL = "total"
+
+    def __init__(self, ids: list, names: list, matrix):
+        """
+        Initializer method.
+        :param ids: a list, of the IDs of the Pokémon of each row
+        :param names: a list, of the names of the Pokémon of each row
+        :param matrix: a numpy.ndarray, of the base stats (one row per Pokémon, one column per stat in STATS)
+        """
+        self.ids = numpy.asarray(ids)
+        self.names = numpy.asarray(names, dtype=object)
+        self.matrix = matrix
+        self.rows = {name: row for row, name in enumerate(names)}
+        self.rows.update({str(pkm_id): row for row, pkm_id in enumerate(ids)})
+        self.totals = matrix.sum(axis=1)
+
+    @staticmethod
+    def load(index):
+        """
+        Loads the base stats of every Pokémon in a PokemonIndex.
+        :param index: a PokemonIndex
+        :return: a StatAnalytics
+        :raises RuntimeError: if NumPy is not installed
+        """
+        if numpy is None:
+            raise RuntimeError("Stat analytics require NumPy, install it with: pip install numpy")
+
+        pokemon = index.connection.execute("SELECT id, name FROM pokemon ORDER BY id").fetchall()
+        positions = {pkm_id: row for row, (pkm_id, _) in enumerate(pokemon)}
+        columns = {stat: column for column, stat in enumerate(StatAnalytics.STATS)}
+
+        matrix = numpy.zeros((len(pokemon), len(StatAnalytics.STATS)), dtype=numpy.int32)
+        for stat, value, pkm_id in index.connection.execute("SELECT stat, value, pokemon_id FROM pokemon_stats"):
+            if stat in columns and pkm_id in positions:
+                matrix[positions[pkm_id], columns[stat]] = value
+
+        return StatAnalytics([pkm_id for pkm_id, _ in pokemon], [name for _, name in pokemon], matrix)
+
+    def get_row(self, pokemon: str) -> int:
+        """
+        Returns the matrix row of a Pokémon.
+        :param pokemon: a string, the name or ID of the Pokémon
+        :return: an int
+        :raises KeyError: if the Pokémon is not indexed
+        """
+        if pokemon not in self.rows:
+            raise KeyError(f"{pokemon} is not in the index")
+
+        return self.rows[pokemon]
+
+    def score(self, weights: dict = None):
+        """
+        Returns the score of every Pokémon: the sum of its base stats weighted by the given weights, or its base stat
+        total if there are none.
+        :param weights: a dictionary, mapping stat names (or "total") to their weights (optional)
+        :return: a numpy.ndarray, of one score per Pokémon
+        """
+        if not weights:
+            return self.totals
+
+        stat_weights = numpy.array([weights.get(stat, 0.0) for stat in self.STATS], dtype=numpy.float64)
+        return self.matrix @ stat_weights + self.totals * weights.get(self.TOTAL, 0.0)
+
+    def filter(self, min_stats: dict = None, max_stats: dict = None):
+        """
+        Returns a mask of the Pokémon whose base stats (or base stat total) are within the given ranges.
+        :param min_stats: a dictionary, mapping stat names (or "total") to their minimum values (optional)
+        :param max_stats: a dictionary, mapping stat names (or "total") to their maximum values (optional)
+        :return: a numpy.ndarray, of booleans
+        """
+        mask = numpy.ones(len(self.names), dtype=bool)
+        for stat, value in (min_stats or {}).items():
+            mask &= self.get_column(stat) >= value
+        for stat, value in (max_stats or {}).items():
+            mask &= self.get_column(stat) <= value
+
+        return mask
+
+    def get_column(self, stat: str):
+        """
+        Returns the values of a stat (or the base stat totals) of every Pokémon.
+        :param stat: a string, the stat name or "total"
+        :return: a numpy.ndarray
+        :raises KeyError: if the stat is unknown
+        """
+        if stat == self.TOTAL:
+            return self.totals
+        if stat not in self.STATS:
+            raise KeyError(f"Unknown stat {stat}, expected one of: {', '.join(self.STATS + (self.TOTAL,))}")
+
+        return self.matrix[:, self.STATS.index(stat)]
+
+    def rank(self, weights: dict = None, top: int = 10, ascending: bool = False, min_stats: dict = None,
+             max_stats: dict = None) -> list:
+        """
+        Ranks the Pokémon that pass the filter by their score.
+        :param weights: a dictionary, mapping stat names (or "total") to their weights (defaults to the stat total)
+        :param top: an int, the number of Pokémon returned
+        :param ascending: a boolean, if the lowest scores rank first
+        :param min_stats: a dictionary, of minimum stat values (optional)
+        :param max_stats: a dictionary, of maximum stat values (optional)
+        :return: a list, of tuples of the name and score of each Pokémon
+        """
+        scores = self.score(weights)
+        candidates = numpy.flatnonzero(self.filter(min_stats, max_stats))
+        order = numpy.argsort(scores[candidates] if ascending else -scores[candidates], kind="stable")[:top]
+
+        return [(self.names[row], scores[row]) for row in candidates[order]]
+
+    def percentiles(self, pokemon: str) -> dict:
+        """
+        Returns the percentile of each base stat (and the base stat total) of a Pokémon, i.e. the percentage of
+        Pokémon whose value is lower.
+        :param pokemon: a string, the name or ID of the Pokémon
+        :return: a dictionary, mapping each stat name to a tuple of its value and percentile
+        """
+        row = self.get_row(pokemon)
+        values = numpy.column_stack((self.matrix, self.totals))
+        below = (values < values[row]).mean(axis=0) * 100
+
+        return {stat: (int(values[row, column]), float(below[column]))
+                for column, stat in enumerate(self.STATS + (self.TOTAL,))}
+
+    def similar(self, pokemon: str, count: int = 5) -> list:
+        """
+        Returns the Pokémon whose base stats are the closest to those of a Pokémon (by Euclidean distance).
+        :param pokemon: a string, the name or ID of the Pokémon
+        :param count: an int, the number of Pokémon returned
+        :return: a list, of tuples of the name and distance of each Pokémon
+        """
+        row = self.get_row(pokemon)
+        distances = numpy.sqrt(((self.matrix - self.matrix[row]) ** 2).sum(axis=1, dtype=numpy.float64))
+        distances[row] = numpy.inf
+
+        count = min(count, len(distances) - 1)
+        if count <= 0:
+            return []
+        nearest = numpy.argpartition(distances, count - 1)[:count]
+        nearest = nearest[numpy.argsort(distances[nearest], kind="stable")]
+
+        return [(self.names[index], float(distances[index])) for index in nearest]
+
+    def compare(self, pokemon: list) -> list:
+        """
+        Returns the base stats (and base stat totals) of the Pokémon side by side.
+        :param pokemon: a list, of the names or IDs of the Pokémon
+        :return: a list, of tuples of each stat name and the values of every Pokémon
+        """
+        rows = [self.get_row(pkm) for pkm in pokemon]
+        values = numpy.column_stack((self.matrix[rows], self.totals[rows]))
+
+        return [(stat, values[:, column].tolist()) for column, stat in enumerate(self.STATS + (self.TOTAL,))]
@@ -0,0 +1,36 @@
+from benchmarks import stub_server
+from pokeretriever import response_cache
+
+import pokedex_interface
+import pytest
+
+
+@pytest.fixture
+def stub():
+    """
+    A stub PokéAPI with a handful of resources, running for the duration of a test.
+    """
+    server = stub_server.StubPokeAPI(pokemon_count=10, move_count=10, ability_count=10, moves_per_pokemon=2)
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """
+    An empty response cache in the test's temporary directory.
+    """
+    response_cache_obj = response_cache.ResponseCache(str(tmp_path / "cache"))
+    yield response_cache_obj
+    response_cache_obj.close()
+
+
+@pytest.fixture
+def interface(stub, cache):
+    """
+    A PokedexInterface that requests the stub server and stores its responses in the cache.
+    """
+    interface_obj = pokedex_interface.PokedexInterface(cache, base_url=stub.base_url)
+    yield interface_obj
+    interface_obj.close()
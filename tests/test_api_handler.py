@@ -0,0 +1,75 @@
+from pokeretriever import api_handler, connection_pool, rate_limiter
+
+import pokedex_interface
+import pytest
+
+
+class ScriptedFaults:
+    """
+    A stand-in for the stub server's fault generator, that returns scripted values and then never injects a fault.
+    """
+
+    def __init__(self, values: list):
+        self.values = list(values)
+
+    def random(self) -> float:
+        return self.values.pop(0) if self.values else 1.0
+
+
+@pytest.fixture
+def retries(monkeypatch):
+    """
+    Records the Retry-After header of every retry instead of waiting, and returns the list it is recorded in.
+    """
+    recorded = []
+
+    def get_delay(policy, attempt, retry_after=None):
+        recorded.append(retry_after)
+        return 0.0
+
+    monkeypatch.setattr(rate_limiter.RetryPolicy, "get_delay", get_delay)
+    return recorded
+
+
+def fetch(interface, url):
+    return interface.event_loop.run_until_complete(interface.fetch_urls_async("pokemon", [url]))[0]
+
+
+def test_rate_limited_and_unavailable_requests_are_retried(stub, interface, retries):
+    stub.error_rate, stub.rate_limit_rate, stub.retry_after = 0.5, 0.5, 7
+    stub.fault_generator = ScriptedFaults([0.9, 0.1])
+
+    response = fetch(interface, f"{stub.base_url}/pokemon/1/")
+
+    assert response["name"] == "pokemon-1"
+    assert (stub.rate_limited_count, stub.error_count) == (1, 1)
+    assert retries == ["7", None]
+
+
+def test_exhausted_retries_are_reported(stub, cache, retries):
+    stub.error_rate = 1.0
+    pool = connection_pool.ConnectionPool(retry_policy=rate_limiter.RetryPolicy(max_retries=2))
+    interface = pokedex_interface.PokedexInterface(cache, pool, stub.base_url)
+    try:
+        response = fetch(interface, f"{stub.base_url}/pokemon/1/")
+    finally:
+        interface.close()
+
+    assert isinstance(response, api_handler.APIRequestError)
+    assert response.status == 503
+    assert stub.error_count == 3
+    assert cache.get_stale(f"{stub.base_url}/pokemon/1/") is None
+
+
+def test_not_modified_keeps_the_cached_body(stub, cache, interface):
+    url = f"{stub.base_url}/pokemon/2/"
+    stored = fetch(interface, url)
+    stored_body = cache.get(url)
+
+    cache.refresh = True
+    revalidated = fetch(interface, url)
+    cache.refresh = False
+
+    assert stub.not_modified_count == 1
+    assert revalidated == stored
+    assert cache.get(url) == stored_body
@@ -0,0 +1,37 @@
+from pokeretriever import cache_syncer, name_index
+
+import pokedex_interface
+
+
+def test_sync_counts_unchanged_and_updated(stub, cache, interface):
+    urls = [f"{stub.base_url}/pokemon/{pokemon_id}/" for pokemon_id in (1, 2, 3)]
+    interface.event_loop.run_until_complete(interface.fetch_urls_async("pokemon", urls))
+    cache.commit()
+
+    stub.update_resource("pokemon", 2)
+    counts, errors = cache_syncer.CacheSyncer(interface).sync()
+
+    assert errors == []
+    assert (counts["checked"], counts["unchanged"], counts["updated"], counts["failed"]) == (3, 2, 1, 0)
+    assert '"revision": 1' in cache.get(urls[1])
+
+
+def test_sync_revalidates_name_keyed_entries(stub, cache, interface, tmp_path):
+    url = f"{stub.base_url}/pokemon/pokemon-4/"
+    interface.event_loop.run_until_complete(interface.fetch_urls_async("pokemon", [url]))
+    cache.commit()
+
+    # A later run, whose name index resolves the cached name to its ID.
+    names = name_index.NameIndex(str(tmp_path / "names.sqlite3"))
+    syncing_interface = pokedex_interface.PokedexInterface(cache, base_url=stub.base_url, name_index=names)
+    syncing_interface.refresh_name_index(["pokemon"])
+    stub.update_resource("pokemon", 4)
+    try:
+        counts, errors = cache_syncer.CacheSyncer(syncing_interface).sync(["pokemon"])
+    finally:
+        syncing_interface.close()
+        names.close()
+
+    assert errors == []
+    assert (counts["checked"], counts["updated"]) == (1, 1)
+    assert '"revision": 1' in cache.get(url)
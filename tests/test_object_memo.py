@@ -0,0 +1,29 @@
+from pokeretriever import movepool_filter, name_index, object_memo
+
+
+def get_objects(interface, objects, items):
+    errors = []
+    pokedex_objects = interface.event_loop.run_until_complete(objects.get_pokedex_objects(
+        interface, "pokemon", items, False, errors, movepool_filter.MovepoolFilter()))
+
+    assert errors == []
+    return pokedex_objects
+
+
+def test_ids_share_the_object_fetched_by_name(stub, interface):
+    objects = object_memo.ObjectMemo()
+    pokemon = get_objects(interface, objects, ["pokemon-3"])[0]
+
+    assert get_objects(interface, objects, ["3", "003"]) == [pokemon, pokemon]
+    assert objects.misses == 1
+
+
+def test_names_share_the_object_fetched_by_id(stub, interface, tmp_path):
+    interface.name_index = name_index.NameIndex(str(tmp_path / "names.sqlite3"))
+    interface.refresh_name_index(["pokemon"])
+    objects = object_memo.ObjectMemo()
+    pokemon = get_objects(interface, objects, ["005"])[0]
+
+    assert get_objects(interface, objects, ["Pokemon-5", "5"]) == [pokemon, pokemon]
+    assert objects.misses == 1
+    interface.name_index.close()
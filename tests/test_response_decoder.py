@@ -0,0 +1,48 @@
+from pokeretriever import response_decoder
+
+import json
+import pytest
+
+POKEMON_BODY = json.dumps({
+    "id": 25,
+    "name": "pikachu",
+    "height": 4,
+    "sprites": {"front_default": "https://example.com/25.png"},
+    "game_indices": [{"game_index": 84, "version": {"name": "red"}}],
+    "stats": [{"base_stat": 35, "effort": 0, "stat": {"name": "hp", "url": "https://pokeapi.co/api/v2/stat/1/"}}],
+    "types": [{"slot": 1, "type": {"name": "electric", "url": "https://pokeapi.co/api/v2/type/13/"}}],
+    "abilities": [{"ability": {"name": "static"}, "is_hidden": False}],
+    "moves": [{"move": {"name": "thunder-shock", "url": "https://pokeapi.co/api/v2/move/84/"}},
+              {"move": {"name": "growl", "url": "https://pokeapi.co/api/v2/move/45/"},
+               "version_group_details": [{"level_learned_at": 1, "move_learn_method": None,
+                                          "version_group": {"name": "red-blue"}}]}],
+})
+
+MOVE_BODY = json.dumps({"id": 45, "name": "growl", "accuracy": 100, "pp": 40, "power": None,
+                        "type": {"name": "normal"}, "flavor_text_entries": []})
+
+
+@pytest.mark.parametrize("resource_type, body", [("pokemon", POKEMON_BODY), ("pokemon-references", POKEMON_BODY),
+                                                 ("move", MOVE_BODY)], ids=["pokemon", "pokemon-references", "move"])
+def test_backends_decode_the_same_shape(monkeypatch, resource_type, body):
+    if response_decoder.msgspec is None or response_decoder.orjson is None:
+        pytest.skip("msgspec and orjson are needed to compare every backend")
+
+    decoded = {}
+    for backend, disabled_modules in (("msgspec", ()), ("orjson", ("msgspec",)), ("json", ("msgspec", "orjson"))):
+        with monkeypatch.context() as patch:
+            for module in disabled_modules:
+                patch.setattr(response_decoder, module, None)
+            decoded[backend] = response_decoder.ResponseDecoder.decode(body, resource_type)
+
+    assert decoded["msgspec"] == decoded["orjson"] == decoded["json"]
+    assert set(decoded["json"]) == set(response_decoder.ResponseDecoder.PROJECTIONS[resource_type])
+
+
+def test_missing_fields_are_none():
+    pokemon = response_decoder.ResponseDecoder.decode(POKEMON_BODY, "pokemon")
+
+    assert pokemon["weight"] is None
+    assert pokemon["abilities"] == [{"ability": {"name": "static", "url": None}}]
+    assert pokemon["moves"][0]["version_group_details"] is None
+    assert "sprites" not in pokemon